@@ -0,0 +1,77 @@
+"""Blit cost per surface class: unconverted, in the display format, and finalized
+
+"unconverted" is the same art with RGBA byte order (as decoded images and raw
+pixel buffers come), so every blit converts each pixel; "display format" is the
+plain converted surface; "finalized" is what SurfaceFormat.finalize returns
+(RLE-encoded where the surface is blitted straight onto the screen).
+
+Run from the repo root: python -m benchmarks.blit
+"""
+from benchmarks.common import time_call, print_table
+
+import pygame as pg
+import main
+from src.settings import *
+from src.sprites import SuperseedToken
+from src.surface_format import SurfaceFormat
+
+BLITS = 200
+
+
+def copies(surface):
+    """The surface's art as an unconverted and as a display-format surface, both without RLE"""
+    alpha = bool(surface.get_flags() & pg.SRCALPHA)
+    size = surface.get_size()
+    if alpha:
+        unconverted = pg.image.frombytes(pg.image.tobytes(surface, "RGBA"), size, "RGBA")
+        return unconverted, unconverted.convert_alpha()
+    unconverted = pg.image.frombytes(pg.image.tobytes(surface, "RGB"), size, "RGB")
+    return unconverted, unconverted.convert()
+
+
+def sample_surfaces(game):
+    """(class, surface, blitted onto the screen) for each surface class in level 3"""
+    game.level_num = 3
+    for _ in game.load_level():
+        pass
+    platforms = list(game.current_level.platforms)
+    shadowed = next(p for p in platforms if p.has_shadow)
+    plain = next((p for p in platforms if not p.has_shadow), None)
+
+    samples = [
+        ("parallax layer", game.background.parallax_bg.layers[1]["surface"], True),
+        ("menu preview", game.start_menu.wizard_preview, True),
+        ("static tile", next(iter(game.static_layer.tiles.values())), False),
+        ("platform (shadowed)", shadowed.image, False),
+        ("token frame", next(iter(SuperseedToken.frame_cache.values())), False),
+    ]
+    if plain:
+        samples.append(("platform (opaque)", plain.image, False))
+    return samples
+
+
+def main_bench():
+    game = main.Game()
+    screen = game.screen
+    level_layer = pg.Surface((WIDTH, HEIGHT), pg.SRCALPHA)  # Like the level surface sprites are drawn onto
+
+    rows = []
+    for name, surface, on_screen in sample_surfaces(game):
+        target = screen if on_screen else level_layer
+        unconverted, display_format = copies(surface)
+        finalized = SurfaceFormat.finalize(copies(surface)[0], rle=on_screen)
+
+        timings = []
+        for variant in (unconverted, display_format, finalized):
+            target.blit(variant, (0, 0))  # Warm up
+            timings.append(time_call(lambda: target.blit(variant, (0, 0)), repeat=5, number=BLITS) / BLITS * 1e6)
+        encoded = "RLE" if finalized.get_flags() & (pg.RLEACCEL | pg.RLEACCELOK) else "-"
+        rows.append((name, "screen" if on_screen else "level layer", "%dx%d" % surface.get_size(), encoded,
+                     *(f"{t:.1f}" for t in timings), f"{timings[0] / timings[2]:.1f}x", f"{timings[1] / timings[2]:.1f}x"))
+
+    print_table(("surface", "onto", "size", "finalized", "unconverted us", "display format us",
+                 "finalized us", "vs unconverted", "vs display format"), rows)
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,67 @@
+"""Collision callback owner lookup: scanning a sprite group vs. the shape registry
+
+Run from the repo root: python -m benchmarks.collision_lookup
+"""
+import random
+
+from benchmarks.common import time_call, print_table
+
+import pygame as pg
+import pymunk
+
+CALLS = 2000
+
+
+class Entity(pg.sprite.Sprite):
+    """Bare sprite with a physics shape, standing in for tokens/platforms"""
+    def __init__(self, x):
+        pg.sprite.Sprite.__init__(self)
+        self.body = pymunk.Body(body_type=pymunk.Body.KINEMATIC)
+        self.body.position = x, 0
+        self.shape = pymunk.Circle(self.body, 10)
+
+
+def scan_lookup(group, shape):
+    """Original handler lookup: compare every sprite's shape"""
+    for sprite in group:
+        if sprite.shape == shape:
+            return sprite
+    return None
+
+
+def registry_lookup(shape_owners, group, shape):
+    """Registry lookup used by the handlers now"""
+    sprite = shape_owners.get(shape)
+    if sprite is not None and sprite in group:
+        return sprite
+    return None
+
+
+def main():
+    rows = []
+    for count in (10, 100, 1000, 10000):
+        group = pg.sprite.Group()
+        shape_owners = {}
+        for i in range(count):
+            entity = Entity(i * 50)
+            group.add(entity)
+            shape_owners[entity.shape] = entity
+        targets = [random.choice(group.sprites()).shape for _ in range(CALLS)]
+
+        def run_scan():
+            for shape in targets:
+                scan_lookup(group, shape)
+
+        def run_registry():
+            for shape in targets:
+                registry_lookup(shape_owners, group, shape)
+
+        scan = time_call(run_scan, repeat=3) / CALLS * 1e6
+        registry = time_call(run_registry, repeat=3) / CALLS * 1e6
+        rows.append((count, f"{scan:.2f}", f"{registry:.2f}", f"{scan / registry:.0f}x"))
+
+    print_table(("entities", "scan us/callback", "registry us/callback", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
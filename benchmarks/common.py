@@ -0,0 +1,40 @@
+"""Shared helpers for the benchmark scripts (run from the repo root)"""
+import os
+import time
+import types
+
+# Run without a window or audio device
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg
+
+
+def init_display(width=1, height=1):
+    """Initialize pygame with a dummy display so convert()/convert_alpha() work"""
+    pg.init()
+    return pg.display.set_mode((width, height))
+
+
+def make_stub_game(dt=1 / 60):
+    """Minimal stand-in for Game with the attributes sprites read during update"""
+    return types.SimpleNamespace(dt=dt, camera_offset_x=0, camera_offset_y=0, frame_count=0)
+
+
+def time_call(func, repeat=5, number=1):
+    """Return the best wall time in seconds of calling func number times, over repeat runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def print_table(headers, rows):
+    """Print a simple fixed-width results table"""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(c).rjust(w) for c, w in zip(row, widths)))
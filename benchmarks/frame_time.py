@@ -0,0 +1,64 @@
+"""Per-frame cost of a running level, with the background draw timed on its own
+
+Run from the repo root: python -m benchmarks.frame_time [frames]
+"""
+import sys
+import time
+
+from benchmarks.common import print_table
+
+import pygame as pg
+import main
+from src.settings import *
+
+LEVEL_TYPES = {1: "prison", 2: "financial", 3: "market_crash"}
+
+
+def legacy_gradient(surface, level_type):
+    """Original sky: one pg.draw.line per screen row, every frame"""
+    colors = main.EnhancedBackground.gradient_colors.get(level_type)
+    if not colors:
+        return
+    top_color, bottom_color = colors
+    for y in range(HEIGHT):
+        ratio = y / HEIGHT
+        color = [int(top_color[i] * (1 - ratio) + bottom_color[i] * ratio) for i in range(3)]
+        pg.draw.line(surface, color, (0, y), (WIDTH, y))
+
+
+def main_bench(frames):
+    game = main.Game()
+    rows = []
+    for level_num in (1, 2, 3):
+        game.level_num = level_num
+        game.new_game()
+
+        update_time = draw_time = background_time = legacy_background_time = 0.0
+        for _ in range(frames):
+            game.frame_count += 1
+
+            start = time.perf_counter()
+            game.update(game.dt)
+            update_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            game.background.draw(game.screen)
+            background_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            legacy_gradient(game.screen, LEVEL_TYPES[level_num])
+            legacy_background_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            game.draw()
+            draw_time += time.perf_counter() - start
+
+        to_ms = 1000 / frames
+        rows.append((level_num, f"{update_time * to_ms:.2f}", f"{draw_time * to_ms:.2f}",
+                     f"{background_time * to_ms:.2f}", f"{legacy_background_time * to_ms:.2f}"))
+
+    print_table(("level", "update ms", "draw ms", "background ms", "old line gradient ms"), rows)
+
+
+if __name__ == "__main__":
+    main_bench(int(sys.argv[1]) if len(sys.argv) > 1 else 120)
@@ -0,0 +1,118 @@
+"""Glow.apply: per-outline-point circle drawing vs. NumPy distance falloff
+
+Run from the repo root: python -m benchmarks.glow
+"""
+import math
+import sys
+
+from benchmarks.common import init_display, time_call, print_table
+
+import numpy as np
+import pygame as pg
+from src.settings import *
+from src.effects import Glow
+
+# Absolute alpha difference (0-255) allowed between the two implementations, on average and at any pixel
+ALPHA_TOLERANCE = 4
+MAX_ALPHA_TOLERANCE = 40
+# The original draws the last outline point's circles last, so nothing overwrites them and a bright
+# spot is left where the outline ends; the new glow leaves it out, so the max is taken outside it
+END_SPOT_RADIUS = 4
+
+
+def legacy_glow_apply(surface, color=TEAL, intensity=GLOW_INTENSITY, expand=2):
+    """Original implementation, kept here as the reference look"""
+    glow_surface = pg.Surface(
+        (surface.get_width() + expand*2, surface.get_height() + expand*2),
+        pg.SRCALPHA
+    )
+    outline = pg.mask.from_surface(surface).outline()
+    for i in range(1, 4):
+        for point in outline:
+            for dx in range(-i, i+1):
+                for dy in range(-i, i+1):
+                    alpha = int(255 * intensity * (1 - (math.sqrt(dx*dx + dy*dy) / 4)))
+                    if alpha > 0:
+                        pg.draw.circle(
+                            glow_surface,
+                            (*color, alpha),
+                            (point[0] + expand + dx, point[1] + expand + dy),
+                            1
+                        )
+    result_surface = pg.Surface(glow_surface.get_size(), pg.SRCALPHA)
+    result_surface.blit(glow_surface, (0, 0))
+    result_surface.blit(surface, (expand, expand))
+    return result_surface
+
+
+def make_platform_surface(width, height):
+    """Floating platform body with X marks, like Platform.create_floating_platform"""
+    surface = pg.Surface((width, height), pg.SRCALPHA)
+    surface.fill((*TEAL, 255))
+    pg.draw.rect(surface, DARK_TEAL, (0, 0, width, height), 2)
+    for i in range(max(1, width // 40)):
+        x = (i + 1) * width // (max(1, width // 40) + 1)
+        pg.draw.line(surface, LIGHT_TEAL, (x - 6, height // 2 - 6), (x + 6, height // 2 + 6), 2)
+        pg.draw.line(surface, LIGHT_TEAL, (x - 6, height // 2 + 6), (x + 6, height // 2 - 6), 2)
+    return surface
+
+
+def make_token_surface():
+    """Token art before its glow, like SuperseedToken.build_base_image"""
+    size = int(TOKEN_SIZE * 1.5)
+    surface = pg.Surface((size, size), pg.SRCALPHA)
+    center = size // 2
+    for i in range(5):
+        pg.draw.circle(surface, (*BRIGHT_TEAL, 150 - i * 30), (center, center), TOKEN_SIZE // 2 + 6 - i)
+    pg.draw.circle(surface, DARK_TEAL, (center, center), TOKEN_SIZE // 2)
+    pg.draw.circle(surface, TEAL, (center, center), TOKEN_SIZE // 2 - 2)
+    return surface
+
+
+def alpha_difference(a, b, end_spot):
+    """Mean absolute alpha difference between two equally sized surfaces, and its max outside
+    and inside the square around the end_spot pixel"""
+    diff = np.abs(pg.surfarray.array_alpha(a).astype(int) - pg.surfarray.array_alpha(b).astype(int))
+    x, y = end_spot
+    spot = (slice(max(0, x - END_SPOT_RADIUS), x + END_SPOT_RADIUS + 1),
+            slice(max(0, y - END_SPOT_RADIUS), y + END_SPOT_RADIUS + 1))
+    spot_max = diff[spot].max()
+    mean = diff.mean()
+    diff[spot] = 0
+    return mean, diff.max(), spot_max
+
+
+def main():
+    init_display()
+
+    cases = [
+        ("token 60x60", make_token_surface(), BRIGHT_TEAL, 0.6, 4),
+        ("platform 100x30", make_platform_surface(100, 30), LIGHT_TEAL, 0.3, 2),
+        ("platform 200x30", make_platform_surface(200, 30), LIGHT_TEAL, 0.3, 2),
+        ("platform 400x40", make_platform_surface(400, 40), LIGHT_TEAL, 0.3, 2),
+    ]
+
+    rows = []
+    failed = False
+    for name, surface, color, intensity, expand in cases:
+        legacy = time_call(lambda: legacy_glow_apply(surface, color, intensity, expand), repeat=3)
+        new = time_call(lambda: Glow.apply(surface, color, intensity, expand), repeat=3)
+        end_x, end_y = pg.mask.from_surface(surface).outline()[-1]
+        mean_diff, max_diff, spot_diff = alpha_difference(
+            legacy_glow_apply(surface, color, intensity, expand),
+            Glow.apply(surface, color, intensity, expand),
+            (end_x + expand, end_y + expand)
+        )
+        in_tolerance = mean_diff <= ALPHA_TOLERANCE and max_diff <= MAX_ALPHA_TOLERANCE
+        status = "ok" if in_tolerance else "OUT OF TOLERANCE"
+        rows.append((name, f"{legacy * 1000:.2f}", f"{new * 1000:.2f}", f"{legacy / new:.1f}x",
+                     f"{mean_diff:.2f}", max_diff, spot_diff, status))
+        failed |= not in_tolerance
+
+    print_table(("surface", "before ms", "after ms", "speedup", "mean d_alpha", "max d_alpha",
+                 "end spot d_alpha", "look"), rows)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Particle update/draw cost: per-particle Surfaces vs. the shared stamp atlas
+
+After the warm-up no new stamps may be rendered (exits 1 otherwise).
+
+Run from the repo root: python -m benchmarks.particles
+"""
+import random
+import sys
+import time
+
+from benchmarks.common import init_display, print_table
+
+from src.settings import *
+from src.ui import ParticleSystem, ParticleAtlas
+
+FRAMES = 60
+WARMUP_FRAMES = 3000
+
+
+def legacy_draw(system, surface):
+    """Original draw path: render a fresh Surface for every particle every frame"""
+    n = system.count
+    progress = system.age[:n] / system.lifetime[:n]
+    for i in range(n):
+        alpha = int(255 * (1 - progress[i]))
+        size = max(1, int(system.size[i] * (1 - progress[i] * 0.5)))
+        color = tuple(system.color[i].tolist())
+        if system.particle_type == "x_mark":
+            stamp = ParticleAtlas.render_x_mark(color, float(system.rotation[i]), alpha, size)
+        elif system.particle_type == "lightning":
+            stamp = ParticleAtlas.render_lightning(color, random.randrange(1 << 16), alpha, size)
+        else:
+            stamp = ParticleAtlas.render_circle(color, alpha, size)
+        x, y = system.pos[i].tolist()
+        surface.blit(stamp, (x - stamp.get_width() / 2, y - stamp.get_height() / 2))
+
+
+def run_frames(system, screen, draw, frames, burst):
+    """Step a continuously emitting system and return seconds spent drawing"""
+    draw_time = 0.0
+    for _ in range(frames):
+        system.spawn_particles((WIDTH // 2, HEIGHT // 2), burst, spread=400, color=CONFETTI_COLORS[0])
+        system.update(1 / FPS)
+        start = time.perf_counter()
+        draw(system, screen)
+        draw_time += time.perf_counter() - start
+    return draw_time
+
+
+def main():
+    screen = init_display(WIDTH, HEIGHT)
+    rows = []
+    rendering = False
+    for particle_type in ("circle", "x_mark", "lightning"):
+        for burst in (10, 40):
+            system = ParticleSystem(particle_type, COMPLETION_PARTICLE_CAPACITY)
+            run_frames(system, screen, ParticleSystem.draw, WARMUP_FRAMES, burst)
+
+            created_before = ParticleAtlas.created
+            atlas_time = run_frames(system, screen, ParticleSystem.draw, FRAMES, burst)
+            stamps_per_frame = (ParticleAtlas.created - created_before) / FRAMES
+            rendering |= stamps_per_frame > 0
+            legacy_time = run_frames(system, screen, legacy_draw, FRAMES, burst)
+
+            rows.append((particle_type, system.count, f"{legacy_time / FRAMES * 1000:.2f}",
+                         f"{atlas_time / FRAMES * 1000:.2f}", f"{legacy_time / atlas_time:.1f}x",
+                         f"{stamps_per_frame:.2f}", len(ParticleAtlas.stamps)))
+
+    print_table(("type", "live", "before ms/frame", "after ms/frame", "speedup", "new stamps/frame",
+                 "atlas stamps"), rows)
+    return 1 if rendering else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Recording a played run and replaying it headless, checked tick by tick
+
+The live run goes through the windowed game's event handling: held keys, key
+taps for restart and next level, and a restart picked from the pause menu (the
+level-complete Next Level button requests the same tick action as the N key).
+The recording is then replayed headless and must give the same state at every
+tick.
+
+Run from the repo root: python -m benchmarks.replay [ticks] [seed]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.common import print_table
+
+import pygame as pg
+import main
+from src.settings import *
+from benchmarks.restart import scripted_bits
+
+PAUSE_RESTART_TICK = 700  # Paused, then restarted from the pause menu
+RESTART_KEY_TICK = 1500   # R tapped
+NEXT_LEVEL_KEY_TICK = 2300  # N tapped
+
+
+def tap(key):
+    """Post a key tap, as handled on its release"""
+    pg.event.post(pg.event.Event(pg.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+    pg.event.post(pg.event.Event(pg.KEYUP, key=key, mod=0, unicode="", scancode=0))
+
+
+def traced(game):
+    """Record the game's state as each fixed step starts"""
+    trace = []
+    fixed_update = game.fixed_update
+
+    def step(dt):
+        body = game.player.body
+        level = game.current_level
+        trace.append((game.level_num, body.position.x, body.position.y, body.velocity.x, body.velocity.y,
+                      game.player.tokens_collected, len(level.tokens), level.player_died, level.level_complete))
+        fixed_update(dt)
+
+    game.fixed_update = step
+    return trace
+
+
+def live_run(path, ticks, seed, level_num):
+    """Play with scripted input through the windowed game's event handling, recording it"""
+    game = main.Game(record_path=path, seed=seed)
+    game.level_num = level_num
+    game.new_game()
+    trace = traced(game)
+    game.input.sample_keyboard = lambda: scripted_bits(len(trace) + 1)
+
+    tapped = set()
+    paused_at = None
+    frames = 0
+    while len(trace) < ticks:
+        tick = len(trace)
+        if game.game_state == STATE_PLAYING and paused_at is None and tick == PAUSE_RESTART_TICK:
+            tap(pg.K_ESCAPE)
+            paused_at = frames
+        elif game.game_state == STATE_PAUSED and frames - paused_at == 30:
+            game.handle_menu_action("restart")  # What the pause menu's Restart button returns
+        elif tick in (RESTART_KEY_TICK, NEXT_LEVEL_KEY_TICK) and tick not in tapped:
+            tap(pg.K_r if tick == RESTART_KEY_TICK else pg.K_n)
+            tapped.add(tick)
+
+        game.handle_events()
+        game.update(SIM_DT)
+        game.draw()
+        frames += 1
+
+    game.input.close()
+    return trace[:ticks]
+
+
+def replay_run(path):
+    """Replay a recording headless, like --headless --replay"""
+    game = main.Game(headless=True, replay_path=path)
+    game.level_num = game.input.replayer.level_num
+    game.new_game()
+    trace = traced(game)
+    while game.input.replaying:
+        game.update(SIM_DT)
+    return trace
+
+
+def main_bench(ticks, seed):
+    rows = []
+    diverged = False
+    for level_num in (1, 2, 3):
+        fd, path = tempfile.mkstemp(suffix=".ssir")
+        os.close(fd)
+        try:
+            start = time.perf_counter()
+            live = live_run(path, ticks, seed, level_num)
+            live_time = time.perf_counter() - start
+            start = time.perf_counter()
+            replayed = replay_run(path)
+            replay_time = time.perf_counter() - start
+            size = os.path.getsize(path)
+        finally:
+            os.remove(path)
+
+        divergence = next((i for i, (a, b) in enumerate(zip(live, replayed)) if a != b), None)
+        if divergence is None and len(live) != len(replayed):
+            divergence = min(len(live), len(replayed))
+        diverged |= divergence is not None
+        rows.append((level_num, len(live), size, f"{live_time:.1f}", f"{replay_time:.1f}",
+                     "identical" if divergence is None else f"DIVERGES at tick {divergence}"))
+
+    print_table(("level", "ticks", "recording bytes", "live s", "replay s", "replay"), rows)
+    return 1 if diverged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_bench(int(sys.argv[1]) if len(sys.argv) > 1 else 3000,
+                        int(sys.argv[2]) if len(sys.argv) > 2 else 5))
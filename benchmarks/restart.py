@@ -0,0 +1,79 @@
+"""Restarting a level from its spawn snapshot vs. rebuilding it, timed and checked for identical play
+
+Each level is played for a while with scripted input and restarted, once from
+the snapshot and once by building it again; the same input after either
+restart must then give the same trace.
+
+Run from the repo root: python -m benchmarks.restart [steps] [seed]
+"""
+import sys
+import time
+
+from benchmarks.common import print_table
+
+import main
+from src.settings import *
+from src.input_manager import InputFrame
+
+
+def scripted_bits(tick):
+    """Mostly run right, sometimes left, jumping and interacting now and then"""
+    bits = InputFrame.RIGHT if (tick // 90) % 3 != 2 else InputFrame.LEFT
+    if tick % 47 < 10:
+        bits |= InputFrame.JUMP
+    if tick % 200 == 0:
+        bits |= InputFrame.INTERACT
+    return bits
+
+
+def play(game, steps):
+    """Step the game with scripted input, returning the state after each step"""
+    ticks = iter(range(1, steps + 1))
+    game.input.sample_keyboard = lambda: scripted_bits(next(ticks))
+    trace = []
+    for _ in range(steps):
+        game.update(SIM_DT)
+        level = game.current_level
+        body = game.player.body
+        trace.append((body.position.x, body.position.y, body.velocity.x, body.velocity.y,
+                      game.player.tokens_collected, len(level.tokens), level.player_died, level.level_complete,
+                      tuple(sorted((p.body.position.x, p.body.position.y) for p in level.platforms))))
+    return trace
+
+
+def restarted(level_num, seed, steps, rebuild):
+    """A game that played the level for a while and then restarted it, and the time the restart took"""
+    game = main.Game(headless=True, seed=seed)
+    game.level_num = level_num
+    game.new_game()
+    play(game, steps)
+    if rebuild:
+        # Without a snapshot the restart builds the level again, as before snapshots existed
+        game.level_snapshot = None
+    start = time.perf_counter()
+    game.restart_level()
+    return game, time.perf_counter() - start
+
+
+def main_bench(steps, seed):
+    rows = []
+    diverged = False
+    for level_num in (1, 2, 3):
+        game, restore_time = restarted(level_num, seed, steps, rebuild=False)
+        restored = play(game, steps)
+        game, rebuild_time = restarted(level_num, seed, steps, rebuild=True)
+        rebuilt = play(game, steps)
+
+        divergence = next((i for i, (a, b) in enumerate(zip(restored, rebuilt)) if a != b), None)
+        diverged |= divergence is not None
+        rows.append((level_num, f"{restore_time * 1000:.1f}", f"{rebuild_time * 1000:.1f}",
+                     f"{rebuild_time / restore_time:.0f}x",
+                     "identical" if divergence is None else f"DIVERGES at step {divergence}"))
+
+    print_table(("level", "restore ms", "rebuild ms", "speedup", f"play after restart ({steps} steps)"), rows)
+    return 1 if diverged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1200,
+                        int(sys.argv[2]) if len(sys.argv) > 2 else 5))
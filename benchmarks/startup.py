@@ -0,0 +1,72 @@
+"""Startup time and peak memory with a cold (empty) and a warm asset cache
+
+Every run is a fresh process pointed at a temporary cache directory, so the
+cold run generates and bakes all procedural art and the warm runs load it.
+
+Run from the repo root: python -m benchmarks.startup [warm_runs]
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import print_table
+
+LEVELS = (1, 2, 3)
+
+
+def run_startup(cache_dir):
+    """Time Game() and building each level in this process, printing the results and peak memory as JSON"""
+    from src import asset_cache
+    asset_cache.ASSET_CACHE_DIR = cache_dir
+    import main
+
+    times = {}
+    start = time.perf_counter()
+    game = main.Game(seed=0)
+    times["game init"] = time.perf_counter() - start
+
+    for level_num in LEVELS:
+        game.level_num = level_num
+        start = time.perf_counter()
+        for _ in game.load_level():
+            pass
+        times[f"level {level_num}"] = time.perf_counter() - start
+    times["total"] = sum(times.values())
+    # Peak resident memory in MB (ru_maxrss is in KB on Linux)
+    times["peak_rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps(times))
+
+
+def launch(cache_dir):
+    """Run one startup in a child process and return its phase times"""
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    output = subprocess.run([sys.executable, "-m", "benchmarks.startup", "--run", cache_dir],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    # Level setup prints progress, so the results are the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main_bench(warm_runs):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = launch(cache_dir)
+        warm_samples = [launch(cache_dir) for _ in range(warm_runs)]
+
+    cold_rss = cold.pop("peak_rss")
+    warm_rss = min(sample.pop("peak_rss") for sample in warm_samples)
+    rows = []
+    for phase, cold_time in cold.items():
+        warm_time = min(sample[phase] for sample in warm_samples)
+        rows.append((phase, f"{cold_time * 1000:.1f}", f"{warm_time * 1000:.1f}", f"{cold_time / warm_time:.1f}x"))
+    print_table(("phase", "cold (ms)", f"warm, best of {warm_runs} (ms)", "speedup"), rows)
+    print(f"Peak memory: {cold_rss:.0f} MB cold, {warm_rss:.0f} MB warm")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--run"]:
+        run_startup(sys.argv[2])
+    else:
+        main_bench(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
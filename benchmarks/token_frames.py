@@ -0,0 +1,66 @@
+"""Per-token update cost: per-frame smoothscale+rotate vs. the shared frame cache
+
+Run from the repo root: python -m benchmarks.token_frames
+"""
+import math
+import time
+
+from benchmarks.common import init_display, make_stub_game, time_call, print_table
+
+import pygame as pg
+from src.sprites import SuperseedToken
+
+FRAMES = 60
+
+
+def legacy_update(token):
+    """Original update path: rescale and rotate the base image every frame"""
+    token.angle = (token.angle + token.rotation_speed * token.game.dt * 60) % 360
+    token.pulse_time += token.game.dt * token.pulse_speed
+    pulse_scale = 1.0 + math.sin(token.pulse_time) * token.pulse_amount
+    pulsed_base = pg.transform.smoothscale(
+        token.base_image,
+        (int(token.base_image.get_width() * pulse_scale),
+         int(token.base_image.get_height() * pulse_scale))
+    )
+    token.image = pg.transform.rotate(pulsed_base, token.angle)
+    center = token.rect.center
+    token.rect = token.image.get_rect()
+    token.rect.center = center
+
+
+def main():
+    init_display()
+    game = make_stub_game()
+
+    # Frame cache warm-up is a one-time cost per token type
+    start = time.perf_counter()
+    for token_type in SuperseedToken.token_types:
+        SuperseedToken.build_frames(token_type)
+    build_time = time.perf_counter() - start
+    print(f"Frame cache build: {build_time * 1000:.1f} ms for "
+          f"{len(SuperseedToken.frame_cache)} frames")
+
+    rows = []
+    for count in (10, 100, 1000):
+        tokens = [SuperseedToken(game, (i % 50) * 50, (i // 50) * 50) for i in range(count)]
+
+        def run_legacy():
+            for token in tokens:
+                legacy_update(token)
+
+        def run_cached():
+            for token in tokens:
+                token.update()
+
+        legacy = time_call(run_legacy, repeat=3, number=FRAMES)
+        cached = time_call(run_cached, repeat=3, number=FRAMES)
+        per_legacy = legacy / (FRAMES * count) * 1e6
+        per_cached = cached / (FRAMES * count) * 1e6
+        rows.append((count, f"{per_legacy:.1f}", f"{per_cached:.1f}", f"{per_legacy / per_cached:.1f}x"))
+
+    print_table(("tokens", "before us/token", "after us/token", "speedup"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 import pygame as pg
 import pymunk
 import pymunk.pygame_util
+import os
 import sys
-import random
+import argparse
 import time
 import math
+import numpy as np
 from src.settings import *
 from src.sprites import EnhancedBackground
 from src.entities.player import Player
@@ -13,9 +15,36 @@ from src.ui import FadeEffect, ParticleSystem, AnimatedText, lighten_color, dark
 from src.menu import StartMenu, PauseMenu, ControlsScreen, CreditsScreen, LevelSelectScreen
 from src.effects import Shadow
 from src.sound_manager import SoundManager
+from src.input_manager import InputManager, InputFrame
+from src import asset_cache
+from src.static_layer import StaticLayer
+from src.surface_format import SurfaceFormat
+from src.rng import RandomStreams
+from src.profiler import FrameProfiler
+from src.quality import QualityGovernor
+from src.text import Text
+from src.hud import Hud
+from src.snapshot import LevelSnapshot
+from src.prebuild import LevelPrebuild
+
+effects_random = RandomStreams.get("effects")
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, record_path=None, replay_path=None, seed=None):
+        # Headless mode simulates without a window or audio device
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        
+        # Gameplay input, sampled once per simulation tick (optionally recorded or replayed)
+        self.input = InputManager(self, record_path, replay_path)
+        
+        # Seed every random stream from one session seed (replays reuse the recorded one)
+        if seed is None and self.input.replayer:
+            seed = self.input.replayer.seed
+        self.seed = RandomStreams.set_seed(seed)
+        
         # Initialize pygame
         pg.init()
         pg.display.set_caption(TITLE)
@@ -31,6 +60,7 @@ class Game:
         self.all_sprites = pg.sprite.Group()
         self.current_level = None
         self.player = None
+        self.static_layer = None
         self.camera_offset_x = 0
         self.camera_offset_y = 0
         self.target_camera_x = 0  # For smooth camera following
@@ -45,7 +75,15 @@ class Game:
         
         # Performance tracking
         self.frame_count = 0
-        self.dt = 0
+        self.dt = SIM_DT        # Timestep seen by gameplay code (always the fixed step)
+        self.frame_dt = 0       # Real time of the last rendered frame
+        
+        # Fixed-timestep simulation
+        self.accumulator = 0    # Unsimulated real time carried between frames
+        self.sim_time = 0       # Simulated gameplay time in seconds
+        self.sim_step = 0       # Number of fixed steps taken
+        self.interpolation = 1  # How far rendering is between the last two steps (0-1)
+        self.prev_camera = (0, 0)
         
         # Game state
         self.running = True
@@ -54,14 +92,25 @@ class Game:
         self.level_num = 2  # Start with Financial District as default
         self.game_over = False
         self.debug = False
+        self.profiler = FrameProfiler()  # Frame phase timings, enabled together with debug
         self.game_state = STATE_MENU
         self.prev_state = None
         self.transition_effect = FadeEffect(0.5)
+        self.transition_frame = None  # Last frame before a level transition, shown under the fade
+        self.level_loader = None      # Level build in progress during a transition
+        self.stepping = False         # Whether a fixed step is running
+        self.queued_transition = None  # Headless level change requested during a step (restart flag)
+        self.level_snapshot = None    # Spawn state of the current level, restored on restart
+        self.prebuild = None          # Next level being built on a worker thread
         
         # Post-processing effects
-        self.post_processing_enabled = True
+        self.post_processing_enabled = POST_PROCESSING_ENABLED
+        
+        # Adjusts visual quality tiers to the measured frame time
+        self.quality = QualityGovernor(adaptive=ADAPTIVE_PERFORMANCE and not headless)
         self.vignette_surface = None  # Pre-calculated vignette (for optimization)
-        self._generate_vignette()
+        if not headless:
+            self._generate_vignette()
         
         # Initialize sound manager
         self.sound_manager = SoundManager(self)
@@ -69,6 +118,18 @@ class Game:
         # Setup collision handlers
         self.setup_collisions()
         
+        # Font for UI
+        self.font = Text.font(None, 36)
+        self.hud = Hud(self)
+        
+        # Particle effects
+        self.token_particles = ParticleSystem("circle", TOKEN_PARTICLE_CAPACITY)
+        
+        # Menus are never shown in headless mode
+        self.current_menu = None
+        if headless:
+            return
+        
         # Create menus
         self.start_menu = StartMenu(self)
         self.pause_menu = PauseMenu(self)
@@ -77,12 +138,6 @@ class Game:
         self.level_select_screen = LevelSelectScreen(self)
         self.current_menu = self.start_menu
         
-        # Font for UI
-        self.font = pg.font.SysFont(None, 36)
-        
-        # Particle effects
-        self.token_particles = ParticleSystem("circle", 30)
-        
         # Setup character previews for main menu
         self._setup_menu_previews()
         
@@ -90,7 +145,15 @@ class Game:
         self.start_menu.activate()
         
     def _setup_menu_previews(self):
-        """Create character preview images for the menu display"""
+        """Create character preview images for the menu display (baked into the asset cache)"""
+        palette = (BLUE_PRISONER, TEAL, DARK_TEAL, LIGHT_TEAL, BRIGHT_TEAL, WHITE, BLACK)
+        prisoner_preview, wizard_preview = asset_cache.cached_surfaces(
+            "menu_previews", (PLAYER_WIDTH, PLAYER_HEIGHT, palette, SHADOW_BLUR_PASSES), self._build_menu_previews)
+        self.start_menu.prisoner_preview = SurfaceFormat.finalize(prisoner_preview, rle=True)
+        self.start_menu.wizard_preview = SurfaceFormat.finalize(wizard_preview, rle=True)
+        
+    def _build_menu_previews(self):
+        """Draw the prisoner and wizard previews, with drop shadows"""
         # Create larger versions of the character sprites for menu display
         preview_scale = 3.5  # Slightly larger for more detail
         preview_width = PLAYER_WIDTH * preview_scale
@@ -307,10 +370,7 @@ class Game:
         # Apply enhanced shadow effects with deeper shadows
         prisoner_preview = Shadow.apply(prisoner_preview, offset_x=7, offset_y=7, blur=4, alpha=160)
         wizard_preview = Shadow.apply(wizard_preview, offset_x=7, offset_y=7, blur=4, alpha=160)
-        
-        # Set the previews
-        self.start_menu.prisoner_preview = prisoner_preview
-        self.start_menu.wizard_preview = wizard_preview
+        return [prisoner_preview, wizard_preview]
         
     def setup_collisions(self):
         """Set up collision handlers for different object types"""
@@ -321,21 +381,19 @@ class Game:
             shapes = arbiter.shapes
             player_shape, token_shape = shapes
             
-            # Find the token sprite from its shape
-            for token in self.current_level.tokens:
-                if token.shape == token_shape:
-                    self.player.collect_token()
-                    token.kill()
-                    self.space.remove(token.shape, token.body)
-                    
-                    # Create particle effect at token position
-                    token_pos = token.rect.center
-                    self.token_particles.spawn_particles(
-                        (token_pos[0] + self.camera_offset_x, 
-                         token_pos[1] + self.camera_offset_y), 
-                        10
-                    )
-                    break
+            # Look up the token sprite from its shape
+            token = self.current_level.shape_owners.get(token_shape)
+            if token is not None and token in self.current_level.tokens:
+                self.player.collect_token()
+                self.current_level.remove_token(token)
+                
+                # Create particle effect at token position
+                token_pos = token.rect.center
+                self.token_particles.spawn_particles(
+                    (token_pos[0] + self.camera_offset_x, 
+                     token_pos[1] + self.camera_offset_y), 
+                    10
+                )
                     
             # Return False to ensure no physical collision response
             return False
@@ -350,12 +408,11 @@ class Game:
             shapes = arbiter.shapes
             player_shape, platform_shape = shapes
             
-            # Find the platform from its shape
-            for platform in self.current_level.platforms:
-                if platform.shape == platform_shape:
-                    # Record this platform as the one player is standing on
-                    self.player.current_platform = platform
-                    break
+            # Look up the platform from its shape (doors share the collision type)
+            platform = self.current_level.shape_owners.get(platform_shape)
+            if platform is not None and platform in self.current_level.platforms:
+                # Record this platform as the one player is standing on
+                self.player.current_platform = platform
             return True
             
         def separate_platform(arbiter, space, data):
@@ -383,13 +440,56 @@ class Game:
         ground_handler.separate = separate_platform
         ground_handler.post_solve = post_solve
         
-    def new_game(self):
+    def new_game(self, restart=False):
         """Start a new game"""
+        # Nothing is drawn while loading here, so a prebuild is waited for instead of polled
+        if self.prebuild:
+            self.prebuild.wait()
+        for _ in self.load_level(restart):
+            pass
+        self.start_level()
+        
+    def load_level(self, restart=False):
+        """Get the current level ready to start, in stages (see build_level)"""
+        # A restart of the same level only needs its spawn state put back
+        if restart and self.level_snapshot and self.level_snapshot.matches(self):
+            self.cancel_prebuild()
+            self.level_snapshot.restore()
+        else:
+            yield from self.build_level()
+        
+    def build_level(self):
+        """Build the current level, yielding between stages so a transition can spread them over frames"""
+        prebuild = self.take_prebuild()
+        if prebuild:
+            # Let the worker finish without holding up the frames
+            while not prebuild.done:
+                yield
+            if prebuild.error is None:
+                self.attach_prebuild(prebuild)
+                # Its RLE layers are encoded here rather than in the first frames of the level
+                yield from SurfaceFormat.encode_pending()
+                return
+            print(f"Prebuilding level {prebuild.level_num} failed, building it now: {prebuild.error}")
+            
         # Clear any existing objects
         self.clear_level()
         
-        # Create level using the factory function
-        self.current_level = get_level(self, self.level_num)
+        # Every attempt at a level gets the same layout and gameplay randomness
+        RandomStreams.begin_level(self.level_num)
+        yield
+        
+        # Create level using the factory function. Its bodies are held back and added in one go, like
+        # after a prebuild, so bodies dropped while building (excess tokens) never reach the space and
+        # the space gives the same bodies the same ids whether the level is built, prebuilt or restored
+        self.current_level = get_level(self, self.level_num, detached=True)
+        if hasattr(self.current_level, 'attach'):
+            self.current_level.attach()
+        yield
+        
+        # Pre-composite the platforms that never move into level-space tiles
+        self.static_layer = StaticLayer(self.current_level.platforms, bake=not self.headless)
+        yield
         
         # Create player
         self.player = Player(self, self.current_level.start_x, self.current_level.start_y)
@@ -397,28 +497,98 @@ class Game:
         self.space.add(self.player.body, self.player.shape)
         
         # Create background based on level type
-        if self.level_num == 2:
-            level_type = "financial"
-        elif self.level_num == 3:
-            level_type = "market_crash"
-        else:
-            level_type = "prison"
+        self.background = EnhancedBackground(self, LEVEL_BACKGROUNDS.get(self.level_num, "prison"))
+        
+        # Remember the spawn state so restarts can skip the rebuild
+        self.level_snapshot = LevelSnapshot(self)
+        
+    def prebuild_next_level(self):
+        """Start building the level that follows this one on a worker thread"""
+        # Headless runs never wait on a fade, so they keep building in place
+        if self.headless or not PREBUILD_NEXT_LEVEL or self.prebuild:
+            return
+        self.prebuild = LevelPrebuild(self, self.following_level_num())
+        
+    def take_prebuild(self):
+        """The prebuild of the level being loaded, if there is one (any other prebuild is dropped)"""
+        if self.prebuild and self.prebuild.level_num == self.level_num:
+            prebuild, self.prebuild = self.prebuild, None
+            return prebuild
+        self.cancel_prebuild()
+        return None
+        
+    def cancel_prebuild(self):
+        """Drop the prebuild and the surfaces it queued for encoding, once its thread has finished"""
+        if self.prebuild:
+            self.prebuild.wait()
+            self.prebuild = None
+            SurfaceFormat.drop_pending()
             
-        self.background = EnhancedBackground(self, level_type)
+    def attach_prebuild(self, prebuild):
+        """Swap in a level built on the worker thread; only its physics bodies still need adding"""
+        self.clear_level()
+        self.current_level = prebuild.level
+        self.current_level.attach()
+        self.static_layer = prebuild.static_layer
+        
+        self.player = prebuild.player
+        self.all_sprites.add(self.player)
+        self.space.add(self.player.body, self.player.shape)
+        self.background = prebuild.background
+        
+        # Carry on from the level streams the build used, as after a build on this thread
+        RandomStreams.restore_level_state(prebuild.random_state)
+        self.level_snapshot = LevelSnapshot(self)
         
+    def start_level(self):
+        """Start playing the freshly built level"""
         # Set game state
         self.game_state = STATE_PLAYING
         self.playing = True
         self.paused = False
         
         # Set level start time for spawn protection
-        self.current_level.level_start_time = self.dt * self.frame_count
+        self.current_level.level_start_time = self.sim_time
+        
+        # Nothing from the previous level is left to interpolate from
+        self.accumulator = 0
+        self.interpolation = 1
         
         # Start fade in transition
         self.transition_effect.start_fade_in()
         
+    def begin_transition(self, restart=False):
+        """Fade out to the current level number, loading it while the fade plays"""
+        if self.headless:
+            # As after a fade, the level changes once the step that asked for it has finished
+            if self.stepping:
+                self.queued_transition = restart
+            else:
+                self.new_game(restart)
+            return
+            
+        # Input and the window stay live: the main loop keeps running in the transition
+        # state, drawing the last frame under the fade while the level loads.
+        self.game_state = STATE_TRANSITION
+        self.transition_frame = self.screen.copy()
+        self.level_loader = self.load_level(restart)
+        self.transition_effect.start_fade_out()
+        
+    def update_transition(self, dt):
+        """Advance the fade and the next stage of the level build"""
+        self.transition_effect.update(dt)
+        if self.level_loader is not None:
+            if next(self.level_loader, StopIteration) is StopIteration:
+                self.level_loader = None
+        elif not self.transition_effect.fading_out:
+            self.transition_frame = None
+            self.start_level()
+        
     def clear_level(self):
         """Clear all game objects from the current level"""
+        self.cancel_prebuild()
+        self.level_snapshot = None
+        
         if self.player:
             self.space.remove(self.player.shape, self.player.body)
             self.player.kill()
@@ -467,15 +637,16 @@ class Game:
             elif self.game_state == STATE_PLAYING and self.current_level.level_complete and self.current_level.completion_time >= 5.0:
                 # Check for level completion menu button clicks
                 if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:  # Left click
-                    mouse_pos = pg.mouse.get_pos()
+                    mouse_pos = event.pos
                     
-                    # Check next level button
+                    # Check next level button (applied on the next tick, so recordings include it)
                     if hasattr(self.current_level, 'next_level_button') and self.current_level.next_level_button.rect.collidepoint(mouse_pos):
-                        self.next_level()
+                        self.input.request(InputFrame.NEXT_LEVEL)
                         break
                         
                     # Check main menu button
                     if hasattr(self.current_level, 'main_menu_button') and self.current_level.main_menu_button.rect.collidepoint(mouse_pos):
+                        self.input.stop_recording()
                         self.game_state = STATE_MENU
                         self.current_menu = self.start_menu
                         self.current_menu.activate()
@@ -483,32 +654,18 @@ class Game:
                 
             # Game input handling
             elif self.game_state == STATE_PLAYING:
+                # Jump, interact, restart and next level are applied on the next simulation tick
+                self.input.handle_event(event)
+                
                 if event.type == pg.KEYDOWN:
                     if event.key == pg.K_ESCAPE:
                         self.pause_game()
-                            
-                    elif event.key == pg.K_SPACE:
-                        self.player.jump()
                         
                 elif event.type == pg.KEYUP:
-                    if event.key == pg.K_SPACE:
-                        self.player.release_jump()
-                        
-                    elif event.key == pg.K_e:
-                        # Handle interaction with nearby objects
-                        self.handle_player_interaction()
-                            
-                    elif event.key == pg.K_d:
-                        # Toggle debug drawing
+                    if event.key == pg.K_d:
+                        # Toggle debug drawing and the frame profiler overlay
                         self.debug = not self.debug
-                            
-                    elif event.key == pg.K_r:
-                        # Restart level
-                        self.restart_level()
-                            
-                    elif event.key == pg.K_n:
-                        # Next level
-                        self.next_level()
+                        self.profiler.toggle(self.debug)
                         
                     elif event.key == pg.K_p:
                         # Toggle post-processing effects (for performance)
@@ -534,10 +691,14 @@ class Game:
             self.paused = False
             
         elif action == "restart":
+            # Resume and restart on the next tick, through the input so recordings include it
             self.current_menu.deactivate()
-            self.restart_level()
+            self.game_state = STATE_PLAYING
+            self.paused = False
+            self.input.request(InputFrame.RESTART)
             
         elif action == "main_menu":
+            self.input.stop_recording()
             self.current_menu.deactivate()
             self.current_menu = self.start_menu
             self.current_menu.activate()
@@ -584,27 +745,23 @@ class Game:
         
     def restart_level(self):
         """Restart the current level"""
-        self.transition_effect.start_fade_out()
-        # Wait for transition to complete
-        while not self.transition_effect.update(self.clock.tick(FPS) / 1000.0):
-            pass
-        self.new_game()
+        self.begin_transition(restart=True)
+        
+    def following_level_num(self):
+        """Number of the level after the current one"""
+        level_num = self.level_num + 1
+        if level_num > 3:  # Updated to support 3 levels
+            level_num = 1  # Loop back to first level
+        return level_num
         
     def next_level(self):
         """Advance to the next level"""
-        self.level_num += 1
-        if self.level_num > 3:  # Updated to support 3 levels
-            self.level_num = 1  # Loop back to first level
-            
-        self.transition_effect.start_fade_out()
-        # Wait for transition to complete
-        while not self.transition_effect.update(self.clock.tick(FPS) / 1000.0):
-            pass
-        self.new_game()
+        self.level_num = self.following_level_num()
+        self.begin_transition()
                     
     def handle_player_interaction(self):
         """Handle player interaction with nearby objects"""
-        for obj in self.current_level.interactive_objects:
+        for obj in self.current_level.object_index.query_radius(self.player.rect.center, INTERACTION_DISTANCE):
             if obj.interact():
                 # Object was successfully interacted with
                 # Add particle effects around the interaction point
@@ -616,6 +773,13 @@ class Game:
                 )
                 break
                 
+    def get_viewport(self, margin=VIEWPORT_MARGIN):
+        """Level-space rect currently on screen, grown by a margin"""
+        return pg.Rect(-self.camera_offset_x - margin, 
+                       -self.camera_offset_y - margin,
+                       WIDTH + margin*2, 
+                       HEIGHT + margin*2)
+        
     def camera_shake(self, intensity=5.0, duration=0.5):
         """Trigger a camera shake effect with given intensity and duration"""
         self.shake_intensity = intensity
@@ -630,6 +794,10 @@ class Game:
             self.current_menu.update(dt)
             return
             
+        if self.game_state == STATE_TRANSITION:
+            self.update_transition(dt)
+            return
+            
         # Update transition effects
         self.transition_effect.update(dt)
             
@@ -637,12 +805,59 @@ class Game:
         if self.game_state != STATE_PLAYING:
             return
             
+        # Run as many fixed steps as the elapsed time covers (capped to avoid a spiral of death)
+        self.accumulator = min(self.accumulator + dt, SIM_DT * MAX_SUBSTEPS)
+        level = self.current_level
+        while self.accumulator >= SIM_DT - 1e-9 and self.game_state == STATE_PLAYING:
+            self.accumulator -= SIM_DT
+            self.save_previous_state()
+            self.stepping = True
+            self.fixed_update(SIM_DT)
+            self.stepping = False
+            if self.queued_transition is not None:
+                restart, self.queued_transition = self.queued_transition, None
+                self.new_game(restart)
+                
+            # A restart or level change replaces everything that was being stepped
+            if self.current_level is not level:
+                self.accumulator = 0
+                break
+                
+        # Render between the previous and current step
+        self.interpolation = min(1.0, max(0.0, self.accumulator / SIM_DT))
+        
+    def fixed_update(self, dt):
+        """Advance gameplay by one fixed timestep"""
+        # Sample this tick's input and apply its one-shot actions
+        frame = self.input.next_frame()
+        if frame.pressed(InputFrame.RESTART):
+            self.restart_level()
+            return
+        if frame.pressed(InputFrame.NEXT_LEVEL):
+            self.next_level()
+            return
+        if frame.pressed(InputFrame.JUMP):
+            self.player.jump()
+        elif frame.released(InputFrame.JUMP):
+            self.player.release_jump()
+        if frame.pressed(InputFrame.INTERACT):
+            # Handle interaction with nearby objects
+            self.handle_player_interaction()
+            
+        self.dt = dt
+        self.sim_time += dt
+        self.sim_step += 1
+        self.profiler.mark("update")
+        
         # Step the physics simulation
-        self.space.step(1/FPS)
+        self.space.step(dt)
+        self.profiler.mark("physics")
         
         # Update sprites
         self.all_sprites.update()
+        self.profiler.mark("sprites")
         self.current_level.update()
+        self.profiler.mark("level")
         
         # Update particle effects
         self.token_particles.update(dt)
@@ -656,8 +871,8 @@ class Game:
             shake_decay = 1.0 - (self.shake_time / self.shake_duration)
             # Calculate random offsets, stronger at start and weakening over time
             current_intensity = self.shake_intensity * shake_decay
-            self.shake_offset_x = random.uniform(-current_intensity, current_intensity)
-            self.shake_offset_y = random.uniform(-current_intensity, current_intensity)
+            self.shake_offset_x = effects_random.uniform(-current_intensity, current_intensity)
+            self.shake_offset_y = effects_random.uniform(-current_intensity, current_intensity)
         
         # Update camera position to follow player with smooth following
         target_camera_x = -self.player.rect.centerx + WIDTH // 2
@@ -671,9 +886,9 @@ class Game:
         min_offset = -self.current_level.width + WIDTH
         self.camera_offset_x = max(min(self.camera_offset_x, max_offset), min_offset)
         
-        # Apply camera shake on top of normal camera position
+        # Apply camera shake on top of normal camera position (no vertical follow, so y is only shake)
         self.camera_offset_x += self.shake_offset_x
-        self.camera_offset_y += self.shake_offset_y
+        self.camera_offset_y = self.shake_offset_y
         
         # Update background scroll position
         self.background.update(self.player.rect.centerx)
@@ -691,60 +906,111 @@ class Game:
             # After a delay, we'll proceed to the next level
             if self.current_level.completion_time > 2.5:
                 self.next_level()
+                
+        self.profiler.mark("update")
             
+    def interpolated_sprites(self):
+        """Sprites whose position or bobbing can change during a fixed step"""
+        level = self.current_level
+        return [self.player, *self.static_layer.dynamic_sprites, *level.interactive_objects,
+                *level.token_index.query(self.get_viewport())]
+        
+    def save_previous_state(self):
+        """Remember positions before a fixed step so rendering can interpolate from them"""
+        step = self.sim_step + 1  # The step about to run
+        for sprite in self.interpolated_sprites():
+            sprite.prev_state = (step, sprite.rect.centerx, sprite.rect.centery,
+                                 getattr(sprite, 'visual_offset_y', 0))
+        self.prev_camera = (self.camera_offset_x, self.camera_offset_y)
+        
+    def apply_interpolation(self):
+        """Move sprites and camera to their render positions, returning what to restore"""
+        t = self.interpolation
+        restore = []
+        for sprite in self.interpolated_sprites():
+            prev = getattr(sprite, 'prev_state', None)
+            # Only blend with a state saved right before the latest step
+            if prev is None or prev[0] != self.sim_step:
+                continue
+            rect = sprite.rect
+            offset_y = getattr(sprite, 'visual_offset_y', 0)
+            restore.append((sprite, rect.center, offset_y))
+            rect.center = (round(prev[1] + (rect.centerx - prev[1]) * t),
+                           round(prev[2] + (rect.centery - prev[2]) * t))
+            if hasattr(sprite, 'visual_offset_y'):
+                sprite.visual_offset_y = prev[3] + (offset_y - prev[3]) * t
+                
+        camera = (self.camera_offset_x, self.camera_offset_y)
+        self.camera_offset_x = self.prev_camera[0] + (camera[0] - self.prev_camera[0]) * t
+        self.camera_offset_y = self.prev_camera[1] + (camera[1] - self.prev_camera[1]) * t
+        return restore, camera
+        
+    def restore_interpolation(self, state):
+        """Put simulation positions back after rendering"""
+        restore, camera = state
+        for sprite, center, offset_y in restore:
+            sprite.rect.center = center
+            if hasattr(sprite, 'visual_offset_y'):
+                sprite.visual_offset_y = offset_y
+        self.camera_offset_x, self.camera_offset_y = camera
+        
     def draw(self):
         """Render game objects to the screen"""
+        # Nothing is ever presented in headless mode
+        if self.headless:
+            return
+            
         # Clear screen
         self.screen.fill(BLACK)
         
         if self.game_state == STATE_PLAYING:
+            # Draw sprites between their last two simulated positions
+            interpolation_state = self.apply_interpolation()
+            
             # Draw game elements
             # Draw background
             self.background.draw(self.screen)
+            self.profiler.mark("background")
             
             # Create a temporary surface for level elements
             level_surface = pg.Surface((WIDTH, HEIGHT), pg.SRCALPHA)
             level_surface.fill((0, 0, 0, 0))  # Clear with transparent
             
             # Define viewport with extra margin for smoother scrolling
-            viewport_margin = 100  # Extra pixels beyond screen edge
-            viewport = pg.Rect(-self.camera_offset_x - viewport_margin, 
-                             -self.camera_offset_y - viewport_margin,
-                             WIDTH + viewport_margin*2, 
-                             HEIGHT + viewport_margin*2)
+            viewport = self.get_viewport()
                 
-            # Draw level with camera offset - only draw visible objects (viewport culling)
-            for sprite in self.current_level.platforms:
-                # Only draw if in viewport
-                if viewport.colliderect(sprite.rect):
-                    if hasattr(sprite, 'draw'):
-                        sprite.draw(level_surface, self.camera_offset_x, self.camera_offset_y)
-                    else:
-                        level_surface.blit(sprite.image, 
-                                         (sprite.rect.x + self.camera_offset_x, 
-                                          sprite.rect.y + self.camera_offset_y))
+            # Static platforms are drawn from their pre-composited tiles
+            self.static_layer.draw(level_surface, self.camera_offset_x, self.camera_offset_y)
+            
+            # Draw moving platforms with camera offset - the spatial index only returns visible objects
+            for sprite in self.current_level.platform_index.query(viewport):
+                if sprite in self.static_layer.static_sprites:
+                    continue
+                if hasattr(sprite, 'draw'):
+                    sprite.draw(level_surface, self.camera_offset_x, self.camera_offset_y)
+                else:
+                    level_surface.blit(sprite.image, 
+                                     (sprite.rect.x + self.camera_offset_x, 
+                                      sprite.rect.y + self.camera_offset_y))
                 
-            for sprite in self.current_level.tokens:
-                # Only draw if in viewport
-                if viewport.colliderect(sprite.rect):
-                    if hasattr(sprite, 'draw'):
-                        sprite.draw(level_surface, self.camera_offset_x, self.camera_offset_y)
-                    else:
-                        level_surface.blit(sprite.image, 
-                                         (sprite.rect.x + self.camera_offset_x, 
-                                          sprite.rect.y + self.camera_offset_y))
+            for sprite in self.current_level.token_index.query(viewport):
+                if hasattr(sprite, 'draw'):
+                    sprite.draw(level_surface, self.camera_offset_x, self.camera_offset_y)
+                else:
+                    level_surface.blit(sprite.image, 
+                                     (sprite.rect.x + self.camera_offset_x, 
+                                      sprite.rect.y + self.camera_offset_y))
                 
             # Draw interactive objects with viewport culling
-            for obj in self.current_level.interactive_objects:
-                # Only draw if in viewport
-                if viewport.colliderect(obj.rect):
-                    level_surface.blit(obj.image,
-                                     (obj.rect.x + self.camera_offset_x,
-                                      obj.rect.y + self.camera_offset_y))
+            for obj in self.current_level.object_index.query(viewport):
+                level_surface.blit(obj.image,
+                                 (obj.rect.x + self.camera_offset_x,
+                                  obj.rect.y + self.camera_offset_y))
 
-            # Draw player with camera offset
+            # Draw player with camera offset (and any death shake, which is only drawn)
+            shake_x, shake_y = self.player.shake_offset
             # Check if spawn protection is active
-            current_time = self.dt * self.frame_count
+            current_time = self.sim_time
             is_protected = current_time - self.current_level.level_start_time < self.current_level.spawn_protection_time
             
             # Draw player - with protection effect if needed
@@ -762,20 +1028,20 @@ class Game:
                 
                 # Draw the protected player
                 level_surface.blit(player_img, 
-                                 (self.player.rect.x + self.camera_offset_x, 
-                                  self.player.rect.y + self.camera_offset_y))
+                                 (self.player.rect.x + self.camera_offset_x + shake_x, 
+                                  self.player.rect.y + self.camera_offset_y + shake_y))
                   
                 # Draw protection indicator text
-                protection_font = pg.font.SysFont(None, 20)
-                protection_text = protection_font.render("Protected", True, BRIGHT_TEAL)
+                protection_font = Text.font(None, 20)
+                protection_text = Text.render(protection_font, "Protected", BRIGHT_TEAL)
                 text_x = self.player.rect.centerx + self.camera_offset_x - protection_text.get_width() // 2
                 text_y = self.player.rect.y + self.camera_offset_y - 20
                 level_surface.blit(protection_text, (text_x, text_y))
             else:
                 # Draw normal player
                 level_surface.blit(self.player.image, 
-                                 (self.player.rect.x + self.camera_offset_x, 
-                                  self.player.rect.y + self.camera_offset_y))
+                                 (self.player.rect.x + self.camera_offset_x + shake_x, 
+                                  self.player.rect.y + self.camera_offset_y + shake_y))
             
             # Draw level surface to screen
             self.screen.blit(level_surface, (0, 0))
@@ -784,9 +1050,11 @@ class Game:
             self.current_level.draw_interactive_prompts(
                 self.screen, self.camera_offset_x, self.camera_offset_y
             )
+            self.profiler.mark("level_draw")
             
             # Draw token collection particles
             self.token_particles.draw(self.screen)
+            self.profiler.mark("particles")
             
             # Draw death and completion effects from level
             self.current_level.draw(self.screen)
@@ -794,6 +1062,7 @@ class Game:
             # Debug drawing
             if self.debug:
                 self.space.debug_draw(self.draw_options)
+            self.profiler.mark("level_draw")
                 
             # Draw HUD
             self.draw_hud()
@@ -801,6 +1070,15 @@ class Game:
             # Draw transition effects
             self.transition_effect.draw(self.screen)
             
+            self.restore_interpolation(interpolation_state)
+            self.profiler.mark("hud")
+            
+        elif self.game_state == STATE_TRANSITION:
+            # The frame shown when the transition began, fading out while the level loads
+            self.screen.blit(self.transition_frame, (0, 0))
+            self.transition_effect.draw(self.screen)
+            self.profiler.mark("hud")
+            
         # Draw menus if in menu state
         if self.game_state == STATE_MENU or self.game_state == STATE_PAUSED:
             # If in pause state, draw the game underneath first
@@ -810,124 +1088,142 @@ class Game:
                 
             # Draw active menu
             self.current_menu.draw(self.screen)
+            self.profiler.mark("hud")
             
         # Apply post-processing effects
         if self.post_processing_enabled:
             self.apply_post_processing()
+        self.profiler.mark("post")
+        
+        # Frame profiler overlay (on top of everything, including the vignette)
+        self.profiler.draw(self.screen)
+        self.profiler.mark("overlay")
             
         # Flip display
         pg.display.flip()
+        self.profiler.mark("flip")
         
     def _generate_vignette(self):
-        """Pre-generate vignette effect for performance optimization"""
-        self.vignette_surface = pg.Surface((WIDTH, HEIGHT), pg.SRCALPHA)
+        """Pre-generate vignette effect for performance optimization (baked into the asset cache)"""
+        self.vignette_surface = asset_cache.cached_surface(
+            "vignette", (WIDTH, HEIGHT, VIGNETTE_STRENGTH), self._build_vignette)
+        
+    def _build_vignette(self):
+        """Draw the vignette: transparent in the center, darkening toward the edges"""
+        vignette = pg.Surface((WIDTH, HEIGHT), pg.SRCALPHA)
+        vignette.fill((0, 0, 0, 0))
         
-        # Radial gradient from transparent center to dark edges
+        # Radial gradient from transparent center to dark edges, in 2px cells
         center_x, center_y = WIDTH // 2, HEIGHT // 2
         max_dist = math.sqrt(center_x**2 + center_y**2)
-        
-        for x in range(0, WIDTH, 2):  # Higher quality with 2px step
-            for y in range(0, HEIGHT, 2):
-                # Calculate distance from center
-                dx, dy = x - center_x, y - center_y
-                dist = math.sqrt(dx**2 + dy**2)
-                
-                # Calculate alpha based on distance (more transparent near center)
-                alpha = int(min(60, 60 * (dist / max_dist)**2))
-                
-                # Draw a small rect with calculated alpha
-                if alpha > 0:
-                    rect = pg.Rect(x, y, 2, 2)
-                    pg.draw.rect(self.vignette_surface, (0, 0, 0, alpha), rect)
+        xs = np.arange(0, WIDTH, 2) - center_x
+        ys = np.arange(0, HEIGHT, 2) - center_y
+        dist_sq = xs[:, None]**2 + ys[None, :]**2
+        
+        # Alpha grows with squared distance (more transparent near center)
+        cells = np.minimum(VIGNETTE_STRENGTH, VIGNETTE_STRENGTH * dist_sq / max_dist**2).astype(np.uint8)
+        alpha = pg.surfarray.pixels_alpha(vignette)
+        alpha[:] = cells.repeat(2, axis=0).repeat(2, axis=1)[:WIDTH, :HEIGHT]
+        del alpha  # Release the surface lock
+        return vignette
     
     def apply_post_processing(self):
         """Apply post-processing effects to the final screen"""
         # This method can be expanded for more complex effects
         
-        if self.game_state == STATE_PLAYING and self.vignette_surface:
+        if self.game_state == STATE_PLAYING and self.vignette_surface and self.quality.vignette:
             # Apply pre-calculated vignette to the screen
             self.screen.blit(self.vignette_surface, (0, 0))
         
     def draw_hud(self):
         """Draw game HUD (tokens collected, etc.)"""
-        # Create translucent background for HUD
-        hud_height = 40
-        hud_bg = pg.Surface((WIDTH, hud_height), pg.SRCALPHA)
-        hud_bg.fill((0, 0, 0, 150))
-        self.screen.blit(hud_bg, (0, 0))
-        
-        # Create bottom HUD
-        bottom_hud = pg.Surface((WIDTH, hud_height), pg.SRCALPHA)
-        bottom_hud.fill((0, 0, 0, 150))
-        self.screen.blit(bottom_hud, (0, HEIGHT - hud_height))
-        
-        # Tokens collected text with icon
-        token_text = f"X Tokens: {self.player.tokens_collected} / {TOKENS_TO_TRANSFORM}"
-        token_surface = self.font.render(token_text, True, TEAL)
-        self.screen.blit(token_surface, (20, 10))
-        
-        # Interaction hint (only show if near an interactive object)
-        show_hint = False
-        for obj in self.current_level.interactive_objects:
-            if obj.is_near_player and not obj.activated:
-                show_hint = True
-                break
-                
-        if show_hint:
-            hint_text = "Press E to interact"
-            hint_surface = self.font.render(hint_text, True, BRIGHT_TEAL)
-            hint_x = WIDTH - hint_surface.get_width() - 20
-            hint_y = 50
-            self.screen.blit(hint_surface, (hint_x, hint_y))
-        
-        # Player state text
-        state_text = "Wizard Form" if self.player.is_wizard else "Prisoner Form"
-        state_color = TEAL if self.player.is_wizard else BLUE_PRISONER
-        state_surface = self.font.render(state_text, True, state_color)
-        self.screen.blit(state_surface, (WIDTH - state_surface.get_width() - 20, 10))
-        
-        # Level info
-        level_text = f"Level {self.level_num}: " + (
-            "Teal X Obstacle Course" if self.level_num == 1 else "Financial District"
-        )
-        level_surface = self.font.render(level_text, True, LIGHT_TEAL)
-        self.screen.blit(level_surface, (20, HEIGHT - level_surface.get_height() - 5))
-        
-        # Controls hint
-        controls_text = "ESC: Pause  |  SPACE: Jump  |  E: Interact  |  R: Restart"
-        controls_surface = self.font.render(controls_text, True, LIGHT_TEAL)
-        controls_x = WIDTH - controls_surface.get_width() - 20
-        self.screen.blit(controls_surface, (controls_x, HEIGHT - controls_surface.get_height() - 5))
+        # Widgets only re-render when their values change; the cached layer is blitted as is
+        self.hud.draw(self.screen)
         
     def run(self):
         """Main game loop"""
         self.running = True
         self.frame_count = 0
         
-        # Activate start menu
-        self.current_menu = self.start_menu
-        self.current_menu.activate()
-        self.game_state = STATE_MENU
+        if self.input.replaying:
+            # Replays start straight on the level they were recorded on
+            self.level_num = self.input.replayer.level_num
+            self.new_game()
+        else:
+            # Activate start menu
+            self.current_menu = self.start_menu
+            self.current_menu.activate()
+            self.game_state = STATE_MENU
         
         # Main game loop
         while self.running:
-            # Calculate delta time
-            dt = self.clock.tick(FPS) / 1000.0
-            self.dt = dt  # Store for use in other methods
+            # Calculate real frame time; gameplay advances in fixed steps inside update()
+            # Menus and transitions have nothing to interpolate, so they run at a lower cap and leave the CPU idle
+            dt = self.clock.tick(RENDER_FPS if self.game_state == STATE_PLAYING else MENU_FPS) / 1000.0
+            self.frame_dt = dt
             self.frame_count += 1
+            self.profiler.begin_frame()
+            
+            # Let the quality governor judge the previous frame's work time (sleep excluded)
+            if self.game_state == STATE_PLAYING:
+                self.quality.record_frame(self.clock.get_rawtime())
             
             # Handle events
             self.handle_events()
+            self.profiler.mark("events")
             
             # Update game state
             self.update(dt)
             
             # Draw the frame
             self.draw()
+            self.profiler.end_frame()
+            
+        self.input.close()
+            
+    def run_headless(self, max_steps=None):
+        """Step the simulation as fast as possible without rendering"""
+        self.running = True
+        self.frame_count = 0
+        replaying = self.input.replaying
+        if replaying:
+            self.level_num = self.input.replayer.level_num
+        self.new_game()
+        
+        start = time.perf_counter()
+        while self.running and (max_steps is None or self.sim_step < max_steps):
+            # A replay without a step limit runs until its input is used up
+            if replaying and max_steps is None and not self.input.replaying:
+                break
+            self.frame_count += 1
+            self.handle_events()
+            
+            # Every iteration advances exactly one fixed step
+            self.update(SIM_DT)
+            
+        elapsed = time.perf_counter() - start
+        print(f"Simulated {self.sim_step} steps ({self.sim_time:.1f}s of game time) in {elapsed:.2f}s "
+              f"({self.sim_step / max(elapsed, 1e-9):.0f} steps/s)")
+        self.input.close()
             
 def main():
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument("--headless", action="store_true", help="simulate without a window, audio or rendering")
+    parser.add_argument("--level", type=int, choices=[1, 2, 3], help="level to start on")
+    parser.add_argument("--frames", type=int, help="stop after this many simulation steps (headless only)")
+    parser.add_argument("--record", metavar="FILE", help="record gameplay input to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="replay gameplay input from FILE instead of the keyboard")
+    parser.add_argument("--seed", type=int, help="session random seed (defaults to a random one, or the replay's)")
+    args = parser.parse_args()
+    
+    game = Game(headless=args.headless, record_path=args.record, replay_path=args.replay, seed=args.seed)
+    print(f"Random seed: {game.seed}")
+    if args.level:
+        game.level_num = args.level
+    if args.headless:
+        game.run_headless(args.frames)
+    else:
+        game.run()
     pg.quit()
     sys.exit()
 
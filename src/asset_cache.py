@@ -0,0 +1,375 @@
+import os
+import json
+import atexit
+import shutil
+import mmap
+import struct
+import hashlib
+import threading
+import pygame as pg
+from src.settings import *
+
+# On-disk cache for baked procedural art and decoded images, so that launches
+# after the first can skip generating them. Each entry holds one or more
+# surfaces and is named by a hash of everything that went into generating it:
+# the generator's parameters, the settings values it reads and the seed it
+# drew from. Entries live in one pack file per ASSET_CACHE_VERSION, which is
+# bumped whenever a generator's code changes (packs of other versions are
+# deleted). Each pack keeps a small .usage file of the launch that last used
+# each entry, so entries nothing asks for any more can be dropped.
+#
+# Pack layout:
+#   header        magic, format version, offset of the newest index block
+#   entries       page-aligned; each surface is raw 32-bit BGRA pixels (the
+#                 byte order of the usual display format), 64-byte aligned
+#   index blocks  appended after each new entry: offset of the previous block,
+#                 then JSON {entry name: [[offset, width, height, alpha], ...]}
+#
+# The pack is memory-mapped copy-on-write and surfaces are created directly on
+# its pages, so only the pages of entries that are actually used are ever read,
+# and drawing on a loaded surface never touches the file.
+
+PACK_MAGIC = b"SSPK"
+PACK_FORMAT = 1
+PACK_HEADER = struct.Struct("<4sIQ")   # magic, format version, newest index block
+INDEX_HEADER = struct.Struct("<QI")    # previous index block, JSON length
+PIXEL_FORMAT = "BGRA"
+PIXEL_ALIGN = 64
+
+# Relative cache directories are resolved against the game's directory, so
+# launching from elsewhere still finds (and never scatters) the pack
+GAME_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def align(offset, alignment):
+    return (offset + alignment - 1) // alignment * alignment
+
+def entry_size(records):
+    """Pixel bytes of an entry's surfaces"""
+    return sum(width * height * 4 for _, width, height, _ in records)
+
+def write_entry(f, end, surfaces):
+    """Write (pixels, width, height, alpha) surfaces after end; returns their records and the new end"""
+    offset = align(end, mmap.PAGESIZE)
+    records = []
+    for pixels, width, height, alpha in surfaces:
+        offset = align(offset, PIXEL_ALIGN)
+        f.seek(offset)
+        f.write(pixels)
+        records.append((offset, width, height, alpha))
+        offset += len(pixels)
+    return records, offset
+
+def write_index(f, offset, previous, index):
+    """Write an index block at offset, then point the header at it once everything it points to is written"""
+    data = json.dumps(index).encode()
+    f.seek(offset)
+    f.write(INDEX_HEADER.pack(previous, len(data)))
+    f.write(data)
+    f.flush()
+    f.seek(0)
+    f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_FORMAT, offset))
+
+class AssetPack:
+    """Append-only pack of baked surfaces, memory-mapped so surfaces are created straight from its pages
+
+    Entries that go unused for ASSET_CACHE_KEEP_LAUNCHES launches (their
+    generator's parameters or settings changed) are dead, like copies of an
+    entry superseded by a later one. When opening finds that dead entries take
+    up more than ASSET_CACHE_MAX_DEAD of the pack, it is rewritten without them.
+    """
+    packs = {}  # path -> AssetPack, opened on first use
+    opening = threading.Lock()
+
+    @classmethod
+    def get(cls, path):
+        with cls.opening:
+            pack = cls.packs.get(path)
+            if pack is None:
+                pack = cls.packs[path] = AssetPack(path)
+                atexit.register(pack.write_usage)
+            return pack
+
+    def __init__(self, path):
+        self.path = path
+        self.usage_path = os.path.splitext(path)[0] + ".usage"
+        self.index = {}       # entry name -> [(offset, width, height, alpha), ...]
+        self.head = 0         # Offset of the newest index block
+        self.inode = None     # Identity of the file the index was read from (compaction replaces it)
+        self.superseded = 0   # Pixel bytes of entries written again later
+        self.map = None       # Mapping of the pack, replaced when entries are added past its end
+        self.lock = threading.Lock()  # Levels can be prebuilt on a worker thread
+        self.launch = 1       # Number of this launch
+        self.last_used = {}   # entry name -> last launch that used it
+        self.read_index()
+        self.read_usage()
+        self.compact()
+
+    def read_index(self):
+        """Read the header and walk the index blocks, newest first"""
+        self.index = {}
+        self.superseded = 0
+        head = 0
+        try:
+            with open(self.path, "rb") as f:
+                self.inode = os.fstat(f.fileno()).st_ino
+                magic, version, head = PACK_HEADER.unpack(f.read(PACK_HEADER.size))
+                if magic != PACK_MAGIC or version != PACK_FORMAT:
+                    print(f"Ignoring asset pack {self.path}: unknown format")
+                    return
+                block = head
+                while block:
+                    f.seek(block)
+                    previous, size = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+                    for name, surfaces in json.loads(f.read(size)).items():
+                        if name in self.index:
+                            self.superseded += entry_size(surfaces)
+                        else:
+                            self.index[name] = [tuple(surface) for surface in surfaces]
+                    block = previous
+        except FileNotFoundError:
+            return
+        except (OSError, struct.error, ValueError) as e:
+            # A damaged pack is rebuilt from scratch
+            print(f"Error reading asset pack {self.path}: {e}")
+            self.index = {}
+            head = 0
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        self.head = head
+
+    def read_usage(self):
+        """Read which launch last used each entry, and number this launch after the last one"""
+        try:
+            with open(self.usage_path) as f:
+                usage = json.load(f)
+            self.launch = usage["launch"] + 1
+            self.last_used = usage["used"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error reading asset pack usage {self.usage_path}: {e}")
+
+    def use(self, name):
+        self.last_used[name] = self.launch
+
+    def write_usage(self):
+        """Record the entries this launch used (called at exit), merged with launches that ran alongside it"""
+        if not self.last_used:
+            return
+        launch, last_used = self.launch, dict(self.last_used)
+        try:
+            with open(self.usage_path) as f:
+                usage = json.load(f)
+            launch = max(launch, usage["launch"])
+            for name, used in usage["used"].items():
+                if name in self.index:
+                    last_used[name] = max(used, last_used.get(name, 0))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass
+        try:
+            os.makedirs(os.path.dirname(self.usage_path), exist_ok=True)
+            temp = self.usage_path + ".tmp"
+            with open(temp, "w") as f:
+                json.dump({"launch": launch, "used": last_used}, f)
+            os.replace(temp, self.usage_path)
+        except OSError as e:
+            print(f"Error writing asset pack usage {self.usage_path}: {e}")
+
+    def compact(self):
+        """Rewrite the pack without its dead entries once they make up too much of it"""
+        # Entries with no recorded use yet (say, their launch crashed) start aging now
+        for name in self.index:
+            self.last_used.setdefault(name, self.launch)
+        oldest = self.launch - ASSET_CACHE_KEEP_LAUNCHES
+        dead = [name for name in self.index if self.last_used[name] < oldest]
+        dead_bytes = self.superseded + sum(entry_size(self.index[name]) for name in dead)
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if dead_bytes <= size * ASSET_CACHE_MAX_DEAD:
+            return
+
+        temp = self.path + ".tmp"
+        index = {}
+        try:
+            with open(self.path, "rb") as pack, open(temp, "wb") as f:
+                f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_FORMAT, 0))
+                end = PACK_HEADER.size
+                for name, records in self.index.items():
+                    if name in dead:
+                        continue
+                    surfaces = []
+                    for offset, width, height, alpha in records:
+                        pack.seek(offset)
+                        surfaces.append((pack.read(width * height * 4), width, height, alpha))
+                    index[name], end = write_entry(f, end, surfaces)
+                write_index(f, end, 0, index)
+            os.replace(temp, self.path)
+        except OSError as e:
+            print(f"Error compacting asset pack {self.path}: {e}")
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+            return
+        print(f"Compacted asset pack {self.path}: {size >> 20} MB -> {os.path.getsize(self.path) >> 20} MB")
+        for name in dead:
+            self.last_used.pop(name, None)
+        self.read_index()
+
+    def check_replaced(self, f):
+        """Re-read the index if another launch compacted the pack since it was read"""
+        if os.fstat(f.fileno()).st_ino != self.inode:
+            self.map = None
+            self.read_index()
+
+    def remap(self):
+        """Map the whole pack as it is now (earlier maps stay alive while their surfaces do)"""
+        with open(self.path, "rb") as f:
+            self.check_replaced(f)
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    def load(self, name):
+        """Surfaces of an entry, sharing the pack's pages, or None if it is not in the pack"""
+        with self.lock:
+            records = self.index.get(name)
+            if records is None:
+                return None
+            end = max(offset + width * height * 4 for offset, width, height, _ in records)
+            if self.map is None or end > len(self.map):
+                self.remap()
+                records = self.index.get(name)
+                if records is None:
+                    return None
+                end = max(offset + width * height * 4 for offset, width, height, _ in records)
+            if end > len(self.map):
+                # Truncated pack; the entry is regenerated and appended again
+                return None
+            view = memoryview(self.map)
+            self.use(name)
+
+        surfaces = []
+        for offset, width, height, alpha in records:
+            surface = pg.image.frombuffer(view[offset:offset + width * height * 4], (width, height), PIXEL_FORMAT)
+            surfaces.append(prepare(surface, alpha))
+        return surfaces
+
+    def save(self, name, surfaces):
+        """Append an entry and an index block for it, then point the header at that block"""
+        pixels = [(pg.image.tobytes(surface, PIXEL_FORMAT), *surface.get_size(), bool(surface.get_flags() & pg.SRCALPHA))
+                  for surface in surfaces]
+        with self.lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "r+b" if os.path.exists(self.path) else "w+b") as f:
+                end = f.seek(0, os.SEEK_END)
+                if end < PACK_HEADER.size:
+                    f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_FORMAT, 0))
+                    end = PACK_HEADER.size
+                    self.inode = os.fstat(f.fileno()).st_ino
+                    self.index = {}
+                    self.head = 0
+                else:
+                    self.check_replaced(f)
+
+                records, offset = write_entry(f, end, pixels)
+                write_index(f, offset, self.head, {name: records})
+            self.head = offset
+            self.index[name] = records
+            self.use(name)
+
+def cache_dir():
+    """Directory holding the pack of the current cache version"""
+    return os.path.join(GAME_DIR, ASSET_CACHE_DIR, f"v{ASSET_CACHE_VERSION}")
+
+def remove_old_versions():
+    """Delete the packs of other cache versions, which can never be used again"""
+    root = os.path.join(GAME_DIR, ASSET_CACHE_DIR)
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith("v") and name != f"v{ASSET_CACHE_VERSION}":
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+def cache_key(kind, *params):
+    """Entry name for an asset kind generated from the given parameters"""
+    digest = hashlib.blake2b(repr(params).encode(), digest_size=12).hexdigest()
+    return f"{kind}-{digest}"
+
+def surface_digest(surface):
+    """Short hash of a surface's pixels, for keying entries generated from loaded images"""
+    return hashlib.blake2b(pg.image.tobytes(surface, "RGBA"), digest_size=12).hexdigest()
+
+def pack():
+    """The asset pack of the current cache directory and version"""
+    path = os.path.join(cache_dir(), "assets.pack")
+    if path not in AssetPack.packs:
+        remove_old_versions()
+    return AssetPack.get(path)
+
+def prepare(surface, alpha):
+    """Make a surface created on the pack's pages ready for blitting
+
+    Surfaces with per-pixel alpha already match the display's alpha format and
+    are used in place. Opaque ones are copied into an opaque surface, since
+    blitting them with per-pixel alpha would be slower.
+    """
+    display = pg.display.get_surface()
+    if alpha:
+        if display is None or display.get_masks()[:3] == surface.get_masks()[:3]:
+            return surface
+        return surface.convert_alpha()
+    if display is not None:
+        return surface.convert()
+    opaque = pg.Surface(surface.get_size())
+    opaque.blit(surface, (0, 0))
+    return opaque
+
+def load_surfaces(name):
+    """Load the surfaces of a cache entry, or None if it is missing"""
+    if not ASSET_CACHE_ENABLED:
+        return None
+    return pack().load(name)
+
+def save_surfaces(name, surfaces):
+    """Add surfaces to the pack (failures only disable caching for them)"""
+    if not ASSET_CACHE_ENABLED:
+        return
+    try:
+        pack().save(name, surfaces)
+    except OSError as e:
+        print(f"Error writing asset cache entry {name}: {e}")
+
+def cached_surfaces(kind, params, build, seeded=False):
+    """Surfaces from the cache entry for (kind, params), calling build() to make and store them if missing
+
+    Seeded art (drawn from the art streams) is only cached while ART_SEED fixes
+    those streams: following the session seed, every launch would append a new
+    copy of it to the pack, each dead as soon as the next launch reseeds.
+    """
+    if seeded and ART_SEED is None:
+        return list(build())
+    name = cache_key(kind, *params)
+    surfaces = load_surfaces(name)
+    if surfaces is None:
+        surfaces = list(build())
+        save_surfaces(name, surfaces)
+    return surfaces
+
+def cached_surface(kind, params, build, seeded=False):
+    """Single-surface version of cached_surfaces"""
+    return cached_surfaces(kind, params, lambda: [build()], seeded)[0]
+
+def load_image(path):
+    """An image file with per-pixel alpha, decoded once into the pack
+
+    Keyed by a hash of the file's bytes, so touching or copying the file reuses
+    the decoded entry; an edited image leaves its old entry to go dead.
+    """
+    with open(path, "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=12).hexdigest()
+    return cached_surface("image", (digest,), lambda: pg.image.load(path).convert_alpha())
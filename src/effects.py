@@ -1,7 +1,14 @@
 import pygame as pg
+import numpy as np
+import hashlib
 import math
-import random
 from src.settings import *
+from src.rng import RandomStreams
+from src import asset_cache
+from src.surface_format import SurfaceFormat
+
+art_random = RandomStreams.get("art")
+effects_random = RandomStreams.get("effects")
 
 # Ensure lightning color and related constants are available
 if 'LIGHTNING_COLOR' not in globals():
@@ -11,71 +18,119 @@ if 'LIGHTNING_COLOR' not in globals():
 
 class Shadow:
     """Creates a shadow effect for game objects"""
+    # Blurred shadow layers keyed by (mask digest, size, offset, blur, alpha)
+    _cache = {}
+    
     @staticmethod
-    def apply(surface, offset_x=SHADOW_OFFSET_X, offset_y=SHADOW_OFFSET_Y, blur=SHADOW_BLUR, alpha=128):
-        """Apply a shadow effect to a surface"""
-        # Create a shadow surface with same dimensions
-        shadow_surface = pg.Surface(surface.get_size(), pg.SRCALPHA)
-        
-        # Create mask from original surface alpha channel
-        mask = pg.mask.from_surface(surface)
-        mask_surface = mask.to_surface(setcolor=SHADOW_COLOR, unsetcolor=(0, 0, 0, 0))
-        
-        # Apply blur if requested
-        if blur > 0:
-            for _ in range(blur):
-                # Simple blur by scaling down and up
-                scale = 0.8
-                scaled_size = (int(mask_surface.get_width() * scale), 
-                              int(mask_surface.get_height() * scale))
-                mask_surface = pg.transform.smoothscale(mask_surface, scaled_size)
-                mask_surface = pg.transform.smoothscale(mask_surface, surface.get_size())
+    def box_blur(values, radius):
+        """Box blur a 2D float array along its first axis, keeping its size"""
+        width = values.shape[0]
+        padded = np.zeros((width + radius*2 + 1, values.shape[1]), dtype=np.float32)
+        padded[radius + 1:radius + 1 + width] = values
+        summed = np.cumsum(padded, axis=0)
+        return (summed[radius*2 + 1:] - summed[:width]) / (radius*2 + 1)
+    
+    @staticmethod
+    def blur_alpha(values, blur):
+        """Approximate a Gaussian blur with repeated separable box blurs"""
+        radius = max(1, blur // 2)
+        for _ in range(SHADOW_BLUR_PASSES):
+            values = Shadow.box_blur(values, radius)
+            values = Shadow.box_blur(values.T, radius).T
+        return values
+    
+    @staticmethod
+    def get_layer(surface, offset_x, offset_y, blur, alpha):
+        """Get the (memoized) blurred shadow layer for a surface's shape"""
+        # Shadows only depend on the surface's mask, not its colors
+        mask = pg.surfarray.array_alpha(surface) > 127
+        digest = hashlib.blake2b(np.packbits(mask).tobytes(), digest_size=16).digest()
+        key = (digest, mask.shape, offset_x, offset_y, blur, alpha)
         
-        # Add shadow to offset position
-        shadow_surface.blit(mask_surface, (offset_x, offset_y))
+        layer = Shadow._cache.get(key)
+        if layer is None:
+            width, height = mask.shape
+            shadow = mask.astype(np.float32)
+            if blur > 0:
+                shadow = Shadow.blur_alpha(shadow, blur)
+            
+            # Shift to the offset position, clipping to the surface bounds
+            shifted = np.zeros((width, height), dtype=np.float32)
+            src_x, dst_x = max(0, -offset_x), max(0, offset_x)
+            src_y, dst_y = max(0, -offset_y), max(0, offset_y)
+            copy_w, copy_h = width - abs(offset_x), height - abs(offset_y)
+            if copy_w > 0 and copy_h > 0:
+                shifted[dst_x:dst_x + copy_w, dst_y:dst_y + copy_h] = \
+                    shadow[src_x:src_x + copy_w, src_y:src_y + copy_h]
+            
+            layer = pg.Surface((width, height), pg.SRCALPHA)
+            layer.fill((*SHADOW_COLOR[:3], 0))
+            layer_alpha = pg.surfarray.pixels_alpha(layer)
+            layer_alpha[:] = np.clip(shifted * alpha, 0, 255).astype(np.uint8)
+            del layer_alpha  # Release the surface lock
+            Shadow._cache[key] = layer
         
+        return layer
+    
+    @staticmethod
+    def apply(surface, offset_x=SHADOW_OFFSET_X, offset_y=SHADOW_OFFSET_Y, blur=SHADOW_BLUR, alpha=SHADOW_COLOR[3]):
+        """Apply a shadow effect to a surface"""
         # Create final composite surface
-        result_surface = pg.Surface(surface.get_size(), pg.SRCALPHA)
-        result_surface.blit(shadow_surface, (0, 0))  # Shadow first
+        result_surface = Shadow.get_layer(surface, offset_x, offset_y, blur, alpha).copy()  # Shadow first
         result_surface.blit(surface, (0, 0))  # Original on top
         
         return result_surface
 
 class Glow:
     """Creates a glow effect around objects"""
+    _falloff_offsets = None  # Cached (dx, dy, weight) kernel for the distance falloff
+    
+    @staticmethod
+    def falloff_offsets():
+        """Offsets within the glow radius and their falloff weight"""
+        if Glow._falloff_offsets is None:
+            radius = int(GLOW_FALLOFF_RADIUS)
+            offsets = []
+            for dx in range(-radius, radius + 1):
+                for dy in range(-radius, radius + 1):
+                    weight = GLOW_FALLOFF_PEAK * (1 - math.sqrt(dx*dx + dy*dy) / GLOW_FALLOFF_RADIUS)
+                    if weight > 0:
+                        offsets.append((dx, dy, weight))
+            Glow._falloff_offsets = offsets
+        return Glow._falloff_offsets
+    
     @staticmethod
     def apply(surface, color=TEAL, intensity=GLOW_INTENSITY, expand=2):
         """Apply a glow effect to a surface"""
-        # Create glow surface
-        glow_surface = pg.Surface(
-            (surface.get_width() + expand*2, surface.get_height() + expand*2), 
-            pg.SRCALPHA
-        )
+        width, height = surface.get_width() + expand*2, surface.get_height() + expand*2
         
-        # Create mask from the original surface
-        mask = pg.mask.from_surface(surface)
-        outline = mask.outline()
+        # Create glow surface in the glow color, fully transparent until alpha is written
+        glow_surface = pg.Surface((width, height), pg.SRCALPHA)
+        glow_surface.fill((*color, 0))
         
-        # Draw expanded outline
-        for i in range(1, 4):
-            for point in outline:
-                # Draw multiple points around each outline point for a soft glow
-                for dx in range(-i, i+1):
-                    for dy in range(-i, i+1):
-                        alpha = int(255 * intensity * (1 - (math.sqrt(dx*dx + dy*dy) / 4)))
-                        if alpha > 0:
-                            pg.draw.circle(
-                                glow_surface, 
-                                (*color, alpha), 
-                                (point[0] + expand + dx, point[1] + expand + dy), 
-                                1
-                            )
+        # Create mask outline from the original surface
+        outline = pg.mask.from_surface(surface).outline()
+        
+        if outline:
+            # Mark outline pixels on a padded grid so shifted views stay in bounds
+            radius = int(GLOW_FALLOFF_RADIUS)
+            seeds = np.zeros((width + radius*2, height + radius*2), dtype=np.float32)
+            points = np.array(outline)
+            seeds[points[:, 0] + expand + radius, points[:, 1] + expand + radius] = 1.0
+            
+            # Falloff by distance to the nearest outline pixel (max over the kernel)
+            falloff = np.zeros((width, height), dtype=np.float32)
+            for dx, dy, weight in Glow.falloff_offsets():
+                shifted = seeds[radius - dx:radius - dx + width, radius - dy:radius - dy + height]
+                np.maximum(falloff, shifted * weight, out=falloff)
+            
+            # Write the whole alpha channel in one pass
+            alpha = pg.surfarray.pixels_alpha(glow_surface)
+            alpha[:] = np.minimum(falloff * (255 * intensity), 255).astype(np.uint8)
+            del alpha  # Release the surface lock
         
         # Create result surface
-        result_surface = pg.Surface(
-            (surface.get_width() + expand*2, surface.get_height() + expand*2), 
-            pg.SRCALPHA
-        )
+        result_surface = pg.Surface((width, height), pg.SRCALPHA)
         # Draw glow first
         result_surface.blit(glow_surface, (0, 0))
         # Draw original centered on top
@@ -103,7 +158,7 @@ class Animation:
         # Set default animation parameters based on object type
         if object_type == "platform":
             self.sin_amplitude = PLATFORM_OSCILLATION_AMOUNT
-            self.sin_speed = random.uniform(0.8, 1.2)
+            self.sin_speed = effects_random.uniform(0.8, 1.2)
         elif object_type == "token":
             self.sin_amplitude = TOKEN_BOB_AMOUNT
             self.sin_speed = TOKEN_BOB_SPEED
@@ -148,8 +203,9 @@ class Animation:
 class BuildingDecorations:
     """Generates decorative elements for buildings"""
     @staticmethod
-    def apply(surface, color, is_building=True):
-        """Apply decorative elements to a building surface"""
+    def apply(surface, color, is_building=True, rng=None):
+        """Apply decorative elements to a building surface, drawing from rng (the art stream by default)"""
+        rng = rng or art_random
         # Create a copy of the original surface
         result = surface.copy()
         width, height = surface.get_size()
@@ -165,7 +221,7 @@ class BuildingDecorations:
             for floor in range(num_floors):
                 for window in range(num_windows_per_floor):
                     # Only add window with probability based on density
-                    if random.random() < BUILDING_DETAILS_DENSITY:
+                    if rng.random() < BUILDING_DETAILS_DENSITY:
                         window_x = 10 + window * ((width - 20) // num_windows_per_floor)
                         window_y = 10 + floor * ((height - 20) // num_floors)
                         
@@ -173,21 +229,21 @@ class BuildingDecorations:
                         pg.draw.rect(result, WINDOW_COLOR, window_rect, border_radius=2)
                         
             # Add rooftop details
-            if random.random() < 0.7:
+            if rng.random() < 0.7:
                 # Antenna or small structure on top
-                antenna_width = random.randint(5, 15)
-                antenna_height = random.randint(10, 30)
-                antenna_x = random.randint(width // 4, 3 * width // 4)
+                antenna_width = rng.randint(5, 15)
+                antenna_height = rng.randint(10, 30)
+                antenna_x = rng.randint(width // 4, 3 * width // 4)
                 
                 pg.draw.rect(result, 
                            darken_color(color), 
                            (antenna_x, 0, antenna_width, antenna_height))
                 
             # Add X mark branding (SUPERSEED theme)
-            if random.random() < 0.5:
-                x_size = random.randint(20, 40)
-                x_x = random.randint(width // 4, 3 * width // 4)
-                x_y = random.randint(height // 4, 3 * height // 4)
+            if rng.random() < 0.5:
+                x_size = rng.randint(20, 40)
+                x_x = rng.randint(width // 4, 3 * width // 4)
+                x_y = rng.randint(height // 4, 3 * height // 4)
                 
                 pg.draw.line(result, TEAL, 
                            (x_x - x_size//2, x_y - x_size//2),
@@ -200,21 +256,34 @@ class BuildingDecorations:
         
 class ParallaxBackground:
     """Creates a multi-layered parallax scrolling background"""
+    max_layers = 3  # Nearest layers drawn at the current quality tier (set by QualityGovernor)
+    # Parallax factor of each generated layer, in drawing order
+    layer_factors = {
+        "financial": (0.1, 0.3, 0.6),     # Clouds, far buildings, mid buildings
+        "market_crash": (0.8, 0.5, 0.3),  # Falling charts, mid buildings, far buildings
+    }
+    
     def __init__(self, width, height, level_type="financial"):
         self.width = width
         self.height = height
         self.level_type = level_type
         self.layers = []
         
+        # Own stream per level type, so the layers only depend on the session seed
+        self.rng = RandomStreams.fresh("parallax", level_type)
+        
         # Generate the background layers
         self._generate_layers()
         
     def _generate_layers(self):
-        """Generate the parallax background layers based on level type"""
-        if self.level_type == "market_crash":
-            self._generate_market_crash_layers()
-        else:
-            self._generate_financial_layers()
+        """Generate the parallax background layers based on level type (baked into the asset cache)"""
+        theme = "market_crash" if self.level_type == "market_crash" else "financial"
+        generate = self._generate_market_crash_layers if theme == "market_crash" else self._generate_financial_layers
+        params = (theme, self.width, self.height, RandomStreams.derive_seed("parallax", self.level_type),
+                  BUILDING_COLORS, BUILDING_DETAILS_DENSITY, WINDOW_COLOR, TEAL)
+        surfaces = asset_cache.cached_surfaces("parallax", params, generate, seeded=True)
+        self.layers = [{"surface": SurfaceFormat.finalize(surface, rle=True), "factor": factor}
+                       for surface, factor in zip(surfaces, self.layer_factors[theme])]
             
     def _generate_financial_layers(self):
         """Generate standard financial district background layers"""
@@ -225,9 +294,9 @@ class ParallaxBackground:
         # Draw distant city silhouette
         horizon_y = self.height * 0.6
         for i in range(0, self.width, 60):
-            building_width = random.randint(40, 80)
-            building_height = random.randint(80, 200)
-            building_color = darken_color(random.choice(BUILDING_COLORS), 0.5)
+            building_width = self.rng.randint(40, 80)
+            building_height = self.rng.randint(80, 200)
+            building_color = darken_color(self.rng.choice(BUILDING_COLORS), 0.5)
             
             pg.draw.rect(far_layer, building_color, 
                        (i, horizon_y - building_height, building_width, building_height))
@@ -238,15 +307,15 @@ class ParallaxBackground:
         
         horizon_y = self.height * 0.65
         for i in range(-20, self.width, 100):
-            building_width = random.randint(70, 120)
-            building_height = random.randint(120, 280)
-            building_color = darken_color(random.choice(BUILDING_COLORS), 0.3)
+            building_width = self.rng.randint(70, 120)
+            building_height = self.rng.randint(120, 280)
+            building_color = darken_color(self.rng.choice(BUILDING_COLORS), 0.3)
             
             building_surface = pg.Surface((building_width, building_height), pg.SRCALPHA)
             building_surface.fill(building_color)
             
             # Add some windows to mid-layer buildings
-            decorated_building = BuildingDecorations.apply(building_surface, building_color)
+            decorated_building = BuildingDecorations.apply(building_surface, building_color, rng=self.rng)
             mid_layer.blit(decorated_building, (i, horizon_y - building_height))
             
         # Layer 3: Clouds/sky elements
@@ -255,16 +324,16 @@ class ParallaxBackground:
         
         # Add some subtle clouds
         for _ in range(10):
-            cloud_x = random.randint(0, self.width)
-            cloud_y = random.randint(50, int(self.height * 0.4))
-            cloud_radius = random.randint(30, 70)
+            cloud_x = self.rng.randint(0, self.width)
+            cloud_y = self.rng.randint(50, int(self.height * 0.4))
+            cloud_radius = self.rng.randint(30, 70)
             
             # Draw cloud as a cluster of circles
             cloud_color = (200, 220, 230, 50)  # Very transparent white
             for i in range(5):
-                offset_x = random.randint(-20, 20)
-                offset_y = random.randint(-10, 10)
-                size_mod = random.uniform(0.7, 1.3)
+                offset_x = self.rng.randint(-20, 20)
+                offset_y = self.rng.randint(-10, 10)
+                size_mod = self.rng.uniform(0.7, 1.3)
                 
                 pg.draw.circle(
                     cloud_layer, 
@@ -273,12 +342,8 @@ class ParallaxBackground:
                     cloud_radius * size_mod
                 )
                 
-        # Store all layers with their parallax factors
-        self.layers = [
-            {"surface": cloud_layer, "factor": 0.1},
-            {"surface": far_layer, "factor": 0.3},
-            {"surface": mid_layer, "factor": 0.6}
-        ]
+        # Layers in drawing order (see layer_factors)
+        return [cloud_layer, far_layer, mid_layer]
         
     def _generate_market_crash_layers(self):
         """Generate market crash themed background layers"""
@@ -289,14 +354,14 @@ class ParallaxBackground:
         # Draw distant city silhouette with damaged buildings
         horizon_y = self.height * 0.6
         for i in range(0, self.width, 60):
-            building_width = random.randint(40, 80)
-            building_height = random.randint(80, 200)
+            building_width = self.rng.randint(40, 80)
+            building_height = self.rng.randint(80, 200)
             
             # Darker, more dramatic color palette for market crash
             building_color = darken_color((
-                random.randint(50, 70),  # Dark red tones
-                random.randint(20, 40),
-                random.randint(40, 60)
+                self.rng.randint(50, 70),  # Dark red tones
+                self.rng.randint(20, 40),
+                self.rng.randint(40, 60)
             ), 0.7)
             
             # Draw the building
@@ -304,18 +369,18 @@ class ParallaxBackground:
                        (i, horizon_y - building_height, building_width, building_height))
             
             # Add cracks/damage to some buildings
-            if random.random() < 0.4:
+            if self.rng.random() < 0.4:
                 # Draw crack lines
-                crack_start_x = i + random.randint(0, building_width)
-                crack_start_y = horizon_y - building_height + random.randint(0, building_height // 3)
+                crack_start_x = i + self.rng.randint(0, building_width)
+                crack_start_y = horizon_y - building_height + self.rng.randint(0, building_height // 3)
                 
                 # Create jagged crack line
                 crack_points = [(crack_start_x, crack_start_y)]
                 current_x, current_y = crack_start_x, crack_start_y
                 
-                for _ in range(random.randint(3, 6)):
-                    current_x += random.randint(-10, 10)
-                    current_y += random.randint(10, 20)
+                for _ in range(self.rng.randint(3, 6)):
+                    current_x += self.rng.randint(-10, 10)
+                    current_y += self.rng.randint(10, 20)
                     if current_y > horizon_y:
                         break
                     crack_points.append((current_x, current_y))
@@ -329,14 +394,14 @@ class ParallaxBackground:
         
         horizon_y = self.height * 0.65
         for i in range(-20, self.width, 120):
-            building_width = random.randint(70, 120)
-            building_height = random.randint(120, 280)
+            building_width = self.rng.randint(70, 120)
+            building_height = self.rng.randint(120, 280)
             
             # Darker color palette
             building_color = (
-                random.randint(60, 90),  # Dark red-purple tones
-                random.randint(30, 50),
-                random.randint(50, 70)
+                self.rng.randint(60, 90),  # Dark red-purple tones
+                self.rng.randint(30, 50),
+                self.rng.randint(50, 70)
             )
             
             # Create building surface
@@ -344,11 +409,11 @@ class ParallaxBackground:
             building_surface.fill(building_color)
             
             # Add some windows to mid-layer buildings
-            decorated_building = BuildingDecorations.apply(building_surface, building_color)
+            decorated_building = BuildingDecorations.apply(building_surface, building_color, rng=self.rng)
             
             # Randomly tilt some buildings for "crash" effect
-            if random.random() < 0.3:
-                tilt_angle = random.uniform(-10, 10)
+            if self.rng.random() < 0.3:
+                tilt_angle = self.rng.uniform(-10, 10)
                 decorated_building = pg.transform.rotate(decorated_building, tilt_angle)
             
             # Position the building
@@ -356,11 +421,11 @@ class ParallaxBackground:
             blit_y = horizon_y - building_height
             
             # Add a broken/damaged effect to some buildings
-            if random.random() < 0.4:
+            if self.rng.random() < 0.4:
                 # Create a "broken top" effect 
-                broken_height = random.randint(20, 50)
-                broken_width = random.randint(20, building_width - 20)
-                broken_x = random.randint(0, building_width - broken_width)
+                broken_height = self.rng.randint(20, 50)
+                broken_width = self.rng.randint(20, building_width - 20)
+                broken_x = self.rng.randint(0, building_width - broken_width)
                 
                 # Remove part of the top by drawing a black rectangle
                 pg.draw.rect(decorated_building, (0, 0, 0, 0), 
@@ -376,20 +441,20 @@ class ParallaxBackground:
         # Add falling chart lines
         for _ in range(15):
             # Draw downward trending stock lines
-            start_x = random.randint(0, self.width)
-            start_y = random.randint(0, self.height // 2)
+            start_x = self.rng.randint(0, self.width)
+            start_y = self.rng.randint(0, self.height // 2)
             
             # Create downward points with occasional small upward movements
             chart_points = [(start_x, start_y)]
             x, y = start_x, start_y
             
-            for _ in range(random.randint(5, 10)):
-                x += random.randint(20, 50)
+            for _ in range(self.rng.randint(5, 10)):
+                x += self.rng.randint(20, 50)
                 # Mostly downward with occasional small recovery
-                if random.random() < 0.7:
-                    y += random.randint(20, 40)  # Down
+                if self.rng.random() < 0.7:
+                    y += self.rng.randint(20, 40)  # Down
                 else:
-                    y -= random.randint(5, 15)  # Small recovery
+                    y -= self.rng.randint(5, 15)  # Small recovery
                 
                 chart_points.append((x, y))
                 
@@ -415,36 +480,33 @@ class ParallaxBackground:
         
         # Add floating debris particles
         for _ in range(30):
-            debris_x = random.randint(0, self.width)
-            debris_y = random.randint(0, self.height)
-            debris_size = random.randint(2, 6)
+            debris_x = self.rng.randint(0, self.width)
+            debris_y = self.rng.randint(0, self.height)
+            debris_size = self.rng.randint(2, 6)
             
             # Random debris color - dark tones
             debris_color = (
-                random.randint(50, 100),
-                random.randint(20, 60),
-                random.randint(20, 60),
-                random.randint(50, 150)  # Semi-transparent
+                self.rng.randint(50, 100),
+                self.rng.randint(20, 60),
+                self.rng.randint(20, 60),
+                self.rng.randint(50, 150)  # Semi-transparent
             )
             
             # Draw debris as small rectangles or circles
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 pg.draw.rect(foreground_layer, debris_color, 
                            (debris_x, debris_y, debris_size, debris_size))
             else:
                 pg.draw.circle(foreground_layer, debris_color, 
                              (debris_x, debris_y), debris_size)
         
-        # Store all layers with their parallax factors
-        self.layers = [
-            {"surface": foreground_layer, "factor": 0.8},  # Fast moving foreground
-            {"surface": mid_layer, "factor": 0.5},         # Mid-ground
-            {"surface": far_layer, "factor": 0.3}          # Background
-        ]
+        # Layers in drawing order (see layer_factors)
+        return [foreground_layer, mid_layer, far_layer]
         
     def draw(self, surface, camera_x):
         """Draw all parallax layers"""
-        for layer in self.layers:
+        # Lower quality tiers drop the farthest layers first
+        for layer in self.layers[-self.max_layers:]:
             # Calculate offset based on camera position and parallax factor
             offset_x = int(camera_x * layer["factor"]) % self.width
             
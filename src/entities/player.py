@@ -3,6 +3,8 @@ import pymunk
 from pymunk import Vec2d
 import math
 from src.settings import *
+from src.input_manager import InputFrame
+from src import asset_cache
 
 class Player(pg.sprite.Sprite):
     """The main character - transforms from prisoner to wizard frog"""
@@ -29,6 +31,7 @@ class Player(pg.sprite.Sprite):
         self.image = self.prisoner_standing
         self.rect = self.image.get_rect()
         self.rect.topleft = (x, y)
+        self.shake_offset = (0, 0)  # Drawn-only displacement from rect (death shake), never simulated
         
         # Physics body setup
         self.body = pymunk.Body(5, pymunk.moment_for_box(5, (self.width, self.height)))
@@ -76,25 +79,31 @@ class Player(pg.sprite.Sprite):
         
     def load_images(self):
         """Load character images and create basic colored rectangles as placeholders"""
+        # Standing, walk cycle and jump poses per form, baked into the asset cache
+        poses = [(0, False), (-2, False), (2, False), (0, True)]
+        variants = [(color, is_wizard, offset, jump)
+                    for color, is_wizard in ((BLUE_PRISONER, False), (TEAL, True))
+                    for offset, jump in poses]
+        palette = (TEAL, WHITE, BLACK, BROWN)
+        if getattr(self.game, 'headless', False):
+            # Only the rect matters without a display: every pose is one blank sprite-sized surface
+            sprites = [pg.Surface((self.width, self.height), pg.SRCALPHA)] * len(variants)
+        else:
+            sprites = asset_cache.cached_surfaces(
+                "frog", (self.width, self.height, variants, palette),
+                lambda: [self.create_frog_sprite(*variant) for variant in variants])
+        
         # Prisoner sprite (blue outfit, teal face)
-        self.prisoner_standing = self.create_frog_sprite(BLUE_PRISONER, False)
-        self.prisoner_walking = [
-            self.create_frog_sprite(BLUE_PRISONER, False, offset=-2), 
-            self.create_frog_sprite(BLUE_PRISONER, False),
-            self.create_frog_sprite(BLUE_PRISONER, False, offset=2),
-            self.create_frog_sprite(BLUE_PRISONER, False)
-        ]
-        self.prisoner_jump = self.create_frog_sprite(BLUE_PRISONER, False, jump=True)
+        standing, left, right, jump = sprites[:4]
+        self.prisoner_standing = standing
+        self.prisoner_walking = [left, standing, right, standing]
+        self.prisoner_jump = jump
         
         # Wizard sprite (teal outfit with X patterns, wizard hat)
-        self.wizard_standing = self.create_frog_sprite(TEAL, True)  
-        self.wizard_walking = [
-            self.create_frog_sprite(TEAL, True, offset=-2),
-            self.create_frog_sprite(TEAL, True),
-            self.create_frog_sprite(TEAL, True, offset=2),
-            self.create_frog_sprite(TEAL, True)
-        ]
-        self.wizard_jump = self.create_frog_sprite(TEAL, True, jump=True)
+        standing, left, right, jump = sprites[4:]
+        self.wizard_standing = standing
+        self.wizard_walking = [left, standing, right, standing]
+        self.wizard_jump = jump
         
     def create_frog_sprite(self, body_color, is_wizard, offset=0, jump=False):
         """Create a simple frog sprite with the given parameters"""
@@ -188,10 +197,10 @@ class Player(pg.sprite.Sprite):
         acc_x = 0
         
         # Apply horizontal movement based on input with improved responsiveness
-        keys = pg.key.get_pressed()
+        frame = self.game.input.frame
         moving = False
         
-        if keys[pg.K_LEFT] or keys[pg.K_a]:
+        if frame.held(InputFrame.LEFT):
             moving = True
             # Enhanced direction change responsiveness
             if self.body.velocity.x > 0:
@@ -204,7 +213,7 @@ class Player(pg.sprite.Sprite):
                 acc_x = -PLAYER_ACC * (1.0 + 0.5 * (1.0 - speed_factor))
             self.facing_right = False
             self.walking = True
-        elif keys[pg.K_RIGHT] or keys[pg.K_d]:
+        elif frame.held(InputFrame.RIGHT):
             moving = True
             # Enhanced direction change responsiveness
             if self.body.velocity.x < 0:
@@ -0,0 +1,94 @@
+import pygame as pg
+from src.settings import *
+from src.text import Text
+
+class HudWidget:
+    """A piece of HUD text bound to a game value, re-rendered only when that value changes"""
+    unset = object()
+
+    def __init__(self, value, render, place, background):
+        self.value = value            # () -> bound value
+        self.render = render          # value -> text surface, or None to show nothing
+        self.place = place            # text surface -> top-left position on the screen
+        self.background = background  # Color the layer is cleared to under this widget
+        self.last_value = self.unset
+        self.rect = None
+
+    def refresh(self, layer):
+        """Redraw the widget into the layer if its value changed; returns True if it did"""
+        value = self.value()
+        if value == self.last_value:
+            return False
+        self.last_value = value
+
+        # Clear what the old value drew, then draw the new one
+        if self.rect:
+            layer.fill(self.background, self.rect)
+            self.rect = None
+        text = self.render(value)
+        if text:
+            self.rect = layer.blit(text, self.place(text))
+        return True
+
+class Hud:
+    """Retained HUD: widgets are composited once into a cached layer that is blitted every frame"""
+    def __init__(self, game):
+        self.game = game
+        self.font = game.font
+        self.layer = pg.Surface((WIDTH, HEIGHT), pg.SRCALPHA)
+        self.layer.fill((0, 0, 0, 0))
+
+        # Translucent bars along the top and bottom edges
+        self.top_bar = pg.Rect(0, 0, WIDTH, HUD_BAR_HEIGHT)
+        self.bottom_bar = pg.Rect(0, HEIGHT - HUD_BAR_HEIGHT, WIDTH, HUD_BAR_HEIGHT)
+        self.layer.fill(HUD_BAR_COLOR, self.top_bar)
+        self.layer.fill(HUD_BAR_COLOR, self.bottom_bar)
+
+        # Only the bands holding widgets are blitted; the top band reaches down to the interaction hint
+        hint_y = HUD_BAR_HEIGHT + 10
+        self.top_band = pg.Rect(0, 0, WIDTH, hint_y + self.font.get_height())
+        self.bands = ((self.layer, self.top_band.topleft, self.top_band),
+                      (self.layer, self.bottom_bar.topleft, self.bottom_bar))
+
+        transparent = (0, 0, 0, 0)
+        self.widgets = [
+            # Tokens collected
+            HudWidget(lambda: self.game.player.tokens_collected,
+                      lambda tokens: Text.render(self.font, f"X Tokens: {tokens} / {TOKENS_TO_TRANSFORM}", TEAL),
+                      lambda text: (20, 10), HUD_BAR_COLOR),
+            # Player form
+            HudWidget(lambda: self.game.player.is_wizard,
+                      lambda wizard: Text.render(self.font, "Wizard Form" if wizard else "Prisoner Form",
+                                                 TEAL if wizard else BLUE_PRISONER),
+                      lambda text: (WIDTH - text.get_width() - 20, 10), HUD_BAR_COLOR),
+            # Interaction hint (only shown near an interactive object)
+            HudWidget(self.interaction_available,
+                      lambda shown: Text.render(self.font, "Press E to interact", BRIGHT_TEAL) if shown else None,
+                      lambda text: (WIDTH - text.get_width() - 20, hint_y), transparent),
+            # Level info
+            HudWidget(lambda: self.game.level_num,
+                      lambda level: Text.render(self.font, f"Level {level}: " + (
+                          "Teal X Obstacle Course" if level == 1 else "Financial District"), LIGHT_TEAL),
+                      lambda text: (20, HEIGHT - text.get_height() - 5), HUD_BAR_COLOR),
+            # Controls hint
+            HudWidget(lambda: None,
+                      lambda _: Text.render(self.font, "ESC: Pause  |  SPACE: Jump  |  E: Interact  |  R: Restart", LIGHT_TEAL),
+                      lambda text: (WIDTH - text.get_width() - 20, HEIGHT - text.get_height() - 5), HUD_BAR_COLOR),
+        ]
+
+    def interaction_available(self):
+        """Whether the player is next to an interactive object they can still use"""
+        game = self.game
+        for obj in game.current_level.object_index.query_radius(game.player.rect.center, INTERACTION_DISTANCE):
+            if obj.is_near_player and not obj.activated:
+                return True
+        return False
+
+    def update(self):
+        """Re-render the widgets whose bound values changed"""
+        for widget in self.widgets:
+            widget.refresh(self.layer)
+
+    def draw(self, surface):
+        self.update()
+        surface.blits(self.bands, doreturn=False)
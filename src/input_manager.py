@@ -0,0 +1,174 @@
+import struct
+import pygame as pg
+from src.settings import *
+
+# Gameplay input is sampled once per simulation tick into a bit mask, so a run
+# can be recorded to disk and replayed tick-for-tick in place of the keyboard.
+
+REPLAY_MAGIC = b"SSIR"
+REPLAY_VERSION = 2
+REPLAY_HEADER = struct.Struct("<4sBBIQ")  # magic, version, start level, tick count, session seed
+REPLAY_RECORD = struct.Struct("<HB")     # ticks since the previous record, input bits
+REPLAY_MAX_GAP = 0xFFFF
+
+class InputFrame:
+    """Gameplay input for one simulation tick, plus the tick before it for edge detection"""
+    LEFT = 1
+    RIGHT = 2
+    JUMP = 4
+    INTERACT = 8
+    RESTART = 16
+    NEXT_LEVEL = 32
+
+    __slots__ = ("bits", "prev_bits")
+
+    def __init__(self, bits=0, prev_bits=0):
+        self.bits = bits
+        self.prev_bits = prev_bits
+
+    def held(self, bit):
+        return bool(self.bits & bit)
+
+    def pressed(self, bit):
+        return bool(self.bits & bit and not self.prev_bits & bit)
+
+    def released(self, bit):
+        return bool(self.prev_bits & bit and not self.bits & bit)
+
+class InputRecorder:
+    """Writes input frames to a delta-encoded file: a record only when the bits change"""
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.level_num = 0
+        self.ticks = 0
+        self.last_tick = 0
+        self.last_bits = None
+
+        # Placeholder header, rewritten with the final tick count and seed on close
+        self.file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, 0, 0, 0))
+
+    def record(self, bits, level_num):
+        """Append the input of the next tick"""
+        if self.ticks == 0:
+            self.level_num = level_num
+
+        if bits != self.last_bits:
+            gap = self.ticks - self.last_tick
+            # Split gaps too long for one record into repeats of the current bits
+            while gap > REPLAY_MAX_GAP:
+                self.file.write(REPLAY_RECORD.pack(REPLAY_MAX_GAP, self.last_bits))
+                gap -= REPLAY_MAX_GAP
+            self.file.write(REPLAY_RECORD.pack(gap, bits))
+            self.last_tick = self.ticks
+            self.last_bits = bits
+
+        self.ticks += 1
+
+    def close(self, seed):
+        if self.file.closed:
+            return
+        self.file.seek(0)
+        self.file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.level_num, self.ticks, seed))
+        self.file.close()
+
+class InputReplayer:
+    """Reads a recorded input file back one tick at a time"""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, self.level_num, self.ticks, self.seed = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"{path} is not a version {REPLAY_VERSION} input recording")
+
+        # Expand the deltas into (tick, bits) changes
+        self.changes = []
+        tick = 0
+        for gap, bits in REPLAY_RECORD.iter_unpack(data[REPLAY_HEADER.size:]):
+            tick += gap
+            self.changes.append((tick, bits))
+
+        self.tick = 0
+        self.change_index = 0
+        self.bits = 0
+
+    @property
+    def finished(self):
+        return self.tick >= self.ticks
+
+    def next_bits(self):
+        """Input bits of the next tick (the last recorded bits once the recording ends)"""
+        while self.change_index < len(self.changes) and self.changes[self.change_index][0] <= self.tick:
+            self.bits = self.changes[self.change_index][1]
+            self.change_index += 1
+        self.tick += 1
+        return self.bits
+
+class InputManager:
+    """Samples live input (or a replay) into one InputFrame per simulation tick"""
+    # One-shot actions are latched from key releases, like the original KEYUP handlers
+    key_up_actions = {
+        pg.K_e: InputFrame.INTERACT,
+        pg.K_r: InputFrame.RESTART,
+        pg.K_n: InputFrame.NEXT_LEVEL,
+    }
+
+    def __init__(self, game, record_path=None, replay_path=None):
+        self.game = game
+        self.frame = InputFrame()
+        self.latched = 0  # Bits seen in events since the last tick
+        self.recorder = InputRecorder(record_path) if record_path else None
+        self.replayer = InputReplayer(replay_path) if replay_path else None
+
+    @property
+    def replaying(self):
+        return self.replayer is not None and not self.replayer.finished
+
+    def handle_event(self, event):
+        """Latch gameplay key events so taps shorter than a tick are not lost"""
+        if event.type == pg.KEYDOWN and event.key == pg.K_SPACE:
+            self.latched |= InputFrame.JUMP
+        elif event.type == pg.KEYUP and event.key in self.key_up_actions:
+            self.latched |= self.key_up_actions[event.key]
+
+    def request(self, bit):
+        """Apply a one-shot action on the next tick, as if its key had been tapped (menus and clicks)"""
+        self.latched |= bit
+
+    def stop_recording(self):
+        """End the recording when play is left for the menus, which are not simulated or recorded"""
+        if self.recorder:
+            self.recorder.close(self.game.seed)
+            self.recorder = None
+
+    def sample_keyboard(self):
+        """Bits of the gameplay keys currently held down"""
+        keys = pg.key.get_pressed()
+        bits = 0
+        if keys[pg.K_LEFT] or keys[pg.K_a]:
+            bits |= InputFrame.LEFT
+        if keys[pg.K_RIGHT] or keys[pg.K_d]:
+            bits |= InputFrame.RIGHT
+        if keys[pg.K_SPACE]:
+            bits |= InputFrame.JUMP
+        return bits
+
+    def next_frame(self):
+        """Advance to the input of the next simulation tick"""
+        if self.replaying:
+            bits = self.replayer.next_bits()
+        else:
+            bits = self.sample_keyboard() | self.latched
+        self.latched = 0
+
+        if self.recorder:
+            self.recorder.record(bits, self.game.level_num)
+
+        self.frame = InputFrame(bits, self.frame.bits)
+        return self.frame
+
+    def close(self):
+        """Finish writing the recording, if any"""
+        if self.recorder:
+            self.recorder.close(self.game.seed)
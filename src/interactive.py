@@ -1,8 +1,11 @@
 import pygame as pg
 import pymunk
 import math
-import random
 from src.settings import *
+from src.rng import RandomStreams
+from src.text import Text
+
+particles_random = RandomStreams.get("particles")
 
 class InteractiveObject(pg.sprite.Sprite):
     """Base class for objects that can be interacted with"""
@@ -22,6 +25,7 @@ class InteractiveObject(pg.sprite.Sprite):
         
         # Interactive properties
         self.is_near_player = False
+        self.spatial_index = None  # Set by SpatialHash.insert
         self.activated = False
         self.can_interact = True
         self.highlight_effect = 0
@@ -35,8 +39,8 @@ class InteractiveObject(pg.sprite.Sprite):
         
     def setup_prompt(self):
         """Setup the interaction prompt"""
-        font = pg.font.SysFont(None, 24)
-        self.interaction_prompt = font.render("Press E to interact", True, WHITE)
+        font = Text.font(None, 24)
+        self.interaction_prompt = Text.render(font, "Press E to interact", WHITE)
         
     def update(self, player=None):
         """Update interactive object state"""
@@ -237,9 +241,9 @@ class Door(InteractiveObject):
         pg.draw.circle(surface, DARK_TEAL, (keyhole_x, keyhole_y), keyhole_radius)
         
         # Add "X" token counter
-        lock_font = pg.font.SysFont(None, max(14, self.width // 8))
+        lock_font = Text.font(None, max(14, self.width // 8))
         tokens_text = f"X{self.required_tokens}"
-        text_surf = lock_font.render(tokens_text, True, DARK_TEAL)
+        text_surf = Text.render(lock_font, tokens_text, DARK_TEAL)
         text_rect = text_surf.get_rect(center=(x + lock_width // 2, y - shackle_height - 5))
         surface.blit(text_surf, text_rect)
     
@@ -301,9 +305,13 @@ class Door(InteractiveObject):
             # Update physics body and sprite position
             self.body.position = current_x + self.width // 2, current_y + self.height // 2
             self.rect.topleft = (current_x, current_y)
+            if self.spatial_index:
+                self.spatial_index.move(self)
         
         # Update appearance based on locked state
-        if self.is_locked != getattr(self, '_prev_locked_state', None) or self.glow_amount > 0:
+        if getattr(self.game, 'headless', False):
+            pass
+        elif self.is_locked != getattr(self, '_prev_locked_state', None) or self.glow_amount > 0:
             self.update_appearance()
             self._prev_locked_state = self.is_locked
     
@@ -340,9 +348,9 @@ class Door(InteractiveObject):
             # Create an intense particle burst when opening
             if hasattr(self.game, 'token_particles'):
                 for i in range(3):  # Multiple bursts
-                    offset_x = random.randint(-30, 30)
-                    offset_y = random.randint(-30, 30)
-                    color = random.choice([BRIGHT_TEAL, GOLD, LIGHT_TEAL])
+                    offset_x = particles_random.randint(-30, 30)
+                    offset_y = particles_random.randint(-30, 30)
+                    color = particles_random.choice([BRIGHT_TEAL, GOLD, LIGHT_TEAL])
                     
                     self.game.token_particles.spawn_particles(
                         (self.rect.centerx + self.game.camera_offset_x + offset_x, 
@@ -392,7 +400,7 @@ class Door(InteractiveObject):
             surface.blit(rotated_lock, (lock_x, lock_y))
             
             # Add particle trail behind falling lock
-            if hasattr(self.game, 'token_particles') and self.game.dt * self.game.frame_count % 0.1 < 0.03:
+            if hasattr(self.game, 'token_particles') and self.game.sim_time % 0.1 < 0.03:
                 self.game.token_particles.spawn_particles(
                     (lock_x + rotated_lock.get_width() // 2, 
                      lock_y + rotated_lock.get_height() // 2),
@@ -407,9 +415,9 @@ class Door(InteractiveObject):
                 # Create "Need X tokens" prompt for locked doors
                 tokens_needed = self.required_tokens - self.game.player.tokens_collected
                 if tokens_needed > 0:
-                    font = pg.font.SysFont(None, 24)
+                    font = Text.font(None, 24)
                     prompt_text = f"Need {tokens_needed} more X tokens"
-                    prompt = font.render(prompt_text, True, self.lock_color)
+                    prompt = Text.render(font, prompt_text, self.lock_color)
                     prompt_x = self.rect.centerx + camera_offset_x - prompt.get_width() // 2
                     prompt_y = self.rect.top + camera_offset_y - 30
                     surface.blit(prompt, (prompt_x, prompt_y))
@@ -1,12 +1,19 @@
 import pygame as pg
 import pymunk
-import random
 import math
 from src.settings import *
 from src.sprites import Platform, SuperseedToken, EnhancedBackground, Lightning
 from src.entities.player import Player
 from src.interactive import Door
 from src.ui import ParticleSystem, Panel, Button
+from src.spatial import SpatialHash
+from src.rng import RandomStreams
+from src.text import Text
+
+effects_random = RandomStreams.get("effects")
+gameplay_random = RandomStreams.get("gameplay")
+layout_random = RandomStreams.get("layout")
+particles_random = RandomStreams.get("particles")
 
 class Level:
     """Handles level design, loading and interaction"""
@@ -41,18 +48,30 @@ class Level:
         self.spawn_protection_time = 1.0  # Default value, overridden in level creation
         
         # Completion animation
-        self.completion_particles = ParticleSystem("x_mark", 150)
+        self.completion_particles = ParticleSystem("x_mark", COMPLETION_PARTICLE_CAPACITY)
         self.celebration_text = None
-        self.celebration_font = pg.font.SysFont(None, 72)
+        self.celebration_font = Text.font(None, 72)
         
         # Death animation
-        self.death_particles = ParticleSystem("circle", 100)
+        self.death_particles = ParticleSystem("circle", DEATH_PARTICLE_CAPACITY)
         self.death_text = None
-        self.death_font = pg.font.SysFont(None, 72)
+        self.death_font = Text.font(None, 72)
         
         # Load level
         self.load_level(level_num)
         
+        # Spatial indexes over the level groups
+        self.platform_index = SpatialHash.from_sprites(self.platforms)
+        self.token_index = SpatialHash.from_sprites(self.tokens)
+        self.object_index = SpatialHash.from_sprites(self.interactive_objects)
+        
+        # Owning sprite of every physics shape, for collision handlers
+        self.shape_owners = {
+            sprite.shape: sprite
+            for group in (self.platforms, self.tokens, self.interactive_objects)
+            for sprite in group
+        }
+        
     def load_level(self, level_num):
         """Load level data and create game objects"""
         if level_num == 1:
@@ -118,7 +137,7 @@ class Level:
         ]
         
         for pos in token_positions:
-            token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+            token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
             token = SuperseedToken(self.game, *pos, token_type=token_type)
             self.tokens.add(token)
             self.game.space.add(token.body, token.shape)
@@ -218,7 +237,7 @@ class Level:
             
             # Add tokens at peak height platforms
             if i == 3:  # Highest platform
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 token = SuperseedToken(self.game, x + width // 2, y - 60, token_type=token_type)
                 self.tokens.add(token)
                 self.game.space.add(token.body, token.shape)
@@ -270,8 +289,8 @@ class Level:
             self.game.space.add(plat.body, plat.shape)
             
             # Add token to platforms except the last one
-            if i < len(final_platforms) - 1 and random.random() < 0.5 and token_count < 10:
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+            if i < len(final_platforms) - 1 and layout_random.random() < 0.5 and token_count < 10:
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 token = SuperseedToken(self.game, p[0] + p[2] // 2, p[1] - 60, token_type=token_type)
                 self.tokens.add(token)
                 self.game.space.add(token.body, token.shape)
@@ -301,9 +320,9 @@ class Level:
                 token_x = int(segment * (self.width - 400)) + 200
                 
                 # Randomize Y position but keep it above platforms
-                token_y = HEIGHT - 300 - random.randint(0, 100)
+                token_y = HEIGHT - 300 - layout_random.randint(0, 100)
                 
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 token = SuperseedToken(self.game, token_x, token_y, token_type=token_type)
                 self.tokens.add(token)
                 self.game.space.add(token.body, token.shape)
@@ -374,14 +393,14 @@ class Level:
                         step_y = prev_building[1] + ((b[1] - prev_building[1]) * (step + 1)) // (steps_needed + 1)
                     
                     # Add a smaller platform as a stepping stone
-                    step_width = 80 + random.randint(0, 40)
+                    step_width = 80 + layout_random.randint(0, 40)
                     step_platform = Platform(self.game, step_x, step_y, step_width, 15, platform_type="floating")
                     self.platforms.add(step_platform)
                     self.game.space.add(step_platform.body, step_platform.shape)
                     
                     # 50% chance to add token above stepping stone
-                    if random.random() < 0.5 and token_count < 10:
-                        token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                    if layout_random.random() < 0.5 and token_count < 10:
+                        token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                         token = SuperseedToken(self.game, step_x + step_width//2, step_y - 60, token_type=token_type)
                         self.tokens.add(token)
                         self.game.space.add(token.body, token.shape)
@@ -392,9 +411,9 @@ class Level:
         # Add tokens on buildings
         for b in buildings:
             # 40% chance to add a token on each building
-            if random.random() < 0.4 and token_count < 10:
-                token_x = b[0] + random.randint(50, b[2] - 50)
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+            if layout_random.random() < 0.4 and token_count < 10:
+                token_x = b[0] + layout_random.randint(50, b[2] - 50)
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 token = SuperseedToken(self.game, token_x, b[1] - 50, token_type=token_type)
                 self.tokens.add(token)
                 self.game.space.add(token.body, token.shape)
@@ -416,7 +435,7 @@ class Level:
             
             # Add a token on each moving platform if we still need tokens
             if token_count < 10:
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 token = SuperseedToken(self.game, mp[0] + mp[2]//2, mp[1] - 50, token_type=token_type)
                 self.tokens.add(token)
                 self.game.space.add(token.body, token.shape)
@@ -446,9 +465,9 @@ class Level:
                 token_x = int(segment * (self.width - 400)) + 200
                 
                 # Randomize Y position but keep it above buildings
-                token_y = HEIGHT - 400 - random.randint(0, 100)
+                token_y = HEIGHT - 400 - layout_random.randint(0, 100)
                 
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 token = SuperseedToken(self.game, token_x, token_y, token_type=token_type)
                 self.tokens.add(token)
                 self.game.space.add(token.body, token.shape)
@@ -515,7 +534,7 @@ class Level:
                 # Add token in middle of platform
                 token_x = p[0] + p[2] // 2
                 token_y = p[1] - 60
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 token = SuperseedToken(self.game, token_x, token_y, token_type=token_type)
                 self.tokens.add(token)
                 self.game.space.add(token.body, token.shape)
@@ -563,7 +582,7 @@ class Level:
         ]
         
         for pos in obstacle_tokens:
-            token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+            token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
             token = SuperseedToken(self.game, *pos, token_type=token_type)
             self.tokens.add(token)
             self.game.space.add(token.body, token.shape)
@@ -593,7 +612,7 @@ class Level:
             if token_count < 10:
                 token_x = mp[0] + mp[2] // 2
                 token_y = mp[1] - 60
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 token = SuperseedToken(self.game, token_x, token_y, token_type=token_type)
                 self.tokens.add(token)
                 self.game.space.add(token.body, token.shape)
@@ -633,7 +652,7 @@ class Level:
             ]
             
             for i in range(min(tokens_needed, len(token_locations))):
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 token = SuperseedToken(self.game, *token_locations[i], token_type=token_type)
                 self.tokens.add(token)
                 self.game.space.add(token.body, token.shape)
@@ -646,6 +665,20 @@ class Level:
         self.game.space.add(left_wall.body, left_wall.shape)
         self.game.space.add(right_wall.body, right_wall.shape)
     
+    def insert_token(self, token):
+        """Put a token back into the level"""
+        self.tokens.add(token)
+        self.token_index.insert(token)
+        self.shape_owners[token.shape] = token
+        self.game.space.add(token.body, token.shape)
+        
+    def remove_token(self, token):
+        """Remove a token from the level"""
+        self.tokens.remove(token)
+        self.token_index.remove(token)
+        self.shape_owners.pop(token.shape, None)
+        self.game.space.remove(token.shape, token.body)
+        
     def update(self):
         """Update all level elements"""
         self.platforms.update()
@@ -674,7 +707,7 @@ class Level:
             return True
             
         # Check if spawn protection is active
-        current_time = self.game.dt * self.game.frame_count
+        current_time = self.game.sim_time
         if current_time - self.level_start_time < self.spawn_protection_time:
             return False
             
@@ -699,11 +732,11 @@ class Level:
             
             # Set death text based on death type
             if death_type == "fall":
-                self.death_text = self.death_font.render("You Fell!", True, (255, 50, 50))
+                self.death_text = Text.render(self.death_font, "You Fell!", (255, 50, 50))
             elif death_type == "boundary":
-                self.death_text = self.death_font.render("Out of Bounds!", True, (255, 80, 80))
+                self.death_text = Text.render(self.death_font, "Out of Bounds!", (255, 80, 80))
             else:
-                self.death_text = self.death_font.render("You Died!", True, (255, 50, 50))
+                self.death_text = Text.render(self.death_font, "You Died!", (255, 50, 50))
             
             # Play death sound
             if hasattr(self.game, 'sound_manager'):
@@ -736,6 +769,13 @@ class Level:
                     spread=80
                 )
             
+    def set_player_shake(self, shake_x, shake_y):
+        """Draw the player shaken around where it died, without moving its rect"""
+        player = self.game.player
+        original_x, original_y = self.original_player_pos
+        player.shake_offset = (original_x + shake_x - player.rect.centerx,
+                               original_y + shake_y - player.rect.centery)
+            
     def update_death_animation(self):
         """Update death animation"""
         dt = self.game.dt
@@ -749,15 +789,11 @@ class Level:
             # Multi-phase electrocution animation
             if self.death_animation_time < 1.2:  # Extended animation time
                 # Character shaking/vibration effect
-                shake_x = random.randint(-self.shake_amount, self.shake_amount)
-                shake_y = random.randint(-self.shake_amount, self.shake_amount)
+                shake_x = effects_random.randint(-self.shake_amount, self.shake_amount)
+                shake_y = effects_random.randint(-self.shake_amount, self.shake_amount)
                 
-                # Apply shake to player sprite if we can
-                if hasattr(self.game, 'player') and hasattr(self.game.player, 'rect'):
-                    # Store original position to reset after level restart
-                    original_x, original_y = self.original_player_pos
-                    self.game.player.rect.centerx = original_x + shake_x
-                    self.game.player.rect.centery = original_y + shake_y
+                # Draw the player shaking where it was hit (its rect stays with the physics body)
+                self.set_player_shake(shake_x, shake_y)
                 
                 # Phase transitions
                 if self.death_animation_time > 0.3 and self.electrocution_phase == 0:
@@ -806,15 +842,14 @@ class Level:
                             color=LIGHTNING_COLOR
                         )
                     
-                    # Reset player position to center for the explosion
-                    if hasattr(self.game, 'player') and hasattr(self.game.player, 'rect'):
-                        original_x, original_y = self.original_player_pos
-                        self.game.player.rect.centerx = original_x
-                        self.game.player.rect.centery = original_y
+                    # Draw the player back at the center for the explosion
+                    self.set_player_shake(0, 0)
             
             # After animation completes
-            elif self.death_animation_time > 2.0:  # Longer pause before restart
-                self.game.restart_level()
+            else:
+                self.game.player.shake_offset = (0, 0)
+                if self.death_animation_time > 2.0:  # Longer pause before restart
+                    self.game.restart_level()
         else:
             # Standard death animation for falling
             if self.death_animation_time > 1.5:
@@ -838,15 +873,15 @@ class Level:
                 intensity = max(0.2, 1.0 - (self.completion_time - 1.0) / 2.0)  # Gradually reduce
                 
             # More frequent particle bursts at higher intensity
-            if random.random() < 0.3 * intensity:
+            if particles_random.random() < 0.3 * intensity:
                 # Create confetti around the entire screen
                 for _ in range(3):
                     # Randomly position confetti across the visible area
-                    pos_x = random.randint(0, WIDTH)
-                    pos_y = random.randint(0, HEIGHT // 2)
+                    pos_x = particles_random.randint(0, WIDTH)
+                    pos_y = particles_random.randint(0, HEIGHT // 2)
                     
                     # Random color from confetti colors
-                    color = random.choice(CONFETTI_COLORS)
+                    color = particles_random.choice(CONFETTI_COLORS)
                     
                     # Spawn confetti particles
                     self.completion_particles.spawn_particles(
@@ -857,10 +892,10 @@ class Level:
                     )
             
             # Special burst around player at beginning
-            if self.completion_time < 0.5 and random.random() < 0.4:
+            if self.completion_time < 0.5 and particles_random.random() < 0.4:
                 # Create celebration burst around player
-                angle = random.uniform(0, 2 * math.pi)
-                dist = random.uniform(30, 150)
+                angle = particles_random.uniform(0, 2 * math.pi)
+                dist = particles_random.uniform(30, 150)
                 pos_x = self.game.player.rect.centerx + math.cos(angle) * dist
                 pos_y = self.game.player.rect.centery + math.sin(angle) * dist
                 
@@ -869,7 +904,7 @@ class Level:
                     (pos_x + self.game.camera_offset_x, pos_y + self.game.camera_offset_y), 
                     10, 
                     spread=40,
-                    color=random.choice(CONFETTI_COLORS)
+                    color=particles_random.choice(CONFETTI_COLORS)
                 )
         
         # Create completion menu after 5 seconds
@@ -896,10 +931,10 @@ class Level:
         self.completion_time = 0
         
         # Set celebration texts
-        self.celebration_text = self.celebration_font.render("Level Complete!", True, BRIGHT_TEAL)
+        self.celebration_text = Text.render(self.celebration_font, "Level Complete!", BRIGHT_TEAL)
         
         # Create "You're now debt free!" message
-        self.debt_free_text = self.celebration_font.render("You're now debt free!", True, GOLD)
+        self.debt_free_text = Text.render(self.celebration_font, "You're now debt free!", GOLD)
         
         # Create completion menu
         self.completion_menu_panel = Panel(
@@ -970,12 +1005,12 @@ class Level:
                 player_y = self.game.player.rect.centery
                 
                 # Sometimes spawn directly in player's path, sometimes nearby
-                spawn_offset_x = random.choice([
-                    random.randint(200, 600),   # Ahead of player
-                    random.randint(-300, 200)   # Behind or at player
+                spawn_offset_x = gameplay_random.choice([
+                    gameplay_random.randint(200, 600),   # Ahead of player
+                    gameplay_random.randint(-300, 200)   # Behind or at player
                 ])
                 
-                spawn_offset_y = random.randint(-200, 200)  # Above or below player
+                spawn_offset_y = gameplay_random.randint(-200, 200)  # Above or below player
                 
                 # Calculate spawn position
                 spawn_x = player_x + spawn_offset_x
@@ -986,8 +1021,8 @@ class Level:
                 spawn_x = max(100, min(self.width - 100, spawn_x))
                 
                 # Create lightning with random angle and size
-                lightning_height = random.randint(200, 400)  # Length of lightning
-                lightning_angle = random.randint(20, 160)    # Angle in degrees
+                lightning_height = gameplay_random.randint(200, 400)  # Length of lightning
+                lightning_angle = gameplay_random.randint(20, 160)    # Angle in degrees
                 
                 # Create the lightning hazard
                 lightning = Lightning(
@@ -1013,7 +1048,7 @@ class Level:
             self.last_shake_dir = 1  # For alternating shake direction
             
             # Set death text
-            self.death_text = self.death_font.render("You've been killed by the crash!", True, LIGHTNING_COLOR)
+            self.death_text = Text.render(self.death_font, "You've been killed by the crash!", LIGHTNING_COLOR)
             
             # Store original player position for animation
             self.original_player_pos = (
@@ -1028,7 +1063,7 @@ class Level:
             )
             
             # Create particle system for electrocution effect
-            self.death_particles = ParticleSystem("lightning", CRASH_EXPLOSION_PARTICLE_COUNT * 2)
+            self.death_particles = ParticleSystem("lightning", ELECTROCUTION_PARTICLE_CAPACITY)
             
             # Initial lightning particles (first phase)
             self.death_particles.spawn_particles(
@@ -1139,8 +1174,8 @@ class Level:
                 self.completion_menu_panel.draw(surface)
                 
                 # Draw title text
-                title_font = pg.font.SysFont(None, 40)
-                title_text = title_font.render("Level Completed!", True, BRIGHT_TEAL)
+                title_font = Text.font(None, 40)
+                title_text = Text.render(title_font, "Level Completed!", BRIGHT_TEAL)
                 title_x = WIDTH // 2 - title_text.get_width() // 2
                 title_y = HEIGHT // 2 - 70
                 surface.blit(title_text, (title_x, title_y))
@@ -1150,11 +1185,11 @@ class Level:
                     mouse_pos = pg.mouse.get_pos()
                     
                     # Update and draw the next level button
-                    self.next_level_button.update(mouse_pos, self.game.dt)
+                    self.next_level_button.update(mouse_pos, self.game.frame_dt)
                     self.next_level_button.draw(surface)
                     
                     # Update and draw the main menu button
-                    self.main_menu_button.update(mouse_pos, self.game.dt)
+                    self.main_menu_button.update(mouse_pos, self.game.frame_dt)
                     self.main_menu_button.draw(surface)
             
     def draw_interactive_prompts(self, surface, camera_offset_x, camera_offset_y):
@@ -6,22 +6,23 @@ from src.levels.level1 import Level1
 from src.levels.level2 import Level2
 from src.levels.level3 import Level3
 
-def get_level(game, level_num):
+def get_level(game, level_num, detached=False):
     """Factory function to get appropriate level instance
     
     Args:
         game: Game instance
         level_num: Level number to load
+        detached: Hold physics bodies back until level.attach() (levels 1-3 only)
         
     Returns:
         Level instance based on the requested level number
     """
     if level_num == 1:
-        return Level1(game)
+        return Level1(game, detached)
     elif level_num == 2:
-        return Level2(game)
+        return Level2(game, detached)
     elif level_num == 3:
-        return Level3(game)
+        return Level3(game, detached)
     else:
         # Fallback to default level if invalid level number
         return Level(game, level_num)
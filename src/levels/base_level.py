@@ -1,17 +1,27 @@
 import pygame as pg
 import pymunk
-import random
 import math
 from src.settings import *
 from src.sprites import Platform, SuperseedToken
 from src.interactive import Door
 from src.ui import ParticleSystem, Panel, Button
+from src.spatial import SpatialHash
+from src.rng import RandomStreams
+from src.text import Text
+
+layout_random = RandomStreams.get("layout")
+particles_random = RandomStreams.get("particles")
 
 class BaseLevel:
     """Base class for all game levels with common functionality"""
-    def __init__(self, game):
+    def __init__(self, game, detached=False):
         self.game = game
         
+        # A detached level is built away from the game loop (e.g. on a worker thread)
+        # and holds its physics bodies back until attach() adds them to the space
+        self.detached = detached
+        self.pending_bodies = []
+        
         # Level data
         self.width = 0
         self.height = 0
@@ -24,6 +34,14 @@ class BaseLevel:
         self.enemies = pg.sprite.Group()
         self.interactive_objects = pg.sprite.Group()
         
+        # Spatial indexes over the groups above, kept in sync by the add/remove helpers
+        self.platform_index = SpatialHash()
+        self.token_index = SpatialHash()
+        self.object_index = SpatialHash()
+        
+        # Owning sprite of every physics shape, for collision handlers
+        self.shape_owners = {}
+        
         # Define token types for variety in the level
         self.token_types = ["x_token", "star_token", "coin_token", "gem_token", "logo_token"]
         
@@ -40,14 +58,14 @@ class BaseLevel:
         self.spawn_protection_time = 1.0  # Default value
         
         # Completion animation
-        self.completion_particles = ParticleSystem("x_mark", 150)
+        self.completion_particles = ParticleSystem("x_mark", COMPLETION_PARTICLE_CAPACITY)
         self.celebration_text = None
-        self.celebration_font = pg.font.SysFont(None, 72)
+        self.celebration_font = Text.font(None, 72)
         
         # Death animation
-        self.death_particles = ParticleSystem("circle", DEATH_PARTICLES_COUNT)
+        self.death_particles = ParticleSystem("circle", DEATH_PARTICLE_CAPACITY)
         self.death_text = None
-        self.death_font = pg.font.SysFont(None, 72)
+        self.death_font = Text.font(None, 72)
         
         # Set up the level
         self.setup_level()
@@ -83,7 +101,9 @@ class BaseLevel:
             
         # Add to sprite group and physics space
         self.platforms.add(platform)
-        self.game.space.add(platform.body, platform.shape)
+        self.platform_index.insert(platform)
+        self.shape_owners[platform.shape] = platform
+        self.add_body(platform.body, platform.shape)
         
         return platform
         
@@ -91,15 +111,28 @@ class BaseLevel:
         """Helper method to add a token to the level"""
         # If no token type specified, choose a random one
         if token_type is None:
-            token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+            token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
             
         # Create token
         token = SuperseedToken(self.game, x, y, token_type=token_type)
-        self.tokens.add(token)
-        self.game.space.add(token.body, token.shape)
+        self.insert_token(token)
         
         return token
         
+    def insert_token(self, token):
+        """Helper method to put a token into the sprite group, index and physics space"""
+        self.tokens.add(token)
+        self.token_index.insert(token)
+        self.shape_owners[token.shape] = token
+        self.add_body(token.body, token.shape)
+        
+    def remove_token(self, token):
+        """Helper method to remove a token from the level"""
+        self.tokens.remove(token)
+        self.token_index.remove(token)
+        self.shape_owners.pop(token.shape, None)
+        self.remove_body(token.body, token.shape)
+        
     def add_exit_door(self, x, y, tokens_required=LEVEL_DOOR_TOKENS_REQUIRED):
         """Helper method to add an exit door"""
         door_width = 80
@@ -108,7 +141,9 @@ class BaseLevel:
         # Create door
         exit_door = Door(self.game, x, y, door_width, door_height, "vertical", tokens_required)
         self.interactive_objects.add(exit_door)
-        self.game.space.add(exit_door.body, exit_door.shape)
+        self.object_index.insert(exit_door)
+        self.shape_owners[exit_door.shape] = exit_door
+        self.add_body(exit_door.body, exit_door.shape)
         
         return exit_door
         
@@ -117,13 +152,40 @@ class BaseLevel:
         left_wall = Platform(self.game, -10, 0, 10, HEIGHT)
         right_wall = Platform(self.game, self.width, 0, 10, HEIGHT)
         self.platforms.add(left_wall, right_wall)
-        self.game.space.add(left_wall.body, left_wall.shape)
-        self.game.space.add(right_wall.body, right_wall.shape)
+        for wall in (left_wall, right_wall):
+            self.platform_index.insert(wall)
+            self.shape_owners[wall.shape] = wall
+        self.add_body(left_wall.body, left_wall.shape)
+        self.add_body(right_wall.body, right_wall.shape)
+        
+    def add_body(self, body, shape):
+        """Helper method to add a body to the physics space (held back while detached)"""
+        if self.detached:
+            self.pending_bodies.append((body, shape))
+        else:
+            self.game.space.add(body, shape)
+            
+    def remove_body(self, body, shape):
+        """Helper method to take a body back out of the physics space"""
+        if self.detached:
+            self.pending_bodies.remove((body, shape))
+        else:
+            self.game.space.remove(shape, body)
+            
+    def attach(self):
+        """Add the bodies held back by a detached build to the physics space"""
+        for body, shape in self.pending_bodies:
+            self.game.space.add(body, shape)
+        self.pending_bodies = []
+        self.detached = False
     
     def update(self):
         """Update all level elements"""
         self.platforms.update()
-        self.tokens.update()
+        
+        # Only tokens near the screen need to animate
+        for token in self.token_index.query(self.game.get_viewport()):
+            token.update()
         self.enemies.update()
         
         # Update interactive objects with player position
@@ -144,7 +206,7 @@ class BaseLevel:
             return True
             
         # Check if spawn protection is active
-        current_time = self.game.dt * self.game.frame_count
+        current_time = self.game.sim_time
         player_has_moved = False
         if hasattr(self.game, 'player'):
             # Check if player has moved from starting position
@@ -177,11 +239,11 @@ class BaseLevel:
             
             # Set death text based on death type
             if death_type == "fall":
-                self.death_text = self.death_font.render("You Fell!", True, (255, 50, 50))
+                self.death_text = Text.render(self.death_font, "You Fell!", (255, 50, 50))
             elif death_type == "boundary":
-                self.death_text = self.death_font.render("Out of Bounds!", True, (255, 80, 80))
+                self.death_text = Text.render(self.death_font, "Out of Bounds!", (255, 80, 80))
             else:
-                self.death_text = self.death_font.render("You Died!", True, (255, 50, 50))
+                self.death_text = Text.render(self.death_font, "You Died!", (255, 50, 50))
             
             # Play death sound
             if hasattr(self.game, 'sound_manager'):
@@ -214,6 +276,13 @@ class BaseLevel:
                     spread=80
                 )
             
+    def set_player_shake(self, shake_x, shake_y):
+        """Draw the player shaken around where it died, without moving its rect"""
+        player = self.game.player
+        original_x, original_y = self.original_player_pos
+        player.shake_offset = (original_x + shake_x - player.rect.centerx,
+                               original_y + shake_y - player.rect.centery)
+            
     def update_death_animation(self):
         """Update death animation"""
         dt = self.game.dt
@@ -244,15 +313,15 @@ class BaseLevel:
                 intensity = max(0.2, 1.0 - (self.completion_time - 1.0) / 2.0)  # Gradually reduce
                 
             # More frequent particle bursts at higher intensity
-            if random.random() < 0.3 * intensity:
+            if particles_random.random() < 0.3 * intensity:
                 # Create confetti around the entire screen
                 for _ in range(3):
                     # Randomly position confetti across the visible area
-                    pos_x = random.randint(0, WIDTH)
-                    pos_y = random.randint(0, HEIGHT // 2)
+                    pos_x = particles_random.randint(0, WIDTH)
+                    pos_y = particles_random.randint(0, HEIGHT // 2)
                     
                     # Random color from confetti colors
-                    color = random.choice(CONFETTI_COLORS)
+                    color = particles_random.choice(CONFETTI_COLORS)
                     
                     # Spawn confetti particles
                     self.completion_particles.spawn_particles(
@@ -263,10 +332,10 @@ class BaseLevel:
                     )
             
             # Special burst around player at beginning
-            if self.completion_time < 0.5 and random.random() < 0.4:
+            if self.completion_time < 0.5 and particles_random.random() < 0.4:
                 # Create celebration burst around player
-                angle = random.uniform(0, 2 * math.pi)
-                dist = random.uniform(30, 150)
+                angle = particles_random.uniform(0, 2 * math.pi)
+                dist = particles_random.uniform(30, 150)
                 pos_x = self.game.player.rect.centerx + math.cos(angle) * dist
                 pos_y = self.game.player.rect.centery + math.sin(angle) * dist
                 
@@ -275,7 +344,7 @@ class BaseLevel:
                     (pos_x + self.game.camera_offset_x, pos_y + self.game.camera_offset_y), 
                     10, 
                     spread=40,
-                    color=random.choice(CONFETTI_COLORS)
+                    color=particles_random.choice(CONFETTI_COLORS)
                 )
         
         # Create completion menu after 5 seconds
@@ -335,10 +404,10 @@ class BaseLevel:
         self.completion_time = 0
         
         # Set celebration texts
-        self.celebration_text = self.celebration_font.render("Level Complete!", True, BRIGHT_TEAL)
+        self.celebration_text = Text.render(self.celebration_font, "Level Complete!", BRIGHT_TEAL)
         
         # Create "You're now debt free!" message
-        self.debt_free_text = self.celebration_font.render("You're now debt free!", True, GOLD)
+        self.debt_free_text = Text.render(self.celebration_font, "You're now debt free!", GOLD)
         
         # Spawn initial burst of particles at player position
         player_screen_pos = (
@@ -347,6 +416,10 @@ class BaseLevel:
         )
         self.completion_particles.spawn_particles(player_screen_pos, 40, spread=100)
         
+        # Build the next level in the background while the celebration plays
+        if hasattr(self.game, 'prebuild_next_level'):
+            self.game.prebuild_next_level()
+        
     def draw(self, surface):
         """Draw all level elements to the surface"""
         # Draw level completion elements
@@ -435,8 +508,8 @@ class BaseLevel:
                 self.completion_menu_panel.draw(surface)
                 
                 # Draw title text
-                title_font = pg.font.SysFont(None, 40)
-                title_text = title_font.render("Level Completed!", True, BRIGHT_TEAL)
+                title_font = Text.font(None, 40)
+                title_text = Text.render(title_font, "Level Completed!", BRIGHT_TEAL)
                 title_x = WIDTH // 2 - title_text.get_width() // 2
                 title_y = HEIGHT // 2 - 70
                 surface.blit(title_text, (title_x, title_y))
@@ -446,11 +519,11 @@ class BaseLevel:
                     mouse_pos = pg.mouse.get_pos()
                     
                     # Update and draw the next level button
-                    self.next_level_button.update(mouse_pos, self.game.dt)
+                    self.next_level_button.update(mouse_pos, self.game.frame_dt)
                     self.next_level_button.draw(surface)
                     
                     # Update and draw the main menu button
-                    self.main_menu_button.update(mouse_pos, self.game.dt)
+                    self.main_menu_button.update(mouse_pos, self.game.frame_dt)
                     self.main_menu_button.draw(surface)
             
     def draw_interactive_prompts(self, surface, camera_offset_x, camera_offset_y):
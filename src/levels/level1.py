@@ -1,17 +1,19 @@
 import pygame as pg
 import pymunk
-import random
 import math
 from src.settings import *
 from src.sprites import Platform, SuperseedToken
 from src.interactive import Door
 from src.levels.base_level import BaseLevel
+from src.rng import RandomStreams
+
+layout_random = RandomStreams.get("layout")
 
 class Level1(BaseLevel):
     """Level 1: Teal X Obstacle Course - The first level with simple mechanics"""
-    def __init__(self, game):
+    def __init__(self, game, detached=False):
         self.level_num = 1
-        super().__init__(game)
+        super().__init__(game, detached)
         
     def setup_level(self):
         """Setup the Teal X Obstacle Course level"""
@@ -97,12 +99,12 @@ class Level1(BaseLevel):
             
             # Add token at peak height platform
             if i == 3:  # Highest platform
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 self.add_token(x + width // 2, y - 60, token_type=token_type)
             
             # Also add token at one more platform in this section (the descent)
             if i == 5:  # One of the descent platforms
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 self.add_token(x + width // 2, y - 60, token_type=token_type)
     
     def create_moving_section(self):
@@ -153,7 +155,7 @@ class Level1(BaseLevel):
             if i == len(final_platforms) - 1 or i == 2:
                 token_y = p[1] - 60
                 # Special logo token for final platform
-                token_type = "logo_token" if i == len(final_platforms) - 1 else self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = "logo_token" if i == len(final_platforms) - 1 else self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 self.add_token(p[0] + p[2] // 2, token_y, token_type=token_type)
         
         # Add exit door on the last platform
@@ -185,7 +187,7 @@ class Level1(BaseLevel):
             # Use as many guaranteed positions as needed
             for i in range(min(tokens_needed, len(guaranteed_positions))):
                 pos = guaranteed_positions[i]
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 self.add_token(pos[0], pos[1], token_type=token_type)
                 
             # If we still need more tokens, add them at percentage positions
@@ -197,9 +199,9 @@ class Level1(BaseLevel):
                     token_x = int(segment * (self.width - 400)) + 200
                     
                     # Position at slightly different heights
-                    token_y = HEIGHT - 300 - random.randint(0, 50)
+                    token_y = HEIGHT - 300 - layout_random.randint(0, 50)
                     
-                    token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                    token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                     self.add_token(token_x, token_y, token_type=token_type)
         
         elif current_token_count > required_tokens:
@@ -210,10 +212,9 @@ class Level1(BaseLevel):
             # Remove random tokens until we have exactly the required number
             for _ in range(excess):
                 if tokens_list:
-                    token = random.choice(tokens_list)
+                    token = layout_random.choice(tokens_list)
                     tokens_list.remove(token)
-                    self.tokens.remove(token)
-                    self.game.space.remove(token.shape, token.body)
+                    self.remove_token(token)
         
         # Verify token count again
         final_count = len(self.tokens)
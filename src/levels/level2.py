@@ -1,17 +1,19 @@
 import pygame as pg
 import pymunk
-import random
 import math
 from src.settings import *
 from src.sprites import Platform, SuperseedToken
 from src.interactive import Door
 from src.levels.base_level import BaseLevel
+from src.rng import RandomStreams
+
+layout_random = RandomStreams.get("layout")
 
 class Level2(BaseLevel):
     """Level 2: Financial District - More complex level with building-themed platforms"""
-    def __init__(self, game):
+    def __init__(self, game, detached=False):
         self.level_num = 2
-        super().__init__(game)
+        super().__init__(game, detached)
         
     def setup_level(self):
         """Setup the Financial District level"""
@@ -93,12 +95,12 @@ class Level2(BaseLevel):
                         step_y = prev_building[1] + ((b[1] - prev_building[1]) * (step + 1)) // (steps_needed + 1)
                     
                     # Add a smaller platform as a stepping stone
-                    step_width = 80 + random.randint(0, 40)
+                    step_width = 80 + layout_random.randint(0, 40)
                     step_platform = self.add_platform(step_x, step_y, step_width, 15, platform_type="floating")
                     
                     # 70% chance to add token above stepping stone
-                    if random.random() < 0.7 and stepping_stone_tokens < 3:  # Keep token count manageable
-                        token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                    if layout_random.random() < 0.7 and stepping_stone_tokens < 3:  # Keep token count manageable
+                        token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                         self.add_token(step_x + step_width//2, step_y - 60, token_type=token_type)
                         stepping_stone_tokens += 1
             
@@ -161,7 +163,7 @@ class Level2(BaseLevel):
             # Use as many guaranteed positions as needed
             for i in range(min(tokens_needed, len(guaranteed_positions))):
                 pos = guaranteed_positions[i]
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 self.add_token(pos[0], pos[1], token_type=token_type)
                 
             # If we still need more tokens, add them at percentage positions
@@ -175,7 +177,7 @@ class Level2(BaseLevel):
                     # Position tokens at consistent heights that are reachable
                     token_y = HEIGHT - 350 - (50 * (i % 3))  # Vary heights between a few standard elevations
                     
-                    token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                    token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                     self.add_token(token_x, token_y, token_type=token_type)
         
         elif current_token_count > required_tokens:
@@ -186,10 +188,9 @@ class Level2(BaseLevel):
             # Remove random tokens until we have exactly the required number
             for _ in range(excess):
                 if tokens_list:
-                    token = random.choice(tokens_list)
+                    token = layout_random.choice(tokens_list)
                     tokens_list.remove(token)
-                    self.tokens.remove(token)
-                    self.game.space.remove(token.shape, token.body)
+                    self.remove_token(token)
                     
         # Verify token count again
         final_count = len(self.tokens)
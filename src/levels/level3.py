@@ -1,15 +1,20 @@
 import pygame as pg
 import pymunk
-import random
 import math
 from src.settings import *
-from src.sprites import Platform, SuperseedToken, Lightning, EnhancedBackground
+from src.sprites import Platform, SuperseedToken, Lightning
 from src.interactive import Door
 from src.levels.base_level import BaseLevel
+from src.rng import RandomStreams
+from src.text import Text
+
+effects_random = RandomStreams.get("effects")
+gameplay_random = RandomStreams.get("gameplay")
+layout_random = RandomStreams.get("layout")
 
 class Level3(BaseLevel):
     """Level 3: Market Crash - Final challenging level with lightning hazards"""
-    def __init__(self, game):
+    def __init__(self, game, detached=False):
         self.level_num = 3
         
         # Lightning hazards list - will be populated during setup
@@ -17,7 +22,7 @@ class Level3(BaseLevel):
         self.lightning_spawn_timer = 0
         self.lightning_spawn_interval = 3.0  # Time between lightning spawns
         
-        super().__init__(game)
+        super().__init__(game, detached)
         
     def setup_level(self):
         """Setup the Market Crash level - most challenging level"""
@@ -36,10 +41,6 @@ class Level3(BaseLevel):
         # Add ceiling
         ceiling = self.add_platform(0, 0, self.width, 20)
         
-        # Create specialized background if game has that capability
-        if hasattr(self.game, 'background'):
-            self.game.background = EnhancedBackground(self.game, "market_crash")
-        
         # Starting platform (safe area)
         start_platform = self.add_platform(50, HEIGHT - 200, 350, 20, "building")
         
@@ -119,7 +120,7 @@ class Level3(BaseLevel):
         ]
         
         for i, pos in enumerate(obstacle_tokens):
-            token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+            token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
             self.add_token(*pos, token_type=token_type)
             
     def create_final_section(self):
@@ -188,7 +189,7 @@ class Level3(BaseLevel):
             # Use as many guaranteed positions as needed
             for i in range(min(tokens_needed, len(guaranteed_positions))):
                 pos = guaranteed_positions[i]
-                token_type = self.token_types[random.randint(0, len(self.token_types)-1)]
+                token_type = self.token_types[layout_random.randint(0, len(self.token_types)-1)]
                 self.add_token(pos[0], pos[1], token_type=token_type)
                 
         elif current_token_count > required_tokens:
@@ -199,10 +200,9 @@ class Level3(BaseLevel):
             # Remove random tokens until we have exactly the required number
             for _ in range(excess):
                 if tokens_list:
-                    token = random.choice(tokens_list)
+                    token = layout_random.choice(tokens_list)
                     tokens_list.remove(token)
-                    self.tokens.remove(token)
-                    self.game.space.remove(token.shape, token.body)
+                    self.remove_token(token)
                     
         # Verify token count again
         final_count = len(self.tokens)
@@ -253,21 +253,21 @@ class Level3(BaseLevel):
         player_y = self.game.player.rect.centery
         
         # Determine spawn location - sometimes ahead, sometimes to the sides
-        spawn_type = random.choice(["ahead", "side", "above"])
+        spawn_type = gameplay_random.choice(["ahead", "side", "above"])
         
         if spawn_type == "ahead":
             # Spawn ahead of player in movement direction
             direction = 1 if self.game.player.vel.x >= 0 else -1
-            spawn_offset_x = direction * random.randint(200, 400)
-            spawn_offset_y = random.randint(-100, 100)
+            spawn_offset_x = direction * gameplay_random.randint(200, 400)
+            spawn_offset_y = gameplay_random.randint(-100, 100)
         elif spawn_type == "side":
             # Spawn to the side of player
-            spawn_offset_x = random.choice([-1, 1]) * random.randint(50, 150)
-            spawn_offset_y = random.randint(-50, 50)
+            spawn_offset_x = gameplay_random.choice([-1, 1]) * gameplay_random.randint(50, 150)
+            spawn_offset_y = gameplay_random.randint(-50, 50)
         else:  # "above"
             # Spawn above player
-            spawn_offset_x = random.randint(-100, 100)
-            spawn_offset_y = -random.randint(100, 200)
+            spawn_offset_x = gameplay_random.randint(-100, 100)
+            spawn_offset_y = -gameplay_random.randint(100, 200)
         
         # Calculate final spawn position
         spawn_x = player_x + spawn_offset_x
@@ -279,8 +279,8 @@ class Level3(BaseLevel):
         
         # Create lightning with random properties
         lightning_width = LIGHTNING_WIDTH
-        lightning_height = random.randint(150, 300)
-        lightning_angle = random.randint(0, 180)
+        lightning_height = gameplay_random.randint(150, 300)
+        lightning_angle = gameplay_random.randint(0, 180)
         
         # Create lightning object
         lightning = Lightning(
@@ -329,12 +329,12 @@ class Level3(BaseLevel):
             self.start_death_animation("crash")
             
             # Override death text for crash
-            self.death_text = self.death_font.render("Crashed to Debt!", True, LIGHTNING_COLOR)
+            self.death_text = Text.render(self.death_font, "Crashed to Debt!", LIGHTNING_COLOR)
             
             # Create electrocution particle system if needed
             if not hasattr(self, 'electrocution_particles'):
                 from src.ui import ParticleSystem
-                self.electrocution_particles = ParticleSystem("lightning", 100)  # Use a reasonable default value
+                self.electrocution_particles = ParticleSystem("lightning", ELECTROCUTION_PARTICLE_CAPACITY)
                 
             # Initial burst of particles
             if hasattr(self, 'electrocution_particles'):
@@ -364,14 +364,11 @@ class Level3(BaseLevel):
             if self.death_animation_time < 1.2:
                 # Character shaking/vibration effect
                 if hasattr(self, 'shake_amount') and hasattr(self, 'original_player_pos'):
-                    shake_x = random.randint(-self.shake_amount, self.shake_amount)
-                    shake_y = random.randint(-self.shake_amount, self.shake_amount)
+                    shake_x = effects_random.randint(-self.shake_amount, self.shake_amount)
+                    shake_y = effects_random.randint(-self.shake_amount, self.shake_amount)
                     
-                    # Apply shake to player sprite if possible
-                    if hasattr(self.game, 'player') and hasattr(self.game.player, 'rect'):
-                        original_x, original_y = self.original_player_pos
-                        self.game.player.rect.centerx = original_x + shake_x
-                        self.game.player.rect.centery = original_y + shake_y
+                    # Draw the player shaking where it was hit (its rect stays with the physics body)
+                    self.set_player_shake(shake_x, shake_y)
                 
                 # Phase transitions
                 if self.death_animation_time > 0.3 and self.electrocution_phase == 0:
@@ -423,15 +420,14 @@ class Level3(BaseLevel):
                                 color=LIGHTNING_COLOR
                             )
                     
-                    # Reset player position to center for the explosion
-                    if hasattr(self.game, 'player') and hasattr(self.game.player, 'rect'):
-                        original_x, original_y = self.original_player_pos
-                        self.game.player.rect.centerx = original_x
-                        self.game.player.rect.centery = original_y
+                    # Draw the player back at the center for the explosion
+                    self.set_player_shake(0, 0)
             
             # After animation completes
-            elif self.death_animation_time > 2.0:  # Longer pause before restart
-                self.game.restart_level()
+            else:
+                self.game.player.shake_offset = (0, 0)
+                if self.death_animation_time > 2.0:  # Longer pause before restart
+                    self.game.restart_level()
         else:
             # Standard death animation for falling
             super().update_death_animation()
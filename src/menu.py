@@ -1,8 +1,13 @@
 import pygame as pg
-import random
 import math
+import random
+import numpy as np
 from src.settings import *
 from src.ui import Button, Panel, FadeEffect, AnimatedText, ParticleSystem
+from src.rng import RandomStreams
+from src.text import Text
+
+effects_random = RandomStreams.get("effects")
 
 class Menu:
     """Base class for game menus"""
@@ -74,9 +79,9 @@ class Menu:
         self.particle_system.update(dt)
         
         # Spawn new particles occasionally
-        if random.random() < 0.05:
-            x = random.randint(0, WIDTH)
-            y = random.randint(0, HEIGHT)
+        if effects_random.random() < 0.05:
+            x = effects_random.randint(0, WIDTH)
+            y = effects_random.randint(0, HEIGHT)
             self.particle_system.spawn_particles((x, y), 1)
             
         # Update the floating X particles for StartMenu
@@ -101,8 +106,8 @@ class Menu:
                 x_particle['rotation'] += x_particle['rot_speed']
                 
                 # Randomly change direction occasionally
-                if random.random() < 0.005:
-                    x_particle['angle'] = random.uniform(0, 2 * math.pi)
+                if effects_random.random() < 0.005:
+                    x_particle['angle'] = effects_random.uniform(0, 2 * math.pi)
             
     def draw(self, surface):
         """Draw the menu on the given surface"""
@@ -132,18 +137,21 @@ class Menu:
         
 class StartMenu(Menu):
     """Main menu shown at game start"""
+    wave_variants = None  # Wave offset -> baked background, built on first draw
+    wave_columns = None   # Per-column phase of the wave
+    x_sprites = {}        # (size, rotation step) -> rotated floating X
     def __init__(self, game):
         super().__init__(game)
         
         # Create custom font instead of system font for better appearance
         try:
             # Try to load a custom font if available
-            self.title_font = pg.font.Font("assets/fonts/Azonix.otf", 84)
-            self.subtitle_font = pg.font.Font("assets/fonts/Azonix.otf", 36)
+            self.title_font = Text.font("assets/fonts/Azonix.otf", 84)
+            self.subtitle_font = Text.font("assets/fonts/Azonix.otf", 36)
         except:
             # Fall back to system font if custom font fails to load
-            self.title_font = pg.font.SysFont("Arial", 84)
-            self.subtitle_font = pg.font.SysFont("Arial", 36)
+            self.title_font = Text.font("Arial", 84)
+            self.subtitle_font = Text.font("Arial", 36)
         
         # Create animated title with more vertical space
         self.title_text = AnimatedText(
@@ -230,13 +238,13 @@ class StartMenu(Menu):
         self.floating_xs = []
         for _ in range(15):  # Create 15 floating X marks
             self.floating_xs.append({
-                'x': random.randint(0, WIDTH),
-                'y': random.randint(0, HEIGHT),
-                'size': random.randint(8, 25),
-                'speed': random.uniform(0.3, 1.2),
-                'angle': random.uniform(0, 2 * math.pi),
-                'rotation': random.uniform(0, 360),
-                'rot_speed': random.uniform(-1, 1)
+                'x': effects_random.randint(0, WIDTH),
+                'y': effects_random.randint(0, HEIGHT),
+                'size': effects_random.randint(8, 25),
+                'speed': effects_random.uniform(0.3, 1.2),
+                'angle': effects_random.uniform(0, 2 * math.pi),
+                'rotation': effects_random.uniform(0, 360),
+                'rot_speed': effects_random.uniform(-1, 1)
             })
         
         # Create character previews for menu animation
@@ -245,8 +253,8 @@ class StartMenu(Menu):
         
         # Spawn initial particles
         for _ in range(30):
-            x = random.randint(0, WIDTH)
-            y = random.randint(0, HEIGHT)
+            x = effects_random.randint(0, WIDTH)
+            y = effects_random.randint(0, HEIGHT)
             self.particle_system.spawn_particles((x, y), 1)
             
     def activate(self):
@@ -266,99 +274,97 @@ class StartMenu(Menu):
             spread=100
         )
         
-    def draw_background(self, surface):
-        """Draw the start menu background"""
-        # Fill with dark background
-        surface.fill(BLACK)
-        
-        # Draw grid of subtle X marks
+    @classmethod
+    def build_background(cls):
+        """Draw the X-mark grid once and bake one opaque copy of it per wave offset"""
         spacing = 80
         size = 15
         alpha = 40  # Very transparent
-        
+        pattern_random = random.Random(MENU_PATTERN_SEED)  # Same jitter every run
+
         # Create a surface for the X patterns
         pattern_surface = pg.Surface((WIDTH, HEIGHT), pg.SRCALPHA)
-        
+        pattern_surface.fill((0, 0, 0, 0))
         for x in range(0, WIDTH + spacing, spacing):
             for y in range(0, HEIGHT + spacing, spacing):
                 # Add some randomness to positions
-                x_pos = x + random.randint(-10, 10)
-                y_pos = y + random.randint(-10, 10)
-                
+                x_pos = x + pattern_random.randint(-10, 10)
+                y_pos = y + pattern_random.randint(-10, 10)
+
                 # Draw X mark
-                pg.draw.line(
-                    pattern_surface, 
-                    (*DARK_TEAL, alpha), 
-                    (x_pos - size // 2, y_pos - size // 2), 
-                    (x_pos + size // 2, y_pos + size // 2), 
-                    2
-                )
-                pg.draw.line(
-                    pattern_surface, 
-                    (*DARK_TEAL, alpha), 
-                    (x_pos - size // 2, y_pos + size // 2), 
-                    (x_pos + size // 2, y_pos - size // 2), 
-                    2
-                )
-                
-        # Apply a subtle wave effect to the pattern
+                pg.draw.line(pattern_surface, (*DARK_TEAL, alpha),
+                             (x_pos - size // 2, y_pos - size // 2), (x_pos + size // 2, y_pos + size // 2), 2)
+                pg.draw.line(pattern_surface, (*DARK_TEAL, alpha),
+                             (x_pos - size // 2, y_pos + size // 2), (x_pos + size // 2, y_pos - size // 2), 2)
+        pattern_alpha = pg.surfarray.array_alpha(pattern_surface).astype(np.float32) / 255
+        pattern_color = (pattern_alpha > 0).astype(np.float32)  # Fraction of DARK_TEAL; clear pixels are black
+
+        # The wave alpha-blends each column over itself shifted by its offset, so every
+        # column only ever looks like one of these few variants. They are kept as 8-bit
+        # surfaces whose palette maps the brightness over the black fill onto DARK_TEAL.
+        palette = [tuple(int(c * i / 255) for c in DARK_TEAL) for i in range(256)]
+        cls.wave_variants = {}
+        for offset in range(-MENU_WAVE_AMPLITUDE, MENU_WAVE_AMPLITUDE + 1):
+            blended_alpha = pattern_alpha.copy()
+            blended_color = pattern_color.copy()
+            if offset:
+                src = slice(0, -offset) if offset > 0 else slice(-offset, None)
+                dst = slice(offset, None) if offset > 0 else slice(0, offset)
+                src_alpha = pattern_alpha[:, src]
+                blended_color[:, dst] = pattern_color[:, src] * src_alpha + pattern_color[:, dst] * (1 - src_alpha)
+                blended_alpha[:, dst] = src_alpha + pattern_alpha[:, dst] * (1 - src_alpha)
+            variant = pg.Surface((WIDTH, HEIGHT), 0, 8)
+            variant.set_palette(palette)
+            pg.surfarray.blit_array(variant, (blended_color * blended_alpha * 255 + 0.5).astype(np.uint8))
+            cls.wave_variants[offset] = variant
+        cls.wave_columns = np.arange(WIDTH) / 100
+
+    @classmethod
+    def get_x_sprite(cls, size, rotation):
+        """Floating X of a size, rotated to the nearest cached step"""
+        step = int(round(rotation / 360 * MENU_X_ROTATION_STEPS)) % MENU_X_ROTATION_STEPS
+        key = (size, step)
+        sprite = cls.x_sprites.get(key)
+        if sprite is None:
+            # Create a surface for the X
+            x_surface = pg.Surface((size * 2, size * 2), pg.SRCALPHA)
+
+            # Draw X mark
+            line_width = max(1, int(size / 8))
+            pg.draw.line(x_surface, (*TEAL, 180), (0, 0), (size * 2, size * 2), line_width)  # Semi-transparent teal
+            pg.draw.line(x_surface, (*TEAL, 180), (0, size * 2), (size * 2, 0), line_width)
+
+            sprite = pg.transform.rotate(x_surface, step * 360 / MENU_X_ROTATION_STEPS)
+            cls.x_sprites[key] = sprite
+        return sprite
+
+    def draw_background(self, surface):
+        """Draw the start menu background"""
+        if StartMenu.wave_variants is None:
+            StartMenu.build_background()
+
+        # Apply a subtle wave effect to the pattern: neighbouring columns share an
+        # offset, so each run of them is one blit from the matching baked variant.
+        # The variants are opaque, which also replaces filling the screen black.
         time = pg.time.get_ticks() / 1000
-        for x in range(WIDTH):
-            # Create a subtle sine wave effect
-            offset = int(math.sin(time + x / 100) * 5)
-            # Only shift columns where offset is not 0
-            if offset != 0:
-                # Create a vertical slice of the pattern
-                slice_rect = pg.Rect(x, 0, 1, HEIGHT)
-                slice_surface = pattern_surface.subsurface(slice_rect).copy()
-                # Shift the slice
-                pattern_surface.blit(
-                    slice_surface, 
-                    (x, offset), 
-                    special_flags=pg.BLEND_ALPHA_SDL2
-                )
-                
-        # Draw the pattern to the screen
-        surface.blit(pattern_surface, (0, 0))
-        
+        offsets = (np.sin(time + self.wave_columns) * MENU_WAVE_AMPLITUDE).astype(np.int32)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(offsets)) + 1)).tolist()
+        ends = starts[1:] + [WIDTH]
+        surface.blits([(self.wave_variants[offsets[start]], (start, 0), (start, 0, end - start, HEIGHT))
+                       for start, end in zip(starts, ends)], doreturn=False)
+
         # Draw interactive floating X particles
         if hasattr(self, 'floating_xs'):
             for x_particle in self.floating_xs:
-                size = x_particle['size']
-                x = x_particle['x']
-                y = x_particle['y']
-                rotation = x_particle['rotation']
-                
-                # Create a surface for the X
-                x_surface = pg.Surface((size * 2, size * 2), pg.SRCALPHA)
-                
-                # Draw X mark
-                line_width = max(1, int(size / 8))
-                pg.draw.line(
-                    x_surface,
-                    (*TEAL, 180),  # Semi-transparent teal
-                    (0, 0),
-                    (size * 2, size * 2),
-                    line_width
-                )
-                pg.draw.line(
-                    x_surface,
-                    (*TEAL, 180),  # Semi-transparent teal
-                    (0, size * 2),
-                    (size * 2, 0),
-                    line_width
-                )
-                
-                # Rotate the X
-                rotated_surface = pg.transform.rotate(x_surface, rotation)
-                
+                rotated_surface = self.get_x_sprite(x_particle['size'], x_particle['rotation'])
+
                 # Calculate position to center the rotated surface
-                pos_x = x - rotated_surface.get_width() // 2
-                pos_y = y - rotated_surface.get_height() // 2
-                
+                pos_x = x_particle['x'] - rotated_surface.get_width() // 2
+                pos_y = x_particle['y'] - rotated_surface.get_height() // 2
+
                 # Draw the X
                 surface.blit(rotated_surface, (pos_x, pos_y))
-        
+
         # Draw character previews if available
         if self.prisoner_preview:
             # Draw prisoner on left side
@@ -385,7 +391,7 @@ class PauseMenu(Menu):
         self.panel = Panel(panel_x, panel_y, panel_width, panel_height)
         
         # Title
-        self.title_font = pg.font.SysFont(None, 72)
+        self.title_font = Text.font(None, 72)
         self.title_text = AnimatedText(
             "PAUSED", 
             self.title_font, 
@@ -469,7 +475,7 @@ class ControlsScreen(Menu):
         self.panel = Panel(panel_x, panel_y, panel_width, panel_height)
         
         # Title
-        self.title_font = pg.font.SysFont(None, 64)
+        self.title_font = Text.font(None, 64)
         self.title_text = AnimatedText(
             "Controls", 
             self.title_font, 
@@ -481,7 +487,7 @@ class ControlsScreen(Menu):
         self.animated_elements.append(self.title_text)
         
         # Controls content
-        self.content_font = pg.font.SysFont(None, 32)
+        self.content_font = Text.font(None, 32)
         self.controls = [
             ("ARROWS / WASD", "Move character"),
             ("SPACE", "Jump"),
@@ -516,12 +522,12 @@ class ControlsScreen(Menu):
         start_y = HEIGHT // 2 - len(self.controls) * 20
         for i, (key, action) in enumerate(self.controls):
             # Key text
-            key_text = self.content_font.render(key, True, WHITE)
+            key_text = Text.render(self.content_font, key, WHITE)
             key_rect = key_text.get_rect(right=WIDTH // 2 - 20, centery=start_y + i * 50)
             surface.blit(key_text, key_rect)
             
             # Action text
-            action_text = self.content_font.render(action, True, LIGHT_TEAL)
+            action_text = Text.render(self.content_font, action, LIGHT_TEAL)
             action_rect = action_text.get_rect(left=WIDTH // 2 + 20, centery=start_y + i * 50)
             surface.blit(action_text, action_rect)
             
@@ -547,7 +553,7 @@ class LevelSelectScreen(Menu):
         self.panel = Panel(panel_x, panel_y, panel_width, panel_height)
         
         # Title
-        self.title_font = pg.font.SysFont(None, 64)
+        self.title_font = Text.font(None, 64)
         self.title_text = AnimatedText(
             "Select Level", 
             self.title_font, 
@@ -603,7 +609,7 @@ class LevelSelectScreen(Menu):
         )
         
         # Info font
-        self.info_font = pg.font.SysFont(None, 32)
+        self.info_font = Text.font(None, 32)
         self.selected_level = game.level_num
         
         # Back button
@@ -646,7 +652,7 @@ class LevelSelectScreen(Menu):
         for thumbnail, x, y in self.thumbnails:
             # Adjust mouse position for thumbnail coordinates
             relative_pos = (mouse_pos[0] - x, mouse_pos[1] - y)
-            level_num = thumbnail.update(relative_pos, mouse_clicked, self.game.dt)
+            level_num = thumbnail.update(relative_pos, mouse_clicked, self.game.frame_dt)
             
             if level_num:
                 # Level was selected
@@ -686,7 +692,7 @@ class LevelSelectScreen(Menu):
         level_info = f"Level {self.selected_level}: "
         level_info += "Prison Escape" if self.selected_level == 1 else "Financial District"
         
-        info_text = self.info_font.render(level_info, True, TEAL)
+        info_text = Text.render(self.info_font, level_info, TEAL)
         info_rect = info_text.get_rect(center=(
             self.info_area.centerx,
             self.info_area.y + 30
@@ -702,7 +708,7 @@ class LevelSelectScreen(Menu):
         else:
             description = "Avoid the market crashes and survive the volatile economy to reach true wealth!"
             
-        desc_text = self.info_font.render(description, True, LIGHT_TEAL)
+        desc_text = Text.render(self.info_font, description, LIGHT_TEAL)
         desc_rect = desc_text.get_rect(center=(
             self.info_area.centerx,
             self.info_area.y + 70
@@ -722,7 +728,7 @@ class CreditsScreen(Menu):
         self.panel = Panel(panel_x, panel_y, panel_width, panel_height)
         
         # Title
-        self.title_font = pg.font.SysFont(None, 64)
+        self.title_font = Text.font(None, 64)
         self.title_text = AnimatedText(
             "Credits", 
             self.title_font, 
@@ -734,7 +740,7 @@ class CreditsScreen(Menu):
         self.animated_elements.append(self.title_text)
         
         # Credits content
-        self.content_font = pg.font.SysFont(None, 32)
+        self.content_font = Text.font(None, 32)
         self.credits = [
             ("Game Concept", "SUPERSEED: The Debt Escape"),
             ("Character Design", "Teal Frog - Prisoner & Wizard Forms"),
@@ -776,27 +782,27 @@ class CreditsScreen(Menu):
         
         for i, (role, credit) in enumerate(self.credits):
             # Role text - align right side to panel center with margin
-            role_text = self.content_font.render(role, True, WHITE)
+            role_text = Text.render(self.content_font, role, WHITE)
             role_rect = role_text.get_rect(right=panel_center_x - 15, top=start_y + i * line_height)
             
             # Make sure text doesn't exceed panel bounds
             if role_rect.left < panel_content_x:
                 # Text is too wide, reduce font size
-                smaller_font = pg.font.SysFont(None, 28)  # Smaller font
-                role_text = smaller_font.render(role, True, WHITE)
+                smaller_font = Text.font(None, 28)  # Smaller font
+                role_text = Text.render(smaller_font, role, WHITE)
                 role_rect = role_text.get_rect(right=panel_center_x - 15, top=start_y + i * line_height)
             
             surface.blit(role_text, role_rect)
             
             # Credit text - align left side to panel center with margin
-            credit_text = self.content_font.render(credit, True, LIGHT_TEAL)
+            credit_text = Text.render(self.content_font, credit, LIGHT_TEAL)
             credit_rect = credit_text.get_rect(left=panel_center_x + 15, top=start_y + i * line_height)
             
             # Make sure text doesn't exceed panel bounds
             if credit_rect.right > panel_content_x + panel_content_width:
                 # Text is too wide, reduce font size
-                smaller_font = pg.font.SysFont(None, 26)  # Even smaller font
-                credit_text = smaller_font.render(credit, True, LIGHT_TEAL)
+                smaller_font = Text.font(None, 26)  # Even smaller font
+                credit_text = Text.render(smaller_font, credit, LIGHT_TEAL)
                 credit_rect = credit_text.get_rect(left=panel_center_x + 15, top=start_y + i * line_height)
             
             surface.blit(credit_text, credit_rect)
@@ -0,0 +1,48 @@
+import threading
+from src.settings import *
+from src.levels import get_level
+from src.static_layer import StaticLayer
+from src.entities.player import Player
+from src.sprites import EnhancedBackground
+from src.rng import RandomStreams
+
+class LevelPrebuild:
+    """Builds a level, its player and background on a worker thread, detached from the physics space
+
+    Most of the work is surface generation in pygame, which releases the GIL, so the
+    game loop keeps running while it happens. The build draws from its own level
+    streams, and the level starts from where they ended (see Game.attach_prebuild),
+    as it would after building on the main thread.
+    """
+    def __init__(self, game, level_num):
+        self.game = game
+        self.level_num = level_num
+        self.level = None
+        self.static_layer = None
+        self.player = None
+        self.background = None
+        self.random_state = None  # Level streams as the build left them
+        self.error = None
+        self.thread = threading.Thread(target=self.build, name=f"prebuild-level-{level_num}", daemon=True)
+        self.thread.start()
+
+    @property
+    def done(self):
+        return not self.thread.is_alive()
+
+    def build(self):
+        try:
+            streams = RandomStreams.building(self.level_num)
+            self.level = get_level(self.game, self.level_num, detached=True)
+            self.static_layer = StaticLayer(self.level.platforms)
+            self.player = Player(self.game, self.level.start_x, self.level.start_y)
+            level_type = LEVEL_BACKGROUNDS.get(self.level_num, "prison")
+            self.background = EnhancedBackground(self.game, level_type)
+            EnhancedBackground.get_gradient(level_type)  # Rendered on first draw otherwise
+            self.random_state = RandomStreams.level_state(streams)
+        except Exception as e:
+            self.error = e
+
+    def wait(self):
+        """Block until the worker thread has finished"""
+        self.thread.join()
@@ -0,0 +1,129 @@
+import time
+import numpy as np
+import pygame as pg
+from src.settings import *
+from src.text import Text
+
+class FrameProfiler:
+    """Times each phase of a frame into a ring buffer and draws rolling stats over the game"""
+    phases = ("events", "update", "physics", "sprites", "level", "background",
+              "level_draw", "particles", "hud", "post", "overlay", "flip")
+
+    def __init__(self, history=PROFILER_HISTORY):
+        self.enabled = False
+        self.history = history
+        self.phase_index = {name: i for i, name in enumerate(self.phases)}
+
+        # One row per frame: milliseconds per phase, then the whole frame in the last column
+        self.samples = np.zeros((history, len(self.phases) + 1), dtype=np.float32)
+        self.current = np.zeros(len(self.phases) + 1, dtype=np.float32)
+        self.index = 0   # Next row to write
+        self.count = 0   # Rows filled so far
+        self.frame_start = 0
+        self.last_mark = 0
+        self.font = None
+        self.table = None     # Rendered stats table, refreshed every few frames
+        self.table_age = 0
+
+    def toggle(self, enabled):
+        """Turn profiling on or off, dropping stale samples when it is turned on"""
+        if enabled and not self.enabled:
+            self.count = 0
+            self.index = 0
+            self.table = None
+            # Toggling happens mid-frame, so start timing the rest of this frame now
+            self.current[:] = 0
+            self.frame_start = self.last_mark = time.perf_counter()
+        self.enabled = enabled
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current[:] = 0
+        self.frame_start = self.last_mark = time.perf_counter()
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to a phase (phases may repeat within a frame)"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current[self.phase_index[phase]] += (now - self.last_mark) * 1000
+        self.last_mark = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.current[-1] = (time.perf_counter() - self.frame_start) * 1000
+        self.samples[self.index] = self.current
+        self.index = (self.index + 1) % self.history
+        self.count = min(self.count + 1, self.history)
+
+    def stats(self):
+        """p50, p95 and max in milliseconds per phase (and the whole frame last), over the buffer"""
+        valid = self.samples[:self.count]
+        return np.percentile(valid, 50, axis=0), np.percentile(valid, 95, axis=0), valid.max(axis=0)
+
+    def frame_times(self):
+        """Whole-frame times in milliseconds, oldest first"""
+        if self.count < self.history:
+            return self.samples[:self.count, -1]
+        return np.roll(self.samples[:, -1], -self.index)
+
+    def render_table(self):
+        """Render the p50/p95/max table for every phase"""
+        if self.font is None:
+            self.font = Text.font(None, 20)
+
+        p50, p95, peak = self.stats()
+        line_height = 16
+        names = self.phases + ("frame",)
+        table = pg.Surface((PROFILER_GRAPH_WIDTH, (len(names) + 1) * line_height + 4), pg.SRCALPHA)
+
+        # The numbers change constantly, so they bypass the shared text cache
+        columns = (0, 90, 145, 200)
+        for col, title in zip(columns, ("phase (ms)", "p50", "p95", "max")):
+            table.blit(self.font.render(title, True, LIGHT_TEAL), (6 + col, 4))
+        for row, name in enumerate(names):
+            row_y = 4 + (row + 1) * line_height
+            color = GOLD if name == "frame" else WHITE
+            values = (name, f"{p50[row]:.2f}", f"{p95[row]:.2f}", f"{peak[row]:.2f}")
+            for col, text in zip(columns, values):
+                table.blit(self.font.render(text, True, color), (6 + col, row_y))
+        return table
+
+    def draw(self, surface):
+        """Draw the stats table and frame-time graph"""
+        if not self.enabled or self.count == 0:
+            return
+
+        # Text rendering dominates the overlay's cost, so the table only refreshes periodically
+        self.table_age += 1
+        if self.table is None or self.table_age >= PROFILER_TABLE_INTERVAL:
+            self.table = self.render_table()
+            self.table_age = 0
+
+        width = PROFILER_GRAPH_WIDTH
+        height = self.table.get_height() + PROFILER_GRAPH_HEIGHT + 8
+        x = WIDTH - width - 10
+        y = 50
+
+        panel = pg.Surface((width, height), pg.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        panel.blit(self.table, (0, 0))
+
+        # Frame-time graph, scaled so the 60 FPS budget sits halfway up
+        graph_top = height - PROFILER_GRAPH_HEIGHT - 4
+        budget = 1000 / FPS
+        scale = PROFILER_GRAPH_HEIGHT / (budget * 2)
+        times = self.frame_times()
+        bar_width = width / self.history
+        for i, value in enumerate(times.tolist()):
+            bar_height = min(PROFILER_GRAPH_HEIGHT, value * scale)
+            color = TEAL if value <= budget else (255, 80, 80)
+            pg.draw.line(panel, color,
+                         (int(i * bar_width), graph_top + PROFILER_GRAPH_HEIGHT),
+                         (int(i * bar_width), graph_top + PROFILER_GRAPH_HEIGHT - bar_height))
+        budget_y = graph_top + PROFILER_GRAPH_HEIGHT - budget * scale
+        pg.draw.line(panel, GOLD, (0, budget_y), (width, budget_y))
+
+        surface.blit(panel, (x, y))
@@ -0,0 +1,61 @@
+import numpy as np
+from src.settings import *
+from src.sprites import SuperseedToken, EnhancedBackground
+from src.effects import ParallaxBackground
+from src.ui import ParticleSystem
+
+class QualityGovernor:
+    """Steps visual quality tiers down when frames run over budget and back up when there is headroom"""
+    def __init__(self, adaptive=ADAPTIVE_PERFORMANCE):
+        self.adaptive = adaptive
+        self.frame_times = np.zeros(QUALITY_WINDOW, dtype=np.float32)  # Ring buffer of frame work times (ms)
+        self.index = 0
+        self.count = 0
+        self.good_windows = 0  # Consecutive windows with enough headroom to step back up
+        self.tier = len(QUALITY_TIERS) - 1
+        self.apply_tier()
+
+    @property
+    def vignette(self):
+        return QUALITY_TIERS[self.tier]["vignette"]
+
+    def apply_tier(self):
+        """Push the current tier's limits to the systems that read them"""
+        tier = QUALITY_TIERS[self.tier]
+        # PARTICLE_QUALITY caps particles even on the highest tier
+        ParticleSystem.quality_scale = min(tier["particles"], QUALITY_TIERS[PARTICLE_QUALITY]["particles"])
+        SuperseedToken.glow_enabled = tier["token_glow"]
+        EnhancedBackground.lightning_enabled = tier["background_lightning"]
+        ParallaxBackground.max_layers = tier["parallax_layers"]
+
+    def set_tier(self, tier):
+        self.tier = max(0, min(len(QUALITY_TIERS) - 1, tier))
+        self.apply_tier()
+
+        # Judge the new tier on fresh measurements only
+        self.count = 0
+        self.index = 0
+        self.good_windows = 0
+
+    def record_frame(self, frame_ms):
+        """Add the work time of a gameplay frame and re-evaluate once a full window is measured"""
+        if not self.adaptive:
+            return
+        self.frame_times[self.index] = frame_ms
+        self.index = (self.index + 1) % QUALITY_WINDOW
+        self.count += 1
+        if self.count < QUALITY_WINDOW:
+            return
+        self.count = 0
+
+        # A slow 90th percentile means frames are being dropped, so react right away;
+        # stepping back up needs several calm windows in a row (hysteresis)
+        slow = np.percentile(self.frame_times, 90)
+        if slow > QUALITY_DOWNGRADE_MS and self.tier > 0:
+            self.set_tier(self.tier - 1)
+        elif slow < QUALITY_UPGRADE_MS and self.tier < len(QUALITY_TIERS) - 1:
+            self.good_windows += 1
+            if self.good_windows >= QUALITY_UPGRADE_WINDOWS:
+                self.set_tier(self.tier + 1)
+        else:
+            self.good_windows = 0
@@ -0,0 +1,109 @@
+import random
+import hashlib
+import threading
+from src.settings import *
+
+# Named random streams derived from one session seed. Each subsystem draws from
+# its own stream, so purely visual randomness can never shift the numbers that
+# level layout or gameplay see:
+#   "layout"    level construction (token types, stepping stones, token pruning)
+#   "gameplay"  randomness that changes the simulation (lightning spawns)
+#   "art"       procedural level art (platform colors, building decorations)
+#   "effects"   visual-only runtime randomness (camera shake, flashes, menu decor)
+#   "particles" particle spawns
+#   "audio"     sound variations
+# The art streams (including the "parallax" and "thumbnail" streams made by
+# fresh) follow ART_SEED instead when it is set, so baked art stays valid
+# across sessions.
+
+class StreamHandle:
+    """What modules hold for a stream: the calling thread's stream of that name (see RandomStreams.building)"""
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, attr):
+        return getattr(RandomStreams.stream(self.name), attr)
+
+class RandomStreams:
+    """Registry of random.Random streams seeded from the session seed"""
+    seed = None
+    streams = {}  # name -> random.Random, created on first use and never replaced
+    handles = {}  # name -> StreamHandle
+    local = threading.local()  # .streams: level streams of a build running on this thread
+    level_streams = ("layout", "gameplay", "art")  # Restarted from the seed by begin_level
+    art_streams = ("art", "parallax", "thumbnail")   # Seeded from ART_SEED when it is set
+
+    @classmethod
+    def set_seed(cls, seed=None):
+        """Start a new session (a random seed is picked if none is given) and return the seed"""
+        if seed is None:
+            seed = random.SystemRandom().randrange(1 << 32)
+        cls.seed = seed
+        
+        # Streams are reseeded in place (modules hold handles, which stay valid either way)
+        for name, stream in cls.streams.items():
+            stream.seed(cls.derive_seed(name))
+        return seed
+
+    @classmethod
+    def derive_seed(cls, *key):
+        """Stable integer seed for a key, independent of Python's hash randomization"""
+        if key and key[0] in cls.art_streams and ART_SEED is not None:
+            seed = ART_SEED
+        else:
+            if cls.seed is None:
+                cls.set_seed()
+            seed = cls.seed
+        digest = hashlib.blake2b(repr((seed,) + key).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    @classmethod
+    def get(cls, name):
+        """Handle on the stream for a subsystem, for modules to keep"""
+        handle = cls.handles.get(name)
+        if handle is None:
+            handle = cls.handles[name] = StreamHandle(name)
+        return handle
+
+    @classmethod
+    def stream(cls, name):
+        """The stream a subsystem draws from on this thread"""
+        building = getattr(cls.local, "streams", None)
+        if building and name in building:
+            return building[name]
+        stream = cls.streams.get(name)
+        if stream is None:
+            stream = cls.streams[name] = random.Random(cls.derive_seed(name))
+        return stream
+
+    @classmethod
+    def fresh(cls, name, *key):
+        """A new stream that always starts the same for this seed and key (for cacheable art)"""
+        return random.Random(cls.derive_seed(name, *key))
+
+    @classmethod
+    def begin_level(cls, level_num):
+        """Restart the level streams so a level builds and plays out the same on every attempt"""
+        for name in cls.level_streams:
+            cls.stream(name).seed(cls.derive_seed(name, level_num))
+
+    @classmethod
+    def building(cls, level_num):
+        """Give this thread its own level streams, started as begin_level would, for a level build
+        that runs while another level is still playing on the shared ones; returns them"""
+        cls.local.streams = {name: random.Random(cls.derive_seed(name, level_num)) for name in cls.level_streams}
+        return cls.local.streams
+
+    @classmethod
+    def level_state(cls, streams=None):
+        """Positions of the level streams (or of a build's), to resume a level from where it started"""
+        if streams is None:
+            streams = {name: cls.stream(name) for name in cls.level_streams}
+        return {name: stream.getstate() for name, stream in streams.items()}
+
+    @classmethod
+    def restore_level_state(cls, state):
+        for name, stream_state in state.items():
+            cls.stream(name).setstate(stream_state)
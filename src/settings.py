@@ -3,6 +3,9 @@ TITLE = "SUPERSEED: The Debt Escape"
 WIDTH = 1280
 HEIGHT = 720
 FPS = 60
+SIM_DT = 1 / FPS     # Fixed gameplay/physics timestep
+MAX_SUBSTEPS = 5     # Max fixed steps per rendered frame before the simulation slows down
+RENDER_FPS = 144     # Frame rate cap for rendering (interpolated between fixed steps)
 GRAVITY = 1500
 
 # Graphics & Visual Quality Settings
@@ -11,6 +14,36 @@ ADAPTIVE_PERFORMANCE = True     # Automatically adjust visual effects based on f
 SHADOW_QUALITY = 2              # 0=Off, 1=Basic, 2=Advanced
 PARTICLE_QUALITY = 2            # 0=Low, 1=Medium, 2=High
 USE_ANTIALIASING = True         # Smoother edges and animations
+VIGNETTE_STRENGTH = 60          # Max alpha of the darkened screen edges
+
+# Quality tiers stepped through by the adaptive governor (lowest first)
+QUALITY_TIERS = [
+    {"particles": 0.25, "token_glow": False, "background_lightning": False, "vignette": False, "parallax_layers": 1},
+    {"particles": 0.5, "token_glow": True, "background_lightning": False, "vignette": True, "parallax_layers": 2},
+    {"particles": 1.0, "token_glow": True, "background_lightning": True, "vignette": True, "parallax_layers": 3},
+]
+QUALITY_WINDOW = 90                        # Frames measured before each quality decision
+QUALITY_DOWNGRADE_MS = 1000 / FPS * 0.9    # Step down when the 90th percentile frame takes longer than this
+QUALITY_UPGRADE_MS = 1000 / FPS * 0.5      # Step up only when it stays under this...
+QUALITY_UPGRADE_WINDOWS = 4                # ...for this many windows in a row
+
+# Asset cache (generated surfaces saved to disk between launches)
+ASSET_CACHE_ENABLED = True
+ASSET_CACHE_DIR = "cache"     # Relative to the game's directory, not the working directory
+ASSET_CACHE_VERSION = 2       # Bump when a baked generator changes; packs of other versions are deleted
+ASSET_CACHE_KEEP_LAUNCHES = 20  # Entries no launch has used in this many launches are dead...
+ASSET_CACHE_MAX_DEAD = 0.25     # ...and the pack is rewritten without dead entries once they make up this fraction of it
+ART_SEED = 0              # Seed of the procedural art streams, fixed so baked art is reused across launches (None follows the session seed, and that art is then not cached)
+
+# Surface finalization (finished art is put in the fastest format for blitting)
+SURFACE_RLE = True                 # RLE-encode finished screen-space alpha surfaces that are mostly fully transparent or opaque...
+SURFACE_RLE_MAX_TRANSLUCENT = 0.5  # ...that is, with at most this fraction of partly transparent pixels
+
+# Frame profiler overlay (toggled with the debug key)
+PROFILER_HISTORY = 240        # Frames kept in the timing ring buffer
+PROFILER_GRAPH_WIDTH = 260    # Overlay panel width in pixels
+PROFILER_GRAPH_HEIGHT = 60    # Frame-time graph height in pixels
+PROFILER_TABLE_INTERVAL = 15  # Frames between refreshes of the p50/p95/max table
 
 # Level 3 "Market Crash" Settings
 LIGHTNING_WARNING_TIME = 1.5  # Time in seconds for the warning before lightning strikes
@@ -25,6 +58,7 @@ STATE_MENU = 0
 STATE_PLAYING = 1
 STATE_PAUSED = 2
 STATE_GAMEOVER = 3
+STATE_TRANSITION = 4  # Fading between levels while the next one loads
 
 # Colors
 TEAL = (147, 208, 207)  # #93D0CF
@@ -57,6 +91,13 @@ BUTTON_HEIGHT = 50
 BUTTON_SPACING = 20
 MENU_PADDING = 40
 TRANSITION_DURATION = 0.5
+TEXT_CACHE_SIZE = 256     # Rendered text surfaces kept in the LRU cache
+HUD_BAR_HEIGHT = 40
+HUD_BAR_COLOR = (0, 0, 0, 150)
+MENU_FPS = 60             # Frame rate cap while a menu is showing (gameplay uses RENDER_FPS)
+MENU_PATTERN_SEED = 2809  # Fixed jitter of the start menu's X-mark grid
+MENU_WAVE_AMPLITUDE = 5   # Largest wave offset of the start menu background (px)
+MENU_X_ROTATION_STEPS = 120  # Cached rotations of each floating X in the start menu
 
 # Level Select Settings
 LEVEL_THUMBNAIL_WIDTH = 280
@@ -73,10 +114,24 @@ MENU_START_Y = HEIGHT // 2 - 50
 
 # Effects
 PARTICLE_COUNT = 100
+PARTICLE_DRAG = 0.95                  # Velocity multiplier applied to particles each update
+TOKEN_PARTICLE_CAPACITY = 1024        # Max live particles per system (arrays are preallocated)
+DEATH_PARTICLE_CAPACITY = 2048
+COMPLETION_PARTICLE_CAPACITY = 4096
+ELECTROCUTION_PARTICLE_CAPACITY = 2048
+PARTICLE_ALPHA_LEVELS = 8             # Pre-rendered particle stamps: alpha buckets
+PARTICLE_ROTATION_STEPS = 8           # Rotation buckets per 90 degrees (X marks)
+PARTICLE_COLOR_STEP = 8               # Particle colors are quantized to multiples of this (at most 4 off per channel)
+PARTICLE_COLOR_VARIATIONS = ((-16, 8, -8), (16, -8, 8), (-8, -16, 16), (8, 16, -16))  # Shades a spawn color is varied by
+PARTICLE_ATLAS_SIZE = 4096            # Particle stamps kept in the shared atlas, least recently used dropped first
+PARTICLE_LIGHTNING_VARIANTS = 4       # Distinct bolt shapes per lightning stamp size
 SHADOW_OFFSET_X = 5
 SHADOW_OFFSET_Y = 8
 SHADOW_BLUR = 3
+SHADOW_BLUR_PASSES = 3     # Box blur passes per axis (3 passes is close to a Gaussian)
 GLOW_INTENSITY = 0.6
+GLOW_FALLOFF_PEAK = 0.21   # Glow alpha (times intensity) right on an object's outline
+GLOW_FALLOFF_RADIUS = 5.0  # Distance in pixels at which the glow fades out
 PARALLAX_FACTOR = 0.4  # How much background layers move relative to foreground
 
 # Animation Settings
@@ -119,6 +174,9 @@ DOOR_OPEN_SPEED = 5         # Speed at which doors open
 # X token settings
 TOKEN_SIZE = 40
 TOKENS_TO_TRANSFORM = 10
+TOKEN_ROTATION_STEPS = 60   # Pre-rendered rotation frames per token type (6 degrees apart)
+TOKEN_PULSE_STEPS = 16      # Pre-rendered pulse scales per token type (about a pixel apart, so pulsing never visibly steps)
+TOKEN_PULSE_RANGE = 0.1     # Maximum pulse scale deviation from 1.0
 
 # Platform settings
 PLATFORM_SPEED = 100
@@ -129,10 +187,15 @@ PLATFORM_MOVEMENT_EASING = 0.2   # Smoothness of platform movement transitions (
 
 # Level settings
 TILE_SIZE = 64
+STATIC_TILE_SIZE = 512         # Size of the pre-composited static platform tiles
+SPATIAL_CELL_SIZE = 256        # Cell size of the level spatial hash grids
+VIEWPORT_MARGIN = 100          # Extra pixels beyond the screen edge that still count as visible
 LEVEL_RESPAWN_DELAY = 1.5      # Time delay before respawning after death
 LEVEL_EDGE_BUFFER = 50         # Distance from edge that triggers respawn if crossed
 LEVEL_CAMERA_SMOOTHING = 0.1   # Camera smoothing factor (0-1), 0=instant, 1=no movement
 LEVEL_DOOR_TOKENS_REQUIRED = 10 # Number of tokens needed to open the exit door
+LEVEL_BACKGROUNDS = {2: "financial", 3: "market_crash"}  # Background type per level (others use "prison")
+PREBUILD_NEXT_LEVEL = True     # Build the next level on a worker thread during the completion animation
 
 # Death/Respawn Animation Settings
 DEATH_SCREEN_FADE = 0.7        # Opacity of screen fade on death (0-1)
@@ -0,0 +1,104 @@
+import pygame as pg
+import pymunk
+from src.settings import *
+from src.effects import Animation
+from src.ui import ParticleSystem
+from src.rng import RandomStreams
+
+class ObjectSnapshot:
+    """Copy of an object's attributes (and physics body) that can be written back into the same object"""
+    owned_types = (Animation, ParticleSystem)  # Helpers whose state belongs to the object holding them
+    skipped = ("_Sprite__g",)  # Group membership is restored through the groups themselves
+
+    def __init__(self, obj):
+        self.obj = obj
+        self.state = {}
+        self.owned = []
+        for name, value in vars(obj).items():
+            if name in self.skipped:
+                continue
+            if isinstance(value, self.owned_types):
+                self.owned.append(ObjectSnapshot(value))
+            self.state[name] = self.copy_value(value)
+
+        body = getattr(obj, 'body', None)
+        self.body_state = None
+        if body is not None:
+            self.body_state = (body.position, body.velocity, body.angle, body.angular_velocity)
+
+    @staticmethod
+    def copy_value(value):
+        """Copy the mutable containers state is kept in; surfaces and other objects are shared"""
+        if isinstance(value, (pg.Rect, list, dict, set)):
+            return value.copy()
+        return value
+
+    def restore(self):
+        attributes = vars(self.obj)
+        kept = {name: attributes[name] for name in self.skipped if name in attributes}
+
+        # Attributes added after the snapshot (lazily created menus, flags) are dropped too
+        attributes.clear()
+        attributes.update(kept)
+        for name, value in self.state.items():
+            attributes[name] = self.copy_value(value)
+        for snapshot in self.owned:
+            snapshot.restore()
+
+        if self.body_state:
+            body = self.obj.body
+            # A zero-length position step clears the bias velocity the last solve left for the next step
+            pymunk.Body.update_position(body, 0)
+            body.position, body.velocity, body.angle, body.angular_velocity = self.body_state
+
+class LevelSnapshot:
+    """Spawn state of the current level, its sprites, the player and the background"""
+    def __init__(self, game):
+        self.game = game
+        self.level = game.current_level
+        self.level_num = game.level_num
+        level = self.level
+
+        self.tokens = list(level.tokens)
+        objects = [level, game.player, game.background]
+        for group in (level.platforms, level.tokens, level.enemies, level.interactive_objects):
+            objects.extend(group)
+        self.objects = [ObjectSnapshot(obj) for obj in objects]
+        self.random_state = RandomStreams.level_state()
+        self.bodies = [(body, list(body.shapes)) for body in game.space.bodies]  # In the order they were added
+
+    def matches(self, game):
+        """Whether this snapshot belongs to the level the game is on"""
+        return game.current_level is self.level and game.level_num == self.level_num
+
+    def restore(self):
+        """Put everything back as it was at spawn, reusing the existing objects and physics space"""
+        level = self.level
+        space = self.game.space
+
+        # The space keeps contacts and collision pairs that would resolve the first steps differently
+        # than after a rebuild, so every body comes out and goes back in. They come out first, as
+        # dropping contacts runs the separate callbacks, which change the player's ground state
+        for body, shapes in self.bodies:
+            if body.space is space:
+                space.remove(body, *shapes)
+
+        for snapshot in self.objects:
+            snapshot.restore()
+
+        # Collected tokens go back into the group and index (the level's shape owners were restored)
+        for token in self.tokens:
+            if token not in level.tokens:
+                level.tokens.add(token)
+                level.token_index.insert(token)
+
+        # Bodies are added in the order the level was built, as a rebuild would add them
+        for body, shapes in self.bodies:
+            space.add(body, *shapes)
+
+        # Moving platforms and opened doors were restored to their spawn rects
+        for sprite in (*level.platforms, *level.interactive_objects):
+            if sprite.spatial_index:
+                sprite.spatial_index.move(sprite)
+
+        RandomStreams.restore_level_state(self.random_state)
@@ -1,6 +1,8 @@
 import pygame as pg
 import os
-import random
+from src.rng import RandomStreams
+
+audio_random = RandomStreams.get("audio")
 
 class SoundManager:
     """Handles all game sounds and music"""
@@ -13,6 +15,12 @@ class SoundManager:
         self.enabled = True
         self.music_enabled = True
         
+        # Headless runs have no audio to play, so skip generating sounds entirely
+        if getattr(game, 'headless', False):
+            self.enabled = False
+            self.music_enabled = False
+            return
+        
         # Load sounds
         self.load_sounds()
         
@@ -178,8 +186,9 @@ class SoundManager:
         num_samples = int(duration * sample_rate)
         buf = np.zeros((num_samples, 2), dtype=np.int16)
         
-        # Generate white noise
-        noise = np.random.uniform(-1, 1, num_samples)
+        # Generate white noise (from the audio stream, like every other sound variation)
+        rng = np.random.default_rng(audio_random.getrandbits(64))
+        noise = rng.uniform(-1, 1, num_samples)
         
         # Apply low-pass filter (simple moving average)
         window_size = 20
@@ -304,7 +313,7 @@ class SoundManager:
             return
             
         # Get a random sound from the list for variety
-        sound = random.choice(self.sounds[sound_name])
+        sound = audio_random.choice(self.sounds[sound_name])
         sound.play()
         
     def play_jump(self):
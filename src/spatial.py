@@ -0,0 +1,91 @@
+import pygame as pg
+from src.settings import *
+
+class SpatialHash:
+    """Uniform grid of level-space cells, each holding the sprites whose rect overlaps it"""
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}         # (column, row) -> set of sprites
+        self.sprite_cells = {}  # sprite -> cell keys it is currently stored in
+        self.order = {}         # sprite -> insertion number, keeps query results in draw order
+        self.next_order = 0
+        
+    @classmethod
+    def from_sprites(cls, sprites, cell_size=SPATIAL_CELL_SIZE):
+        """Build an index holding every sprite of a group"""
+        index = cls(cell_size)
+        for sprite in sprites:
+            index.insert(sprite)
+        return index
+        
+    def __len__(self):
+        return len(self.sprite_cells)
+        
+    def __contains__(self, sprite):
+        return sprite in self.sprite_cells
+        
+    def cell_keys(self, rect):
+        """Keys of every cell a rect overlaps"""
+        size = self.cell_size
+        return tuple(
+            (column, row)
+            for column in range(int(rect.left) // size, int(rect.right - 1) // size + 1)
+            for row in range(int(rect.top) // size, int(rect.bottom - 1) // size + 1)
+        )
+        
+    def insert(self, sprite):
+        """Add a sprite; it keeps a reference to the index so it can report moves"""
+        keys = self.cell_keys(sprite.rect)
+        for key in keys:
+            self.cells.setdefault(key, set()).add(sprite)
+        self.sprite_cells[sprite] = keys
+        self.order[sprite] = self.next_order
+        self.next_order += 1
+        sprite.spatial_index = self
+        
+    def remove(self, sprite):
+        """Remove a sprite (no-op if it is not indexed)"""
+        keys = self.sprite_cells.pop(sprite, None)
+        if keys is None:
+            return
+        for key in keys:
+            cell = self.cells.get(key)
+            if cell:
+                cell.discard(sprite)
+                if not cell:
+                    del self.cells[key]
+        del self.order[sprite]
+        sprite.spatial_index = None
+        
+    def move(self, sprite):
+        """Refresh a sprite's cells after its rect changed"""
+        old_keys = self.sprite_cells.get(sprite)
+        if old_keys is None:
+            return
+        keys = self.cell_keys(sprite.rect)
+        if keys == old_keys:
+            return
+        for key in old_keys:
+            cell = self.cells.get(key)
+            if cell:
+                cell.discard(sprite)
+                if not cell:
+                    del self.cells[key]
+        for key in keys:
+            self.cells.setdefault(key, set()).add(sprite)
+        self.sprite_cells[sprite] = keys
+        
+    def query(self, rect):
+        """Sprites whose rect overlaps a level-space rect, in insertion order"""
+        found = set()
+        for key in self.cell_keys(rect):
+            cell = self.cells.get(key)
+            if cell:
+                found.update(cell)
+        hits = [sprite for sprite in found if rect.colliderect(sprite.rect)]
+        hits.sort(key=self.order.__getitem__)
+        return hits
+        
+    def query_radius(self, center, radius):
+        """Sprites whose rect overlaps the square around a point (candidates for distance checks)"""
+        return self.query(pg.Rect(center[0] - radius, center[1] - radius, radius * 2, radius * 2))
@@ -1,10 +1,20 @@
 import pygame as pg
+import numpy as np
 import pymunk
 from pymunk import Vec2d
 import math
 import random
 from src.settings import *
 from src.effects import Shadow, Glow, Animation, BuildingDecorations, ParallaxBackground, darken_color, lighten_color
+from src.rng import RandomStreams
+from src.text import Text
+from src import asset_cache
+from src.surface_format import SurfaceFormat
+
+art_random = RandomStreams.get("art")
+effects_random = RandomStreams.get("effects")
+layout_random = RandomStreams.get("layout")
+particles_random = RandomStreams.get("particles")
 
 class PhysicsSprite(pg.sprite.Sprite):
     """Base class for sprites with physics properties"""
@@ -74,6 +84,7 @@ class StaticObject(pg.sprite.Sprite):
         self.animation = None
         self.has_shadow = False
         self.visual_offset_y = 0  # For animation effects
+        self.spatial_index = None  # Set by SpatialHash.insert
 
 class Platform(StaticObject):
     """Platform that characters can stand on"""
@@ -90,27 +101,15 @@ class Platform(StaticObject):
         self.original_y = y
         self.direction = 1
         
-        # Enhanced visuals
-        if platform_type == "building":
-            # Create a building platform for Financial District level
-            self.create_building_appearance()
-        elif platform_type == "floating":
-            # Create a floating platform with unique appearance
-            self.create_floating_appearance()
-        else:
-            # Standard platform with enhanced appearance
-            self.create_standard_appearance()
-        
-        # Apply shadow effect - buildings and floating platforms get shadows
-        if platform_type in ["building", "floating"] or random.random() < 0.7:
-            self.has_shadow = True
-            self.apply_shadow()
+        # Enhanced visuals (skipped in headless mode, where nothing is ever drawn)
+        if not getattr(game, 'headless', False):
+            self.create_appearance()
             
         # Add subtle animation for floating platforms
         if platform_type == "floating":
             self.animation = Animation("platform")
             self.animation.sin_amplitude = 8  # More noticeable movement
-            self.animation.sin_speed = random.uniform(1.0, 1.5)  # Varied speed
+            self.animation.sin_speed = effects_random.uniform(1.0, 1.5)  # Varied speed
             self.visual_offset_y = 0
         elif platform_type == "building" and width < 300:
             # Slight animation for small buildings
@@ -119,6 +118,39 @@ class Platform(StaticObject):
             self.animation.sin_speed = 0.5
             self.visual_offset_y = 0
 
+    # Settings the platform art depends on (part of its asset pack key)
+    art_settings = (DARK_TEAL, TEAL, LIGHT_TEAL, BUILDING_DETAILS_DENSITY, WINDOW_COLOR,
+                    SHADOW_QUALITY, SHADOW_COLOR, SHADOW_OFFSET_X, SHADOW_OFFSET_Y, SHADOW_BLUR, SHADOW_BLUR_PASSES,
+                    GLOW_FALLOFF_RADIUS, GLOW_FALLOFF_PEAK)
+    
+    def create_appearance(self):
+        """Draw the platform and its shadow, or map them from the asset pack if drawn before"""
+        # Random choices are made up front, so a packed image draws as much from the art stream as a fresh one
+        if self.platform_type == "building":
+            # Create a building platform for Financial District level
+            style = (art_random.choice(BUILDING_COLORS), art_random.getrandbits(32))
+            create = self.create_building_appearance
+        elif self.platform_type == "floating":
+            # Create a floating platform with unique appearance
+            style = (art_random.uniform(-0.1, 0.1),)  # Slight color variation
+            create = self.create_floating_appearance
+        else:
+            # Standard platform with enhanced appearance
+            style = ()
+            create = self.create_standard_appearance
+        
+        # Apply shadow effect - buildings and floating platforms get shadows
+        wants_shadow = self.platform_type in ["building", "floating"] or art_random.random() < 0.7
+        self.has_shadow = wants_shadow and SHADOW_QUALITY > 0
+        
+        def draw():
+            create(*style)
+            if self.has_shadow:
+                self.apply_shadow()
+            return self.image
+        params = (self.platform_type, self.width, self.height, style, self.has_shadow, self.art_settings)
+        self.image = SurfaceFormat.finalize(asset_cache.cached_surface("platform", params, draw, seeded=True))
+        
     def create_standard_appearance(self):
         """Create a standard platform appearance"""
         # Dark teal base
@@ -137,19 +169,16 @@ class Platform(StaticObject):
         shadow_color = darken_color(base_color, 0.7)
         pg.draw.rect(self.image, shadow_color, shadow_rect)
         
-    def create_building_appearance(self):
+    def create_building_appearance(self, base_color, decor_seed):
         """Create a building appearance for platforms in Financial District"""
-        # Choose a random building color
-        base_color = random.choice(BUILDING_COLORS)
         self.image.fill(base_color)
         
-        # Apply building decorations (windows, details, etc.)
-        self.image = BuildingDecorations.apply(self.image, base_color)
+        # Apply building decorations (windows, details, etc.) from their own seed
+        self.image = BuildingDecorations.apply(self.image, base_color, rng=random.Random(decor_seed))
         
-    def create_floating_appearance(self):
+    def create_floating_appearance(self, hue_shift):
         """Create a floating platform with a unique appearance"""
         # Use teal as base color but with some variations
-        hue_shift = random.uniform(-0.1, 0.1)  # Slight color variation
         base_color = (
             min(255, max(0, int(TEAL[0] * (1 + hue_shift)))),
             min(255, max(0, int(TEAL[1] * (1 + hue_shift)))),
@@ -187,7 +216,9 @@ class Platform(StaticObject):
         
     def apply_shadow(self):
         """Apply a shadow effect to the platform"""
-        self.image = Shadow.apply(self.image)
+        # Basic shadows are hard-edged, advanced ones are blurred
+        blur = SHADOW_BLUR if SHADOW_QUALITY >= 2 else 0
+        self.image = Shadow.apply(self.image, blur=blur)
 
     def setup_movement(self, speed, distance):
         """Configure platform to move horizontally"""
@@ -211,6 +242,8 @@ class Platform(StaticObject):
             # Apply movement
             self.body.position = pos_x + offset, pos_y
             self.rect.center = (int(pos_x + offset), int(pos_y))
+            if self.spatial_index:
+                self.spatial_index.move(self)
             
         # Apply animation effects if present
         if self.animation:
@@ -230,6 +263,11 @@ class SuperseedToken(pg.sprite.Sprite):
     # Class-level image loading to avoid reloading for each instance
     token_images = {}
     token_types = ["x_token", "star_token", "coin_token", "gem_token", "logo_token"]
+    # Composed token art and pre-rendered frames shared by all instances
+    base_images = {}
+    frame_cache = {}  # (token_type, angle_idx, pulse_idx) -> rotated/scaled frame
+    flat_images = {}  # token_type -> plain token art without glow, for low quality tiers
+    glow_enabled = True  # Set by QualityGovernor
     
     @classmethod
     def load_images(cls):
@@ -237,9 +275,9 @@ class SuperseedToken(pg.sprite.Sprite):
         if not cls.token_images:
             for token_type in cls.token_types:
                 try:
-                    # Load image and convert alpha for transparency
+                    # Decoded with alpha once, then mapped from the asset pack
                     image_path = f"assets/images/tokens/{token_type}.png"
-                    image = pg.image.load(image_path).convert_alpha()
+                    image = asset_cache.load_image(image_path)
                     cls.token_images[token_type] = image
                 except (pg.error, FileNotFoundError) as e:
                     print(f"Error loading token image {token_type}: {e}")
@@ -249,45 +287,36 @@ class SuperseedToken(pg.sprite.Sprite):
                     pg.draw.rect(fallback, BLACK, (8, 8, 16, 16), 2)
                     cls.token_images[token_type] = fallback
     
-    def __init__(self, game, x, y, token_type=None):
-        pg.sprite.Sprite.__init__(self)
-        self.game = game
-        self.size = TOKEN_SIZE
-        
-        # Load token images if not already loaded
-        self.load_images()
-        
-        # Select token type - random if not specified
-        if token_type is None:
-            self.token_type = random.choice(self.token_types)
-        else:
-            self.token_type = token_type if token_type in self.token_types else self.token_types[0]
+    @classmethod
+    def build_base_image(cls, token_type):
+        """Compose the glowing token art for a token type"""
+        size = TOKEN_SIZE
         
         # Create enhanced token with visual design
         # Use larger base size to accommodate glow effects
-        expanded_size = self.size * 1.5
-        self.base_image = pg.Surface((expanded_size, expanded_size), pg.SRCALPHA)
+        expanded_size = size * 1.5
+        base_image = pg.Surface((expanded_size, expanded_size), pg.SRCALPHA)
         
         # Draw multi-layered token with inner and outer circles
         center = expanded_size // 2
         
         # Draw outer glow
-        glow_radius = self.size // 2 + 6
+        glow_radius = size // 2 + 6
         for i in range(5):
             glow_alpha = 150 - i * 30
             pg.draw.circle(
-                self.base_image, 
+                base_image, 
                 (*BRIGHT_TEAL, glow_alpha), 
                 (center, center), 
                 glow_radius - i
             )
         
         # Draw main token body with gradient effect
-        token_radius = self.size // 2
+        token_radius = size // 2
         
         # Draw outer ring for 3D effect
         pg.draw.circle(
-            self.base_image, 
+            base_image, 
             DARK_TEAL, 
             (center, center), 
             token_radius
@@ -295,7 +324,7 @@ class SuperseedToken(pg.sprite.Sprite):
         
         # Draw inner circle (slightly smaller)
         pg.draw.circle(
-            self.base_image, 
+            base_image, 
             TEAL, 
             (center, center), 
             token_radius - 2
@@ -310,13 +339,13 @@ class SuperseedToken(pg.sprite.Sprite):
             highlight_radius
         )
         pg.draw.ellipse(
-            self.base_image,
+            base_image,
             LIGHT_TEAL,
             highlight_rect
         )
         
         # Get token image and scale it to fit inside the token
-        token_image = self.token_images.get(self.token_type)
+        token_image = cls.token_images.get(token_type)
         inner_size = token_radius * 1.5
         
         # Scale the token image to fit properly
@@ -333,11 +362,92 @@ class SuperseedToken(pg.sprite.Sprite):
             image_y = center - scaled_height // 2
             
             # Draw the token image
-            self.base_image.blit(scaled_image, (image_x, image_y))
+            base_image.blit(scaled_image, (image_x, image_y))
         
         # Apply additional glow effect
-        self.base_image = Glow.apply(self.base_image, BRIGHT_TEAL, 0.6, 4)
-        self.image = self.base_image.copy()
+        return Glow.apply(base_image, BRIGHT_TEAL, 0.6, 4)
+    
+    @classmethod
+    def build_frames(cls, token_type):
+        """Pre-render every quantized rotation/pulse frame for a token type (baked into the asset cache)"""
+        if token_type in cls.base_images:
+            return
+        
+        cls.load_images()
+        params = (token_type, asset_cache.surface_digest(cls.token_images[token_type]),
+                  TOKEN_SIZE, TOKEN_PULSE_STEPS, TOKEN_ROTATION_STEPS, TOKEN_PULSE_RANGE, USE_ANTIALIASING,
+                  BRIGHT_TEAL, DARK_TEAL, TEAL, LIGHT_TEAL)
+        surfaces = asset_cache.cached_surfaces("token", params, lambda: cls.render_frames(token_type))
+        cls.base_images[token_type] = surfaces[0]
+        
+        # Frames follow the base image, pulse-major
+        frames = iter(surfaces[1:])
+        for pulse_idx in range(TOKEN_PULSE_STEPS):
+            for angle_idx in range(TOKEN_ROTATION_STEPS):
+                cls.frame_cache[(token_type, angle_idx, pulse_idx)] = SurfaceFormat.finalize(next(frames))
+    
+    @classmethod
+    def render_frames(cls, token_type):
+        """The composed token art followed by its rotation/pulse frames, pulse-major"""
+        base_image = cls.build_base_image(token_type)
+        surfaces = [base_image]
+        
+        base_w, base_h = base_image.get_size()
+        for pulse_idx in range(TOKEN_PULSE_STEPS):
+            # Pulse scales are spread evenly across [1 - range, 1 + range]
+            pulse_scale = 1.0 - TOKEN_PULSE_RANGE + 2 * TOKEN_PULSE_RANGE * pulse_idx / (TOKEN_PULSE_STEPS - 1)
+            scale = pg.transform.smoothscale if USE_ANTIALIASING else pg.transform.scale
+            pulsed_base = scale(
+                base_image,
+                (int(base_w * pulse_scale), int(base_h * pulse_scale))
+            )
+            for angle_idx in range(TOKEN_ROTATION_STEPS):
+                angle = angle_idx * 360.0 / TOKEN_ROTATION_STEPS
+                surfaces.append(pg.transform.rotate(pulsed_base, angle))
+        return surfaces
+    
+    @classmethod
+    def get_flat_image(cls, token_type):
+        """The token art scaled to token size, without glow or rotation"""
+        if token_type not in cls.flat_images:
+            cls.flat_images[token_type] = pg.transform.smoothscale(cls.token_images[token_type], (TOKEN_SIZE, TOKEN_SIZE))
+        return cls.flat_images[token_type]
+    
+    @classmethod
+    def get_frame(cls, token_type, angle, pulse_scale):
+        """Look up the cached frame nearest to an angle and pulse scale"""
+        angle_idx = int(round(angle * TOKEN_ROTATION_STEPS / 360.0)) % TOKEN_ROTATION_STEPS
+        pulse_pos = (pulse_scale - 1.0 + TOKEN_PULSE_RANGE) / (2 * TOKEN_PULSE_RANGE)
+        pulse_idx = min(TOKEN_PULSE_STEPS - 1, max(0, int(round(pulse_pos * (TOKEN_PULSE_STEPS - 1)))))
+        return cls.frame_cache[(token_type, angle_idx, pulse_idx)]
+    
+    def __init__(self, game, x, y, token_type=None):
+        pg.sprite.Sprite.__init__(self)
+        self.game = game
+        self.size = TOKEN_SIZE
+        self.headless = getattr(game, 'headless', False)
+        
+        # Load token images if not already loaded (they are only ever drawn)
+        if not self.headless:
+            self.load_images()
+        
+        # Select token type - random if not specified
+        if token_type is None:
+            self.token_type = layout_random.choice(self.token_types)
+        else:
+            self.token_type = token_type if token_type in self.token_types else self.token_types[0]
+        
+        # Share the composed token art and its rotation/pulse frames per type
+        if self.headless:
+            # Only the rect matters without a display, so skip composing the frames
+            # (same size as the composed art: 1.5x the token plus the 4px glow on each side)
+            art_size = int(self.size * 1.5) + 8
+            self.base_image = pg.Surface((art_size, art_size), pg.SRCALPHA)
+        else:
+            self.build_frames(self.token_type)
+            self.base_image = self.base_images[self.token_type]
+        self.image = self.base_image
+        self.spatial_index = None  # Set by SpatialHash.insert
         
         # Set up rect with adjusted size to account for visual effects
         self.rect = self.image.get_rect()
@@ -358,17 +468,17 @@ class SuperseedToken(pg.sprite.Sprite):
         self.visual_offset_y = 0
         
         # Improved rotation animation
-        self.angle = random.uniform(0, 360)  # Random starting angle
-        self.rotation_speed = random.uniform(0.5, 1.5) * (1 if random.random() > 0.5 else -1)
+        self.angle = effects_random.uniform(0, 360)  # Random starting angle
+        self.rotation_speed = effects_random.uniform(0.5, 1.5) * (1 if effects_random.random() > 0.5 else -1)
         
         # Pulse animation
-        self.pulse_time = random.uniform(0, math.pi * 2)  # Random start phase
-        self.pulse_speed = random.uniform(3.0, 5.0)  # Different speeds for variety
-        self.pulse_amount = random.uniform(0.05, 0.1)  # Size pulsing amount
+        self.pulse_time = effects_random.uniform(0, math.pi * 2)  # Random start phase
+        self.pulse_speed = effects_random.uniform(3.0, 5.0)  # Different speeds for variety
+        self.pulse_amount = effects_random.uniform(0.05, TOKEN_PULSE_RANGE)  # Size pulsing amount
         
         # Particles
         self.particle_timer = 0
-        self.particle_interval = random.uniform(0.8, 1.5)  # Time between particle emissions
+        self.particle_interval = effects_random.uniform(0.8, 1.5)  # Time between particle emissions
         
     def update(self):
         # Update animation offset
@@ -387,15 +497,13 @@ class SuperseedToken(pg.sprite.Sprite):
         self.pulse_time += self.game.dt * self.pulse_speed
         pulse_scale = 1.0 + math.sin(self.pulse_time) * self.pulse_amount
         
-        # Create pulsing effect
-        pulsed_base = pg.transform.smoothscale(
-            self.base_image,
-            (int(self.base_image.get_width() * pulse_scale),
-             int(self.base_image.get_height() * pulse_scale))
-        )
-        
-        # Apply rotation to the image after pulsing
-        self.image = pg.transform.rotate(pulsed_base, self.angle)
+        # Pick the pre-rendered frame instead of scaling/rotating every frame
+        if self.headless:
+            pass
+        elif self.glow_enabled:
+            self.image = self.get_frame(self.token_type, self.angle, pulse_scale)
+        else:
+            self.image = self.get_flat_image(self.token_type)
         
         # Keep the rect center but update its size
         center = self.rect.center
@@ -410,12 +518,12 @@ class SuperseedToken(pg.sprite.Sprite):
         self.particle_timer += self.game.dt
         if self.particle_timer >= self.particle_interval:
             self.particle_timer = 0
-            self.particle_interval = random.uniform(0.8, 1.5)  # Randomize next interval
+            self.particle_interval = particles_random.uniform(0.8, 1.5)  # Randomize next interval
             
             # Emit a small particle burst
             if hasattr(self.game, 'token_particles'):
-                offset_x = random.uniform(-self.size/3, self.size/3)
-                offset_y = random.uniform(-self.size/3, self.size/3)
+                offset_x = particles_random.uniform(-self.size/3, self.size/3)
+                offset_y = particles_random.uniform(-self.size/3, self.size/3)
                 
                 particle_pos = (
                     self.rect.centerx + self.game.camera_offset_x + offset_x,
@@ -519,7 +627,7 @@ class Lightning:
                 base_y = start_y + (end_y - start_y) * t
                 
                 # Deviation perpendicular to the line
-                deviation = random.randint(-15, 15)
+                deviation = effects_random.randint(-15, 15)
                 offset_x = deviation * math.cos(math.radians(perpendicular_angle))
                 offset_y = deviation * math.sin(math.radians(perpendicular_angle))
                 
@@ -597,9 +705,9 @@ class Lightning:
             for _ in range(2):  # Add a few particles each update
                 # Choose a random segment
                 if len(points) >= 2:
-                    seg_idx = random.randint(0, len(points) - 2)
+                    seg_idx = particles_random.randint(0, len(points) - 2)
                     # Position along the segment
-                    t = random.random()
+                    t = particles_random.random()
                     part_x = points[seg_idx][0] + (points[seg_idx+1][0] - points[seg_idx][0]) * t
                     part_y = points[seg_idx][1] + (points[seg_idx+1][1] - points[seg_idx][1]) * t
                     
@@ -607,11 +715,11 @@ class Lightning:
                     self.particles.append({
                         'x': part_x,
                         'y': part_y,
-                        'vx': random.uniform(-1, 1),
-                        'vy': random.uniform(-1, 1),
-                        'life': random.uniform(0.2, 0.5),
+                        'vx': particles_random.uniform(-1, 1),
+                        'vy': particles_random.uniform(-1, 1),
+                        'life': particles_random.uniform(0.2, 0.5),
                         'color': LIGHTNING_COLOR,
-                        'size': random.uniform(1, 3)
+                        'size': particles_random.uniform(1, 3)
                     })
     
     def update_collision_points(self):
@@ -647,7 +755,8 @@ class Lightning:
                 particle['y'] += particle['vy']
                 
         # Update the visual representation
-        self.update_surface()
+        if not getattr(self.game, 'headless', False):
+            self.update_surface()
         
         # Check if lightning duration is over
         if self.time_alive >= self.warning_time + self.duration:
@@ -703,10 +812,19 @@ class Lightning:
 
 class EnhancedBackground:
     """Advanced scrolling background with parallax effect for different level types"""
+    # Sky gradient (top color, bottom color) per level type; prison has no sky
+    gradient_colors = {
+        "financial": ((100, 150, 200), (50, 80, 100)),     # Light blue to dark blue
+        "market_crash": ((80, 30, 50), (30, 20, 40)),      # Dark red-purple to very dark purple
+    }
+    gradient_cache = {}  # Rendered gradients shared by all instances and restarts
+    lightning_enabled = True  # Background lightning and flashes (set by QualityGovernor)
+    
     def __init__(self, game, level_type="financial"):
         self.game = game
         self.level_type = level_type
-        self.parallax_bg = ParallaxBackground(WIDTH * 2, HEIGHT, level_type)
+        # The parallax layers are only ever drawn, so headless runs skip generating them
+        self.parallax_bg = None if getattr(game, 'headless', False) else ParallaxBackground(WIDTH * 2, HEIGHT, level_type)
         self.scroll_x = 0
         
         # For market crash background
@@ -724,12 +842,12 @@ class EnhancedBackground:
             self.flash_timer += self.game.dt
             
             # Flash effect
-            if self.flash_timer > 3 + random.random() * 5:  # Random interval between flashes
+            if self.flash_timer > 3 + effects_random.random() * 5:  # Random interval between flashes
                 self.flash_timer = 0
                 self.flash_alpha = 100
                 
                 # Add a background lightning bolt
-                if random.random() < 0.4:  # 40% chance of lightning with each flash
+                if effects_random.random() < 0.4:  # 40% chance of lightning with each flash
                     self.add_background_lightning()
             
             # Fade out flash
@@ -745,22 +863,22 @@ class EnhancedBackground:
     def add_background_lightning(self):
         """Add a background lightning effect"""
         # Create a random lightning in the background
-        start_x = random.randint(0, WIDTH)
-        start_y = random.randint(0, HEIGHT // 3)
-        segments = random.randint(3, 6)
+        start_x = effects_random.randint(0, WIDTH)
+        start_y = effects_random.randint(0, HEIGHT // 3)
+        segments = effects_random.randint(3, 6)
         points = [(start_x, start_y)]
         
         # Generate zigzag lightning bolt points
         current_x, current_y = start_x, start_y
         for _ in range(segments):
-            current_x += random.randint(-60, 60)
-            current_y += random.randint(30, 80)
+            current_x += effects_random.randint(-60, 60)
+            current_y += effects_random.randint(30, 80)
             points.append((current_x, current_y))
             
         self.background_lightning.append({
             'points': points,
-            'width': random.randint(2, 5),
-            'life': random.uniform(0.1, 0.3),
+            'width': effects_random.randint(2, 5),
+            'life': effects_random.uniform(0.1, 0.3),
             'alpha': 200
         })
         
@@ -772,7 +890,7 @@ class EnhancedBackground:
         self.parallax_bg.draw(surface, self.scroll_x)
         
         # Draw market crash specific effects
-        if self.level_type == "market_crash":
+        if self.level_type == "market_crash" and self.lightning_enabled:
             # Draw background lightning
             for lightning in self.background_lightning:
                 # Calculate alpha based on remaining life
@@ -810,35 +928,26 @@ class EnhancedBackground:
         
     def draw_gradient_background(self, surface):
         """Draw a gradient sky background"""
-        # Default financial district has a blue-to-dark gradient
-        if self.level_type == "financial":
-            top_color = (100, 150, 200)  # Light blue
-            bottom_color = (50, 80, 100)  # Dark blue
-            
-            # Create gradient by drawing lines of decreasing color
-            for y in range(HEIGHT):
-                # Calculate color for this line
-                ratio = y / HEIGHT
-                r = int(top_color[0] * (1 - ratio) + bottom_color[0] * ratio)
-                g = int(top_color[1] * (1 - ratio) + bottom_color[1] * ratio)
-                b = int(top_color[2] * (1 - ratio) + bottom_color[2] * ratio)
-                
-                pg.draw.line(surface, (r, g, b), (0, y), (WIDTH, y))
-                
-        # Market crash level has a darker, more dramatic gradient with red tint
-        elif self.level_type == "market_crash":
-            top_color = (80, 30, 50)     # Dark red-purple
-            bottom_color = (30, 20, 40)  # Very dark purple
+        gradient = self.get_gradient(self.level_type)
+        if gradient is not None:
+            surface.blit(gradient, (0, 0))
             
-            # Create gradient by drawing lines of decreasing color
-            for y in range(HEIGHT):
-                # Calculate color for this line
-                ratio = y / HEIGHT
-                r = int(top_color[0] * (1 - ratio) + bottom_color[0] * ratio)
-                g = int(top_color[1] * (1 - ratio) + bottom_color[1] * ratio)
-                b = int(top_color[2] * (1 - ratio) + bottom_color[2] * ratio)
+    @classmethod
+    def get_gradient(cls, level_type):
+        """Get the full-screen sky gradient for a level type, rendering it once"""
+        if level_type not in cls.gradient_cache:
+            colors = cls.gradient_colors.get(level_type)
+            gradient = None
+            if colors:
+                top_color, bottom_color = (np.array(c, dtype=np.float64) for c in colors)
                 
-                pg.draw.line(surface, (r, g, b), (0, y), (WIDTH, y))
+                # Interpolate one color per row, then repeat it across the screen
+                ratio = (np.arange(HEIGHT) / HEIGHT)[:, None]
+                rows = (top_color * (1 - ratio) + bottom_color * ratio).astype(np.uint8)
+                pixels = np.repeat(rows[None, :, :], WIDTH, axis=0)
+                gradient = pg.surfarray.make_surface(pixels).convert()
+            cls.gradient_cache[level_type] = gradient
+        return cls.gradient_cache[level_type]
                 
 class LevelThumbnail:
     """Thumbnail preview of a level for level selection screen"""
@@ -847,19 +956,20 @@ class LevelThumbnail:
         self.name = name
         self.width = LEVEL_THUMBNAIL_WIDTH
         self.height = LEVEL_THUMBNAIL_HEIGHT
+        self.rng = RandomStreams.fresh("thumbnail", level_num)  # Same art for the same seed
         
         # Create thumbnail surface
         self.image = pg.Surface((self.width, self.height))
         
         if image:
-            # Use provided image
-            self.image = pg.transform.scale(image, (self.width, self.height))
+            # Use provided image, with a shadow effect
+            self.image = Shadow.apply(pg.transform.scale(image, (self.width, self.height)))
         else:
-            # Create a default thumbnail
-            self.create_default_thumbnail()
-            
-        # Apply shadow effect
-        self.image = Shadow.apply(self.image)
+            # Create a default thumbnail (baked into the asset cache, shadow included)
+            params = (level_num, self.width, self.height, RandomStreams.derive_seed("thumbnail", level_num),
+                      BUILDING_COLORS, WINDOW_COLOR, LIGHTNING_COLOR, SHADOW_COLOR,
+                      SHADOW_OFFSET_X, SHADOW_OFFSET_Y, SHADOW_BLUR, SHADOW_BLUR_PASSES)
+            self.image = asset_cache.cached_surface("thumbnail", params, self.build_default_thumbnail, seeded=True)
         
         # Unlocked state
         self.is_unlocked = True
@@ -869,6 +979,11 @@ class LevelThumbnail:
         self.orig_image = self.image.copy()
         self.hover_scale = 1.0
         
+    def build_default_thumbnail(self):
+        """The default thumbnail with its shadow applied"""
+        self.create_default_thumbnail()
+        return Shadow.apply(self.image)
+        
     def create_default_thumbnail(self):
         """Create a default thumbnail if no image is provided"""
         if self.level_num == 1:
@@ -881,8 +996,8 @@ class LevelThumbnail:
                            (x, 20), (x, self.height - 20), 4)
                            
             # Draw "DEBT PRISON" text
-            font = pg.font.SysFont(None, 30)
-            text = font.render("DEBT PRISON", True, TEAL)
+            font = Text.font(None, 30)
+            text = Text.render(font, "DEBT PRISON", TEAL)
             text_rect = text.get_rect(center=(self.width//2, self.height//2))
             self.image.blit(text, text_rect)
             
@@ -894,7 +1009,7 @@ class LevelThumbnail:
             building_colors = BUILDING_COLORS
             for i, color in enumerate(building_colors[:5]):
                 x = i * (self.width // 5)
-                height = random.randint(self.height // 2, self.height - 30)
+                height = self.rng.randint(self.height // 2, self.height - 30)
                 width = self.width // 6
                 
                 # Draw building
@@ -920,8 +1035,8 @@ class LevelThumbnail:
                        (x_pos + x_size//2, y_pos - x_size//2), 3)
             
             # Text
-            font = pg.font.SysFont(None, 26)
-            text = font.render("FINANCIAL DISTRICT", True, TEAL)
+            font = Text.font(None, 26)
+            text = Text.render(font, "FINANCIAL DISTRICT", TEAL)
             text_rect = text.get_rect(center=(self.width//2, self.height - 20))
             self.image.blit(text, text_rect)
             
@@ -942,9 +1057,9 @@ class LevelThumbnail:
                 if i == 0:
                     y = baseline_y
                 elif i % 2 == 0:
-                    y = crash_points[-1][1] + random.randint(10, 25)  # Small recovery
+                    y = crash_points[-1][1] + self.rng.randint(10, 25)  # Small recovery
                 else:
-                    y = crash_points[-1][1] + random.randint(20, 45)  # Bigger drop
+                    y = crash_points[-1][1] + self.rng.randint(20, 45)  # Bigger drop
                 
                 # Ensure we don't go off the thumbnail
                 y = min(y, self.height - 30)
@@ -957,24 +1072,24 @@ class LevelThumbnail:
             # Add some lightning bolt effects
             for _ in range(3):
                 # Select random position for lightning
-                start_x = random.randint(20, self.width - 20)
-                start_y = random.randint(20, baseline_y)
+                start_x = self.rng.randint(20, self.width - 20)
+                start_y = self.rng.randint(20, baseline_y)
                 
                 # Create zigzag lightning
                 lightning_points = [(start_x, start_y)]
                 current_x, current_y = start_x, start_y
                 
                 for _ in range(4):  # 4 segments
-                    current_x += random.randint(-15, 15)
-                    current_y += random.randint(15, 30)
+                    current_x += self.rng.randint(-15, 15)
+                    current_y += self.rng.randint(15, 30)
                     lightning_points.append((current_x, current_y))
                 
                 # Draw the lightning
                 pg.draw.lines(self.image, LIGHTNING_COLOR, False, lightning_points, 2)
             
             # Text
-            font = pg.font.SysFont(None, 30)
-            text = font.render("MARKET CRASH", True, LIGHTNING_COLOR)
+            font = Text.font(None, 30)
+            text = Text.render(font, "MARKET CRASH", LIGHTNING_COLOR)
             text_rect = text.get_rect(center=(self.width//2, self.height - 25))
             self.image.blit(text, text_rect)
             
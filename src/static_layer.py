@@ -0,0 +1,54 @@
+import pygame as pg
+from src.settings import *
+from src.surface_format import SurfaceFormat
+
+class StaticLayer:
+    """Level-space tiles with every non-moving platform pre-composited"""
+    def __init__(self, sprites, tile_size=STATIC_TILE_SIZE, bake=True):
+        # Without bake only the static/moving split is made (headless runs never draw the tiles)
+        self.tile_size = tile_size
+        self.tiles = {}  # (column, row) -> tile surface; empty tiles are never created
+        self.dynamic_sprites = []  # Moving/animated sprites still drawn every frame
+        self.static_sprites = set()
+        
+        for sprite in sprites:
+            if self.is_static(sprite):
+                if bake:
+                    self.bake(sprite)
+                self.static_sprites.add(sprite)
+            else:
+                self.dynamic_sprites.append(sprite)
+        
+        # Tiles are only blitted from now on (onto the transparent level layer, so without RLE)
+        for key, tile in self.tiles.items():
+            self.tiles[key] = SurfaceFormat.finalize(tile)
+                
+    @staticmethod
+    def is_static(sprite):
+        """Whether a sprite's image and position never change after level load"""
+        return not getattr(sprite, 'is_moving', False) and getattr(sprite, 'animation', None) is None
+        
+    def bake(self, sprite):
+        """Composite a sprite's image into every tile it overlaps"""
+        rect = sprite.rect
+        size = self.tile_size
+        for column in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                tile = self.tiles.get((column, row))
+                if tile is None:
+                    tile = pg.Surface((size, size), pg.SRCALPHA)
+                    tile.fill((0, 0, 0, 0))
+                    self.tiles[(column, row)] = tile
+                tile.blit(sprite.image, (rect.x - column * size, rect.y - row * size))
+                
+    def draw(self, surface, camera_offset_x, camera_offset_y):
+        """Draw the tiles that intersect the screen"""
+        size = self.tile_size
+        left, top = int(-camera_offset_x), int(-camera_offset_y)
+        width, height = surface.get_size()
+        
+        for column in range(left // size, (left + width) // size + 1):
+            for row in range(top // size, (top + height) // size + 1):
+                tile = self.tiles.get((column, row))
+                if tile is not None:
+                    surface.blit(tile, (column * size + camera_offset_x, row * size + camera_offset_y))
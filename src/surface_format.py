@@ -0,0 +1,87 @@
+import threading
+import numpy as np
+import pygame as pg
+from src.settings import *
+
+class SurfaceFormat:
+    """Puts finished surfaces into the fastest format for blitting to the display"""
+    rle_enabled = SURFACE_RLE
+    pending = []  # RLE surfaces finalized off the main thread, to be encoded on it (see encode_pending)
+    lock = threading.Lock()  # Guards pending, which a prebuild thread adds to
+
+    @staticmethod
+    def matches_display(surface, display):
+        return (surface.get_bitsize() == display.get_bitsize()
+                and surface.get_masks()[:3] == display.get_masks()[:3])
+
+    @staticmethod
+    def translucent_fraction(surface):
+        """Fraction of a surface's pixels that are neither fully transparent nor fully opaque"""
+        pixels = pg.surfarray.pixels_alpha(surface)
+        alpha = pixels[::2, ::2]  # Every other row and column is plenty for a threshold
+        fraction = np.count_nonzero((alpha > 0) & (alpha < 255)) / max(1, alpha.size)
+        del pixels, alpha  # Release the surface lock
+        return fraction
+
+    @classmethod
+    def finalize(cls, surface, rle=False):
+        """Return the surface in the display's format, RLE-encoded if asked for and that blits faster
+
+        Opaque surfaces stay opaque, and surfaces already in the display's format
+        are kept (not copied), so art mapped from the asset pack stays shared.
+
+        RLE suits alpha surfaces made mostly of fully transparent or opaque runs,
+        but SDL blits RLE alpha surfaces as if the destination were opaque, so it
+        is only for surfaces blitted straight onto the screen (not onto the
+        transparent level layer). RLE surfaces should only be blitted from, as
+        drawing on one decodes it. SDL only encodes a surface on its first blit, so
+        that is done here (or, off the main thread, by encode_pending).
+        """
+        display = pg.display.get_surface()
+        if display is None:
+            # Nothing is blitted to a screen without a display
+            return surface
+
+        if not surface.get_flags() & pg.SRCALPHA:
+            return surface if cls.matches_display(surface, display) else surface.convert()
+
+        if surface.get_bitsize() != 32 or surface.get_masks()[:3] != display.get_masks()[:3]:
+            surface = surface.convert_alpha()
+        if rle and cls.rle_enabled and cls.translucent_fraction(surface) <= SURFACE_RLE_MAX_TRANSLUCENT:
+            surface.set_alpha(255, pg.RLEACCEL)
+            if threading.current_thread() is threading.main_thread():
+                cls.encode(surface)
+            else:
+                with cls.lock:
+                    cls.pending.append(surface)
+        return surface
+
+    @staticmethod
+    def encode(surface):
+        """RLE-encode a surface now instead of on its first blit in a frame
+
+        The encoding is made for the surface blitted onto, and blitting onto any
+        other surface redoes it, so one pixel is blitted to the display and put back.
+        """
+        display = pg.display.get_surface()
+        if display is None:
+            return
+        pixel = display.get_at((0, 0))
+        display.blit(surface, (0, 0), (0, 0, 1, 1))
+        display.set_at((0, 0), pixel)
+
+    @classmethod
+    def encode_pending(cls):
+        """Encode the RLE surfaces finalized on other threads, yielding after each one"""
+        while True:
+            with cls.lock:
+                if not cls.pending:
+                    return
+                surface = cls.pending.pop(0)
+            cls.encode(surface)
+            yield
+
+    @classmethod
+    def drop_pending(cls):
+        with cls.lock:
+            cls.pending.clear()
@@ -0,0 +1,42 @@
+import threading
+import pygame as pg
+from collections import OrderedDict
+from src.settings import *
+
+class Text:
+    """Shared font registry and LRU cache of rendered text surfaces"""
+    fonts = {}              # (name, size) -> pg.font.Font
+    cache = OrderedDict()   # (font, text, color, antialias) -> rendered surface, oldest first
+    lock = threading.Lock()  # Levels can be prebuilt on a worker thread, and fonts are not thread-safe
+
+    @classmethod
+    def font(cls, name=None, size=24):
+        """Resolve a font once per (name, size); name is a system font name, a font file path or None"""
+        key = (name, size)
+        with cls.lock:
+            font = cls.fonts.get(key)
+            if font is None:
+                if name and name.lower().endswith((".ttf", ".otf")):
+                    font = pg.font.Font(name, size)
+                else:
+                    font = pg.font.SysFont(name, size)
+                cls.fonts[key] = font
+        return font
+
+    @classmethod
+    def render(cls, font, text, color, antialias=True):
+        """Render text with a registry font, reusing the surface while it stays in the cache
+
+        The returned surface is shared, so copy it before modifying it.
+        """
+        key = (font, text, tuple(color), antialias)
+        with cls.lock:
+            surface = cls.cache.get(key)
+            if surface is None:
+                surface = font.render(text, antialias, color)
+                cls.cache[key] = surface
+                if len(cls.cache) > TEXT_CACHE_SIZE:
+                    cls.cache.popitem(last=False)
+            else:
+                cls.cache.move_to_end(key)
+        return surface
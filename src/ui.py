@@ -1,7 +1,11 @@
 import pygame as pg
+import numpy as np
 import math
 import random
+from collections import OrderedDict
 from src.settings import *
+from src.rng import RandomStreams
+from src.text import Text
 
 # Utility functions for color manipulation
 def darken_color(color, amount=0.7):
@@ -27,7 +31,7 @@ class Button:
     def __init__(self, x, y, width, height, text, font_size=32, action=None):
         self.rect = pg.Rect(x, y, width, height)
         self.text = text
-        self.font = pg.font.SysFont(None, font_size)
+        self.font = Text.font(None, font_size)
         self.action = action
         
         # Button states
@@ -113,12 +117,12 @@ class Button:
         
         # Draw text with a slight shadow for depth
         shadow_offset = 2
-        shadow_text = self.font.render(self.text, True, (0, 0, 0, 100))
+        shadow_text = Text.render(self.font, self.text, (0, 0, 0, 100))
         shadow_rect = shadow_text.get_rect(center=(self.rect.centerx + shadow_offset, self.rect.centery + shadow_offset))
         surface.blit(shadow_text, shadow_rect)
         
         # Draw main text
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = Text.render(self.font, self.text, self.text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         surface.blit(text_surface, text_rect)
         
@@ -324,7 +328,7 @@ class AnimatedText:
                 min(255, self.color[2] + int(20 * self.pulse_value))
             )
             
-            text_surface = self.font.render(self.displayed_text, True, pulse_color)
+            text_surface = Text.render(self.font, self.displayed_text, pulse_color)
             # Slightly scale the text based on pulse
             scale = 1.0 + 0.05 * self.pulse_value
             scaled_size = (int(text_surface.get_width() * scale), 
@@ -338,188 +342,259 @@ class AnimatedText:
             
         else:
             # Standard or typing animation
-            text_surface = self.font.render(self.displayed_text, True, self.color)
+            text_surface = Text.render(self.font, self.displayed_text, self.color)
             text_rect = text_surface.get_rect(center=self.position)
             surface.blit(text_surface, text_rect)
             
 class ParticleSystem:
     """System for creating and managing particles"""
+    quality_scale = 1.0  # Share of each system's capacity usable at the current quality tier
+    color_variations = np.array(PARTICLE_COLOR_VARIATIONS, dtype=np.int16)
+    
     def __init__(self, particle_type="x_mark", max_particles=50):
-        self.particles = []
         self.particle_type = particle_type
         self.max_particles = max_particles
+        self.rng = np.random.default_rng(RandomStreams.get("particles").getrandbits(64))
+        
+        # Particle attributes stored as preallocated arrays; only [:count] is live
+        self.count = 0
+        self.pos = np.zeros((max_particles, 2), dtype=np.float32)
+        self.velocity = np.zeros((max_particles, 2), dtype=np.float32)
+        self.size = np.zeros(max_particles, dtype=np.float32)
+        self.color = np.zeros((max_particles, 3), dtype=np.uint8)
+        self.lifetime = np.ones(max_particles, dtype=np.float32)
+        self.age = np.zeros(max_particles, dtype=np.float32)
+        self.rotation = np.zeros(max_particles, dtype=np.float32)
+        self.rotation_speed = np.zeros(max_particles, dtype=np.float32)
+        self.arrays = (self.pos, self.velocity, self.size, self.color, self.lifetime,
+                       self.age, self.rotation, self.rotation_speed)
+        
+        # Stamps already looked up by this system, keyed by packed bucket key
+        self.stamps = {}
+        self.atlas_generation = ParticleAtlas.generation
+        self.frame = 0
+        
+    def __len__(self):
+        return self.count
+        
+    def clear(self):
+        """Remove all live particles"""
+        self.count = 0
         
     def add_particle(self, pos, velocity, size, color, lifetime=1.0):
         """Add a new particle to the system"""
-        if len(self.particles) < self.max_particles:
-            self.particles.append({
-                'pos': list(pos),
-                'velocity': list(velocity),
-                'size': size,
-                'color': color,
-                'lifetime': lifetime,
-                'age': 0,
-                'rotation': 0,
-                'rotation_speed': random.uniform(-5, 5)
-            })
+        if self.count < self.max_particles * self.quality_scale:
+            i = self.count
+            self.pos[i] = pos
+            self.velocity[i] = velocity
+            self.size[i] = size
+            self.color[i] = color[:3]
+            self.lifetime[i] = lifetime
+            self.age[i] = 0
+            self.rotation[i] = 0
+            self.rotation_speed[i] = self.rng.uniform(-5, 5)
+            self.count += 1
             
     def spawn_particles(self, pos, count, spread=10, color=None):
         """Spawn multiple particles at once"""
-        for _ in range(count):
-            # Random velocity direction
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(20, 50)
-            velocity = [math.cos(angle) * speed, math.sin(angle) * speed]
-            
-            # Random position within spread
-            spawn_pos = [
-                pos[0] + random.uniform(-spread, spread),
-                pos[1] + random.uniform(-spread, spread)
-            ]
-            
-            # Random size and color variation
-            size = random.uniform(5, 15)
+        count = min(count, int(self.max_particles * self.quality_scale) - self.count)
+        if count <= 0:
+            return
+        start, end = self.count, self.count + count
+        rng = self.rng
+        
+        # Random velocity direction
+        angle = rng.uniform(0, 2 * math.pi, count)
+        speed = rng.uniform(20, 50, count)
+        self.velocity[start:end, 0] = np.cos(angle) * speed
+        self.velocity[start:end, 1] = np.sin(angle) * speed
+        
+        # Random position within spread
+        self.pos[start:end, 0] = pos[0] + rng.uniform(-spread, spread, count)
+        self.pos[start:end, 1] = pos[1] + rng.uniform(-spread, spread, count)
+        
+        # Random size and color variation
+        self.size[start:end] = rng.uniform(5, 15, count)
+        
+        # Determine particle color
+        if color is None and self.particle_type == "x_mark":
+            self.color[start:end] = TEAL
+        else:
+            # Provided color (or TEAL for generic particles) in one of a few fixed shades, so
+            # the stamps for every color a system spawns are rendered once and then reused
+            base_color = np.array((color if color is not None else TEAL)[:3], dtype=np.int16)
+            variation = self.color_variations[rng.integers(0, len(self.color_variations), count)]
+            self.color[start:end] = np.clip(base_color + variation, 0, 255)
             
-            # Determine particle color
-            if color is not None:
-                # Use provided color with slight variation
-                particle_color = (
-                    max(0, min(255, color[0] + random.randint(-20, 20))),
-                    max(0, min(255, color[1] + random.randint(-20, 20))),
-                    max(0, min(255, color[2] + random.randint(-20, 20)))
-                )
-            elif self.particle_type == "x_mark":
-                particle_color = TEAL
-            else:
-                # Default color variation for generic particles
-                particle_color = (
-                    max(0, min(255, TEAL[0] + random.randint(-20, 20))),
-                    max(0, min(255, TEAL[1] + random.randint(-20, 20))),
-                    max(0, min(255, TEAL[2] + random.randint(-20, 20)))
-                )
-                
-            self.add_particle(spawn_pos, velocity, size, particle_color, 
-                            random.uniform(0.5, 2.0))
+        self.lifetime[start:end] = rng.uniform(0.5, 2.0, count)
+        self.age[start:end] = 0
+        self.rotation[start:end] = 0
+        self.rotation_speed[start:end] = rng.uniform(-5, 5, count)
+        self.count = end
             
     def update(self, dt):
         """Update all particles in the system"""
-        for particle in self.particles[:]:
-            # Update age
-            particle['age'] += dt
-            if particle['age'] >= particle['lifetime']:
-                self.particles.remove(particle)
-                continue
-                
-            # Apply velocity
-            particle['pos'][0] += particle['velocity'][0] * dt
-            particle['pos'][1] += particle['velocity'][1] * dt
+        n = self.count
+        if n == 0:
+            return
             
-            # Apply gravity (optional - for falling particles)
-            # particle['velocity'][1] += 50 * dt
+        # Update age and swap-remove expired particles
+        self.age[:n] += dt
+        alive = self.age[:n] < self.lifetime[:n]
+        dead = np.flatnonzero(~alive)
+        if dead.size:
+            n -= dead.size
+            holes = dead[dead < n]  # Gaps left inside the surviving range
+            movers = n + np.flatnonzero(alive[n:])  # Live particles past the new end
+            for array in self.arrays:
+                array[holes] = array[movers]
+            self.count = n
+            
+        # Apply velocity
+        self.pos[:n] += self.velocity[:n] * dt
+        
+        # Update rotation for spinning particles
+        self.rotation[:n] += self.rotation_speed[:n] * dt
+        
+        # Slow down over time
+        self.velocity[:n] *= PARTICLE_DRAG
             
-            # Update rotation for spinning particles
-            particle['rotation'] += particle['rotation_speed'] * dt
+    def stamp_keys(self, n, progress):
+        """Pack each live particle's stamp buckets into one integer key"""
+        # Fade out (alpha) and shrink (size) as the particle ages. The size is taken from the
+        # spawn size and the alpha bucket rather than bucketed on its own, so each spawn size
+        # only ever needs one stamp per alpha bucket
+        alpha_idx = np.rint((1 - progress) * (PARTICLE_ALPHA_LEVELS - 1)).astype(np.int64)
+        bucket_progress = 1 - alpha_idx / (PARTICLE_ALPHA_LEVELS - 1)
+        size_idx = np.clip(np.rint(np.rint(self.size[:n]) * (1 - bucket_progress * 0.5)), 1, 63).astype(np.int64)
+        color_q = np.rint(self.color[:n] / PARTICLE_COLOR_STEP).astype(np.int64)
+        bits = ParticleAtlas.color_bits
+        color_idx = (color_q[:, 0] << (2 * bits)) | (color_q[:, 1] << bits) | color_q[:, 2]
+        
+        if self.particle_type == "x_mark":
+            # X marks look the same every 90 degrees
+            step = 90 / PARTICLE_ROTATION_STEPS
+            rotation_idx = np.rint(self.rotation[:n] / step).astype(np.int64) % PARTICLE_ROTATION_STEPS
+        else:
+            rotation_idx = 0
             
-            # Slow down over time
-            drag = 0.95
-            particle['velocity'][0] *= drag
-            particle['velocity'][1] *= drag
+        if self.particle_type == "lightning":
+            # Cycle through pre-rendered bolts so lightning still flickers
+            variant = (np.arange(n) + self.frame) % PARTICLE_LIGHTNING_VARIANTS
+        else:
+            variant = 0
             
+        return size_idx | (alpha_idx << 6) | (rotation_idx << 10) | (variant << 14) | (color_idx << 18)
+        
     def draw(self, surface):
         """Draw all particles"""
-        for particle in self.particles:
-            # Calculate alpha (fade out as particle ages)
-            progress = particle['age'] / particle['lifetime']
-            alpha = int(255 * (1 - progress))
+        self.frame += 1
+        n = self.count
+        if n == 0:
+            return
             
-            # Calculate size (can shrink as particle ages)
-            current_size = particle['size'] * (1 - progress * 0.5)
+        progress = np.clip(self.age[:n] / self.lifetime[:n], 0, 1)
+        keys = self.stamp_keys(n, progress)
+        
+        # Look up each particle's stamp and blit them all in one batch
+        if self.atlas_generation != ParticleAtlas.generation:
+            # The atlas dropped stamps; let go of them here too
+            self.stamps.clear()
+            self.atlas_generation = ParticleAtlas.generation
+        stamps = self.stamps
+        blit_sequence = []
+        for key, x, y in zip(keys.tolist(), self.pos[:n, 0].tolist(), self.pos[:n, 1].tolist()):
+            entry = stamps.get(key)
+            if entry is None:
+                entry = stamps[key] = ParticleAtlas.get(self.particle_type, key)
+            stamp, half_w, half_h = entry
+            blit_sequence.append((stamp, (x - half_w, y - half_h)))
+        surface.blits(blit_sequence, doreturn=False)
+
+
+class ParticleAtlas:
+    """Pre-rendered particle stamps shared by every ParticleSystem, kept in an LRU cache"""
+    stamps = OrderedDict()  # (particle_type, key) -> (surface, half width, half height), oldest first
+    created = 0      # Number of stamps rendered so far
+    generation = 0   # Bumped whenever stamps are dropped, so systems drop their references too
+    color_bits = round(255 / PARTICLE_COLOR_STEP).bit_length()  # Bits per quantized color channel in a key
+    
+    @classmethod
+    def get(cls, particle_type, key):
+        """Get (rendering on first use) the stamp for a packed bucket key"""
+        entry = cls.stamps.get((particle_type, key))
+        if entry is None:
+            size = key & 63
+            alpha = round(((key >> 6) & 15) * 255 / (PARTICLE_ALPHA_LEVELS - 1))
+            rotation = ((key >> 10) & 15) * 90 / PARTICLE_ROTATION_STEPS
+            variant = (key >> 14) & 15
+            color_idx = key >> 18
+            bits = cls.color_bits
+            color = tuple(min(255, ((color_idx >> shift) & ((1 << bits) - 1)) * PARTICLE_COLOR_STEP)
+                          for shift in (2 * bits, bits, 0))
             
-            # Draw based on particle type
-            if self.particle_type == "x_mark":
-                self.draw_x_mark(surface, particle, alpha, current_size)
-            elif self.particle_type == "lightning":
-                self.draw_lightning(surface, particle, alpha, current_size)
+            if particle_type == "x_mark":
+                stamp = cls.render_x_mark(color, rotation, alpha, size)
+            elif particle_type == "lightning":
+                stamp = cls.render_lightning(color, variant, alpha, size)
             else:
-                self.draw_circle(surface, particle, alpha, current_size)
+                stamp = cls.render_circle(color, alpha, size)
                 
-    def draw_circle(self, surface, particle, alpha, size):
-        """Draw a circular particle"""
+            entry = cls.stamps[(particle_type, key)] = (stamp, stamp.get_width() / 2, stamp.get_height() / 2)
+            cls.created += 1
+            if len(cls.stamps) > PARTICLE_ATLAS_SIZE:
+                cls.stamps.popitem(last=False)
+                cls.generation += 1
+        else:
+            cls.stamps.move_to_end((particle_type, key))
+        return entry
+        
+    @staticmethod
+    def render_circle(color, alpha, size):
+        """Render a circular particle"""
         # Create a surface for the particle with alpha channel
-        particle_surface = pg.Surface((int(size * 2), int(size * 2)), pg.SRCALPHA)
+        particle_surface = pg.Surface((size * 2, size * 2), pg.SRCALPHA)
         
         # Draw circle with alpha
-        pg.draw.circle(
-            particle_surface, 
-            (*particle['color'], alpha), 
-            (int(size), int(size)), 
-            int(size)
-        )
+        pg.draw.circle(particle_surface, (*color, alpha), (size, size), size)
+        return particle_surface
         
-        # Blit to main surface
-        surface.blit(
-            particle_surface, 
-            (int(particle['pos'][0] - size), int(particle['pos'][1] - size))
-        )
-        
-    def draw_x_mark(self, surface, particle, alpha, size):
-        """Draw an X mark particle"""
+    @staticmethod
+    def render_x_mark(color, rotation, alpha, size):
+        """Render an X mark particle"""
         # Create a surface with alpha channel
-        particle_surface = pg.Surface((int(size * 2), int(size * 2)), pg.SRCALPHA)
+        particle_surface = pg.Surface((size * 2, size * 2), pg.SRCALPHA)
         
         # Draw X mark with alpha
-        line_width = max(1, int(size / 4))
-        pg.draw.line(
-            particle_surface,
-            (*particle['color'], alpha),
-            (0, 0),
-            (size * 2, size * 2),
-            line_width
-        )
-        pg.draw.line(
-            particle_surface,
-            (*particle['color'], alpha),
-            (0, size * 2),
-            (size * 2, 0),
-            line_width
-        )
+        line_width = max(1, size // 4)
+        pg.draw.line(particle_surface, (*color, alpha), (0, 0), (size * 2, size * 2), line_width)
+        pg.draw.line(particle_surface, (*color, alpha), (0, size * 2), (size * 2, 0), line_width)
         
         # Rotate the X mark
-        rotated_surface = pg.transform.rotate(
-            particle_surface, 
-            particle['rotation']
-        )
+        return pg.transform.rotate(particle_surface, rotation)
         
-        # Blit to main surface
-        surface.blit(
-            rotated_surface,
-            (
-                int(particle['pos'][0] - rotated_surface.get_width() / 2),
-                int(particle['pos'][1] - rotated_surface.get_height() / 2)
-            )
-        )
+    @staticmethod
+    def render_lightning(color, variant, alpha, size):
+        """Render one of the lightning bolt variants for electrocution effects"""
+        # Each (size, variant) pair always produces the same bolt
+        bolt_random = random.Random(size * 16 + variant)
         
-    def draw_lightning(self, surface, particle, alpha, size):
-        """Draw a lightning particle for electrocution effects"""
         # Create a surface with alpha channel (larger to accommodate jagged lightning)
-        lightning_size = int(size * 3)  # Larger surface for lightning bolt
+        lightning_size = size * 3  # Larger surface for lightning bolt
         particle_surface = pg.Surface((lightning_size, lightning_size), pg.SRCALPHA)
         
         # Lightning bolt parameters
         center_x, center_y = lightning_size // 2, lightning_size // 2
-        segments = 3 + int(size / 5)  # More segments for larger bolts
+        segments = 3 + size // 5  # More segments for larger bolts
         segment_length = size / segments
-        thickness = max(1, int(size / 6))
+        thickness = max(1, size // 6)
         
-        # Draw a jagged lightning bolt with multiple branches
         # Main bolt
         start_x, start_y = center_x, center_y - lightning_size // 3
-        end_x, end_y = center_x, center_y + lightning_size // 3
+        end_y = center_y + lightning_size // 3
         
         # Generate lightning path
         points = [(start_x, start_y)]
-        current_x, current_y = start_x, start_y
-        
         for i in range(segments):
             # Calculate progress along main direction
             progress = (i + 1) / segments
@@ -527,85 +602,41 @@ class ParticleSystem:
             
             # Add randomness to x position (zigzag)
             jitter = (segment_length * 1.2) * (1 - progress)  # Less jitter toward end
-            current_x = center_x + random.uniform(-jitter, jitter)
-            current_y = target_y
-            
-            points.append((current_x, current_y))
-        
-        # Draw main lightning bolt
-        if len(points) > 1:
-            # Create a glow effect
-            for i in range(3):  # Multiple passes for glow
-                glow_alpha = alpha // (i+2)  # Decreasing alpha for glow layers
-                glow_width = thickness + i*2  # Increasing width for glow layers
-                
-                pg.draw.lines(
-                    particle_surface,
-                    (*particle['color'], glow_alpha),
-                    False,  # Don't connect last point to first
-                    points,
-                    glow_width
-                )
-            
-            # Draw the main bright center
-            pg.draw.lines(
-                particle_surface,
-                (255, 255, 255, alpha),  # White center for brightness
-                False,
-                points,
-                max(1, thickness // 2)
-            )
+            points.append((center_x + bolt_random.uniform(-jitter, jitter), target_y))
+        
+        # Create a glow effect with multiple passes
+        for i in range(3):
+            glow_alpha = alpha // (i+2)  # Decreasing alpha for glow layers
+            glow_width = thickness + i*2  # Increasing width for glow layers
+            pg.draw.lines(particle_surface, (*color, glow_alpha), False, points, glow_width)
+        
+        # Draw the main bright center
+        pg.draw.lines(particle_surface, (255, 255, 255, alpha), False, points, max(1, thickness // 2))
             
         # Add occasional branches (with 40% probability)
-        if random.random() < 0.4 and len(points) > 2:
+        if bolt_random.random() < 0.4 and len(points) > 2:
             # Pick a random point along the main bolt to branch from
-            branch_index = random.randint(1, len(points) - 2)
-            branch_start = points[branch_index]
-            
-            # Create a short branch (30-60% of main bolt length)
+            branch_points = [points[bolt_random.randint(1, len(points) - 2)]]
             branch_segments = max(2, segments // 2)
-            branch_points = [branch_start]
             
             # Random branch direction
-            branch_angle = random.uniform(math.pi/4, math.pi/2) * random.choice([-1, 1])
+            branch_angle = bolt_random.uniform(math.pi/4, math.pi/2) * bolt_random.choice([-1, 1])
             
             for i in range(branch_segments):
                 # Calculate branch growth with decreasing length
                 branch_length = segment_length * (1 - i/branch_segments) * 0.8
-                
-                # Calculate next point
-                next_x = branch_points[-1][0] + math.cos(branch_angle) * branch_length
-                next_y = branch_points[-1][1] + math.sin(branch_angle) * branch_length
-                
-                branch_points.append((next_x, next_y))
+                branch_points.append((
+                    branch_points[-1][0] + math.cos(branch_angle) * branch_length,
+                    branch_points[-1][1] + math.sin(branch_angle) * branch_length
+                ))
                 
                 # Slightly adjust angle for zigzag effect
-                branch_angle += random.uniform(-math.pi/6, math.pi/6)
+                branch_angle += bolt_random.uniform(-math.pi/6, math.pi/6)
             
             # Draw the branch with glow
             for i in range(2):
                 branch_glow_alpha = (alpha // 2) // (i+2)
                 branch_glow_width = max(1, thickness // 2) + i
-                
-                pg.draw.lines(
-                    particle_surface,
-                    (*particle['color'], branch_glow_alpha),
-                    False,
-                    branch_points,
-                    branch_glow_width
-                )
-        
-        # Rotate the lightning bolt
-        rotated_surface = pg.transform.rotate(
-            particle_surface, 
-            particle['rotation'] * 0.5  # Slower rotation for lightning
-        )
+                pg.draw.lines(particle_surface, (*color, branch_glow_alpha), False, branch_points, branch_glow_width)
         
-        # Blit to main surface
-        surface.blit(
-            rotated_surface,
-            (
-                int(particle['pos'][0] - rotated_surface.get_width() / 2),
-                int(particle['pos'][1] - rotated_surface.get_height() / 2)
-            )
-        )
+        return particle_surface